@@ -1,10 +1,31 @@
+import asyncio
+import importlib.util
+import json
 import logging
-import os
+import random
+import threading
 import time
-from typing import Optional
-
-from openai import OpenAI
-
+import weakref
+from collections import deque
+from typing import (
+    AsyncIterator,
+    Callable,
+    Deque,
+    Dict,
+    Final,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+import httpx
+import openai
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+from backend.ai.response_cache import ResponseCache
+from backend.ai.semantic_cache import SemanticCache
 from config import config
 
 # Using OpenRouter API for AI-powered healthcare assistance
@@ -13,6 +34,389 @@ from config import config
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# System instruction: a single string or several blocks sent in order (static first)
+SystemInstruction = Union[str, Sequence[str]]
+
+# Shared across client instances so repeat prompts hit regardless of caller
+_response_cache = ResponseCache(max_size=config.AI_CACHE_MAX_SIZE, ttl_seconds=config.AI_CACHE_TTL)
+_semantic_cache = (
+    SemanticCache(
+        model_name=config.AI_SEMANTIC_CACHE_MODEL,
+        threshold=config.AI_SEMANTIC_CACHE_THRESHOLD,
+        ttl_seconds=config.AI_CACHE_TTL,
+    )
+    if config.AI_SEMANTIC_CACHE_ENABLED
+    else None
+)
+
+# System instructions are module constants so every request sends byte-identical
+# prefixes; dynamic content only ever goes in the user message
+PATIENT_CHAT_INSTRUCTION: Final = """You are HealthAI, an intelligent healthcare assistant. Your role is to:
+1. Provide accurate, evidence-based health information
+2. Be empathetic and supportive
+3. Always remind users that you are an AI assistant and not a substitute for professional medical advice
+4. Encourage users to consult healthcare professionals for serious concerns
+5. Be clear and concise in your responses
+6. Ask clarifying questions when needed
+
+Important: Always include a disclaimer that you are not a doctor and users should seek professional medical advice for diagnosis and treatment."""
+
+SYMPTOM_ANALYSIS_INSTRUCTION: Final = """You are a medical symptom analyzer. Based on the symptoms provided:
+1. List possible conditions that could cause these symptoms (from most to least likely)
+2. Explain why each condition might be relevant
+3. Suggest when to seek immediate medical attention
+4. Recommend appropriate next steps
+
+IMPORTANT: Always emphasize that this is not a diagnosis and users must consult a healthcare professional for proper evaluation.
+
+Format your response clearly with:
+- Possible Conditions (with likelihood)
+- When to Seek Immediate Care
+- Recommended Next Steps
+- Disclaimer"""
+
+BULK_SYMPTOM_ANALYSIS_INSTRUCTION: Final = (
+    SYMPTOM_ANALYSIS_INSTRUCTION
+    + """
+
+You will receive several independent symptom descriptions at once, each from a different person. Analyze each one on its own. Respond only with a JSON object of the form {"analyses": ["...", "..."]} containing exactly one complete analysis per description, in the order given."""
+)
+
+TREATMENT_PLAN_INSTRUCTION: Final = """You are a healthcare planning assistant. Generate a comprehensive treatment plan that includes:
+1. Overview of the condition
+2. Recommended lifestyle modifications
+3. Dietary recommendations
+4. Exercise suggestions
+5. When to follow up with healthcare providers
+6. Warning signs to watch for
+
+IMPORTANT: This is a general wellness plan, not a medical prescription. Always remind users to consult their healthcare provider before starting any treatment."""
+
+BULK_TREATMENT_PLAN_INSTRUCTION: Final = (
+    TREATMENT_PLAN_INSTRUCTION
+    + """
+
+You will receive several patients at once. Respond only with a JSON object of the form {"plans": ["...", "..."]} containing exactly one complete plan per patient, in the order given."""
+)
+
+HEALTH_ADVICE_INSTRUCTION: Final = """You are a health educator. Provide clear, evidence-based information about health topics.
+Include:
+1. Key facts about the topic
+2. Best practices
+3. Common misconceptions
+4. When to consult a healthcare provider
+
+Keep responses informative but accessible to general audiences."""
+
+# Single AsyncOpenAI instance so its TCP/TLS connection pool is reused across requests
+_async_client: Optional[AsyncOpenAI] = None
+_async_client_lock = threading.Lock()
+
+
+def _get_async_client(api_key: str) -> AsyncOpenAI:
+    """Return the shared AsyncOpenAI client, creating it on first use"""
+    global _async_client
+    if _async_client is None:
+        with _async_client_lock:
+            if _async_client is None:
+                _async_client = AsyncOpenAI(
+                    base_url=config.OPENROUTER_BASE_URL,
+                    api_key=api_key,
+                    # Retries are handled by HealthAIClient so they aren't multiplied
+                    max_retries=0,
+                    default_headers={
+                        "HTTP-Referer": config.OPENROUTER_REFERER,
+                        "X-Title": config.APP_NAME,
+                    },
+                    http_client=DefaultAsyncHttpxClient(
+                        # HTTP/2 multiplexes concurrent completions over one connection;
+                        # it needs the optional h2 package (httpx[http2])
+                        http2=config.AI_HTTP2 and importlib.util.find_spec("h2") is not None,
+                        limits=httpx.Limits(
+                            max_connections=config.AI_HTTP_MAX_CONNECTIONS,
+                            max_keepalive_connections=config.AI_HTTP_MAX_KEEPALIVE,
+                        ),
+                        timeout=httpx.Timeout(
+                            config.AI_HTTP_TIMEOUT, connect=config.AI_HTTP_CONNECT_TIMEOUT
+                        ),
+                    ),
+                )
+    return _async_client
+
+
+async def warm_up_ai_client() -> None:
+    """Open a connection to OpenRouter ahead of the first completion request"""
+    if not config.OPENROUTER_API_KEY:
+        return
+    try:
+        await _get_async_client(config.OPENROUTER_API_KEY).models.list()
+        logger.info("OpenRouter connection warmed up")
+    except Exception as e:
+        logger.warning(f"OpenRouter warm-up failed: {str(e)}")
+
+
+async def close_ai_client() -> None:
+    """Close the shared AsyncOpenAI client and its connection pool"""
+    global _async_client
+    with _async_client_lock:
+        client, _async_client = _async_client, None
+    if client is not None:
+        await client.close()
+
+
+# One limiter per event loop: the API server, the Streamlit background loop and
+# tests each run their own loop, and an asyncio.Semaphore is bound to one loop
+_request_limiters: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _request_limiter() -> asyncio.Semaphore:
+    """Process-wide cap on in-flight OpenRouter requests for the running loop"""
+    loop = asyncio.get_running_loop()
+    limiter = _request_limiters.get(loop)
+    if limiter is None:
+        limiter = _request_limiters[loop] = asyncio.Semaphore(config.AI_GLOBAL_MAX_CONCURRENCY)
+    return limiter
+
+
+class _TokenBudget:
+    """
+    Sliding one-minute window of estimated tokens sent to OpenRouter.
+
+    Requests wait before being sent, instead of being rejected with a 429 and
+    retried, when they would push the process past the provider's
+    tokens-per-minute limit. A request larger than the whole budget is let
+    through once the window is empty so it can never wait forever.
+    """
+
+    WINDOW_SECONDS: Final = 60.0
+
+    def __init__(self, tokens_per_minute: int, clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize token budget
+
+        Args:
+            tokens_per_minute: Budget per window; 0 disables throttling
+            clock: Monotonic time source, in seconds
+        """
+        self.tokens_per_minute = tokens_per_minute
+        self._clock = clock
+        self._spent: Deque[Tuple[float, int]] = deque()
+        self._total = 0
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: int) -> float:
+        """
+        Reserve tokens if the window has room
+
+        Args:
+            tokens: Estimated prompt plus completion tokens
+
+        Returns:
+            0 once reserved, otherwise seconds until the oldest spend expires
+        """
+        if self.tokens_per_minute <= 0:
+            return 0.0
+
+        with self._lock:
+            now = self._clock()
+            while self._spent and self._spent[0][0] <= now - self.WINDOW_SECONDS:
+                self._total -= self._spent.popleft()[1]
+
+            if self._spent and self._total + tokens > self.tokens_per_minute:
+                return self._spent[0][0] + self.WINDOW_SECONDS - now
+
+            self._spent.append((now, tokens))
+            self._total += tokens
+            return 0.0
+
+    async def acquire(self, tokens: int) -> None:
+        """Wait until tokens fit in the window, then reserve them"""
+        while (delay := self.reserve(tokens)) > 0:
+            logger.info(f"Token budget exhausted, delaying AI request {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+
+# Shared by every client in the process, like the provider's own limit
+_token_budget = _TokenBudget(config.AI_TOKENS_PER_MINUTE)
+
+
+def _estimate_tokens(
+    prompt: str, system_instruction: Optional[SystemInstruction], max_tokens: int
+) -> int:
+    """Rough upper bound on a request's tokens: ~4 characters each plus the completion cap"""
+    blocks = [system_instruction] if isinstance(system_instruction, str) else system_instruction
+    characters = len(prompt) + sum(len(block) for block in blocks or ())
+    return characters // 4 + max_tokens
+
+
+def _build_system_message(system_instruction: SystemInstruction) -> Dict:
+    """
+    Build the system message, marking each block as a provider prompt-cache breakpoint.
+
+    OpenRouter forwards cache_control to Anthropic models and ignores it for providers
+    that cache prefixes automatically (OpenAI, Grok), so static instructions are billed
+    and prefilled once per cache window instead of on every request.
+    """
+    blocks = [system_instruction] if isinstance(system_instruction, str) else system_instruction
+
+    if not config.AI_PROMPT_CACHING:
+        return {"role": "system", "content": "\n\n".join(blocks)}
+
+    return {
+        "role": "system",
+        "content": [
+            {"type": "text", "text": block, "cache_control": {"type": "ephemeral"}}
+            for block in blocks
+        ],
+    }
+
+
+def _technical_difficulties(error: Exception) -> str:
+    """Response text for a request that failed after its retries"""
+    return (
+        "I'm experiencing technical difficulties. Please try again in a moment. "
+        f"Error: {str(error)}"
+    )
+
+
+def _parse_bulk_plans(content: str, count: int, key: str = "plans") -> Optional[List[str]]:
+    """Extract the key array (plans by default) from a bulk response, or None if it is malformed"""
+    try:
+        plans = json.loads(content).get(key)
+    except (ValueError, AttributeError):
+        return None
+    if not isinstance(plans, list) or len(plans) != count:
+        return None
+    if not all(isinstance(plan, str) and plan for plan in plans):
+        return None
+    return plans
+
+
+class _PromptCoalescer:
+    """
+    Coalesces concurrent prompts that share one system instruction into bulk requests.
+
+    The first prompt to arrive opens a window of config.AI_COALESCE_WINDOW_MS.
+    Everything submitted before it closes, up to config.AI_BULK_BATCH_SIZE
+    prompts, is row-marshaled into one JSON request, as in
+    generate_treatment_plans_bulk. A lone prompt is sent as a normal request,
+    and a batch whose JSON cannot be parsed is retried one prompt per request.
+    A bulk request that fails outright is not: every prompt gets its error.
+    """
+
+    def __init__(self, instruction: str, bulk_instruction: str, key: str):
+        """
+        Initialize coalescer
+
+        Args:
+            instruction: System instruction for a single prompt
+            bulk_instruction: System instruction asking for a JSON array under key
+            key: JSON key holding one response per prompt
+        """
+        self.instruction = instruction
+        self.bulk_instruction = bulk_instruction
+        self.key = key
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: set = set()
+
+    async def submit(self, client: "HealthAIClient", prompt: str) -> str:
+        """Queue a prompt for the current window and wait for its own response"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((prompt, future))
+
+        if len(self._pending) >= max(1, config.AI_BULK_BATCH_SIZE):
+            self._flush(client)
+        elif self._timer is None:
+            self._timer = loop.call_later(config.AI_COALESCE_WINDOW_MS / 1000, self._flush, client)
+        return await future
+
+    def _flush(self, client: "HealthAIClient") -> None:
+        """Close the current window and send its prompts"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.get_running_loop().create_task(self._complete(client, batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _complete(
+        self, client: "HealthAIClient", batch: List[Tuple[str, asyncio.Future]]
+    ) -> None:
+        """Resolve each caller's future with its response, or the batch's error"""
+        try:
+            responses = await self._responses(client, [prompt for prompt, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), response in zip(batch, responses):
+            # A caller may have been cancelled while the batch was in flight
+            if not future.done():
+                future.set_result(response)
+
+    async def _responses(self, client: "HealthAIClient", prompts: List[str]) -> List[str]:
+        """Complete a window's prompts, in one request when there are several"""
+        if len(prompts) == 1:
+            return [await client._make_request(prompts[0], self.instruction)]
+
+        requests = [{"request": number, "text": p} for number, p in enumerate(prompts, start=1)]
+        try:
+            content = await client._make_request(
+                f"Respond to each of the following {len(prompts)} requests. "
+                f'Return a JSON object {{"{self.key}": [...]}} with exactly {len(prompts)} strings.'
+                f"\n\n{json.dumps(requests, indent=2)}",
+                self.bulk_instruction,
+                max_tokens=config.AI_MAX_TOKENS * len(prompts),
+                response_format={"type": "json_object"},
+                raise_errors=True,
+            )
+        except Exception as e:
+            # An outage or rate limit would only fail the same way N more times
+            return [_technical_difficulties(e)] * len(prompts)
+        responses = _parse_bulk_plans(content, len(prompts), self.key)
+        if responses is None:
+            logger.warning(
+                f"Coalesced response malformed; retrying {len(prompts)} prompt(s) individually"
+            )
+            responses = await client.batch_complete(
+                [(prompt, self.instruction) for prompt in prompts]
+            )
+        return responses
+
+
+# Per event loop, like the request limiter: futures and timers are bound to one loop
+_symptom_coalescers: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _PromptCoalescer]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _symptom_coalescer() -> _PromptCoalescer:
+    """Coalescer for symptom analyses on the running loop"""
+    loop = asyncio.get_running_loop()
+    coalescer = _symptom_coalescers.get(loop)
+    if coalescer is None:
+        coalescer = _symptom_coalescers[loop] = _PromptCoalescer(
+            SYMPTOM_ANALYSIS_INSTRUCTION, BULK_SYMPTOM_ANALYSIS_INSTRUCTION, "analyses"
+        )
+    return coalescer
+
+
+def _is_retryable(error: Exception) -> bool:
+    """Whether an OpenRouter error is transient (rate limit, timeout, connection, 5xx)"""
+    if isinstance(error, (openai.RateLimitError, openai.APIConnectionError)):
+        return True
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code >= 500
+    return False
+
 
 class HealthAIClient:
     """Handles all AI API interactions with error handling and retry logic via OpenRouter"""
@@ -25,38 +429,102 @@ class HealthAIClient:
         if not self.api_key:
             raise ValueError("OPENROUTER_API_KEY not found in environment variables")
 
-        # Initialize OpenAI client with OpenRouter endpoint
-        self.client = OpenAI(
-            base_url="https://openrouter.ai/api/v1",
-            api_key=self.api_key,
-            default_headers={"HTTP-Referer": "https://healthai.app", "X-Title": config.APP_NAME},
-        )
+        # Shared async OpenAI client with OpenRouter endpoint
+        self.client = _get_async_client(self.api_key)
 
         # Use configured AI model
         self.model_name = config.AI_MODEL
 
-    def _make_request(self, prompt: str, system_instruction: Optional[str] = None) -> str:
-        """Make a request to OpenRouter API with retry logic"""
+    def _cache_key(
+        self,
+        prompt: str,
+        system_instruction: Optional[SystemInstruction],
+        max_tokens: int,
+        temperature: float,
+    ) -> Optional[str]:
+        """Response cache key, or None when this request should not be cached"""
+        # Only deterministic-enough completions are worth serving from cache
+        if not config.AI_CACHE_ENABLED or temperature > config.AI_CACHE_MAX_TEMPERATURE:
+            return None
+        return ResponseCache.make_key(
+            self.model_name, temperature, max_tokens, system_instruction, prompt
+        )
 
-        # Build messages array for OpenAI-compatible format
+    @staticmethod
+    def _build_messages(prompt: str, system_instruction: Optional[SystemInstruction]) -> List[Dict]:
+        """Build messages array for OpenAI-compatible format"""
         messages = []
         if system_instruction:
-            messages.append({"role": "system", "content": system_instruction})
+            messages.append(_build_system_message(system_instruction))
         messages.append({"role": "user", "content": prompt})
+        return messages
+
+    async def _make_request(
+        self,
+        prompt: str,
+        system_instruction: Optional[SystemInstruction] = None,
+        semantic: bool = False,
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+        response_format: Optional[Dict] = None,
+        raise_errors: bool = False,
+    ) -> str:
+        """Make a request to OpenRouter API with retry logic and response caching
+
+        Args:
+            prompt: User prompt
+            system_instruction: Optional system instruction, or blocks ordered static-first
+            semantic: Also match paraphrased prompts via the semantic cache.
+                      Only used for general chat/advice, never for patient-specific analysis.
+            max_tokens: Override for config.AI_MAX_TOKENS
+            temperature: Override for config.AI_TEMPERATURE
+            response_format: Optional structured output mode, e.g. {"type": "json_object"}
+            raise_errors: Raise the final error instead of returning an apology, so bulk
+                          callers can tell a failed request from a malformed response
+        """
+        max_tokens = max_tokens or config.AI_MAX_TOKENS
+        temperature = config.AI_TEMPERATURE if temperature is None else temperature
+
+        use_semantic = False
+        cache_key = self._cache_key(prompt, system_instruction, max_tokens, temperature)
+        if cache_key:
+            cached = _response_cache.get(cache_key)
+            if cached is not None:
+                logger.info("Returning cached AI response")
+                return cached
+
+            use_semantic = semantic and _semantic_cache is not None
+            if use_semantic:
+                cached = _semantic_cache.get(str(system_instruction), prompt)
+                if cached is not None:
+                    return cached
+
+        messages = self._build_messages(prompt, system_instruction)
+        request_options = {"response_format": response_format} if response_format else {}
+
+        # Rejected attempts don't consume provider tokens, so reserve once per call
+        await _token_budget.acquire(_estimate_tokens(prompt, system_instruction, max_tokens))
 
         for attempt in range(self.max_retries):
             try:
-                response = self.client.chat.completions.create(
-                    model=self.model_name,
-                    messages=messages,
-                    temperature=config.AI_TEMPERATURE,
-                    max_tokens=config.AI_MAX_TOKENS,
-                )
+                # Held per attempt so backoff sleeps don't occupy a slot
+                async with _request_limiter():
+                    response = await self.client.chat.completions.create(
+                        model=self.model_name,
+                        messages=messages,
+                        temperature=temperature,
+                        max_tokens=max_tokens,
+                        **request_options,
+                    )
 
                 # Extract response content
                 if response.choices and len(response.choices) > 0:
                     content = response.choices[0].message.content
                     if content:
+                        if cache_key:
+                            _response_cache.set(cache_key, content)
+                        if use_semantic:
+                            _semantic_cache.set(str(system_instruction), prompt, content)
                         return content
                     else:
                         return "I apologize, but I couldn't generate a response. Please try again or rephrase your question."
@@ -66,83 +534,285 @@ class HealthAIClient:
             except Exception as e:
                 logger.error(f"Attempt {attempt + 1} failed: {str(e)}")
 
-                if attempt < self.max_retries - 1:
-                    time.sleep(self.retry_delay * (attempt + 1))
+                if _is_retryable(e) and attempt < self.max_retries - 1:
+                    await asyncio.sleep(self._backoff_delay(attempt))
                 else:
-                    logger.error(f"All retry attempts failed: {str(e)}")
-                    return f"I'm experiencing technical difficulties. Please try again in a moment. Error: {str(e)}"
+                    logger.error(f"AI request failed after {attempt + 1} attempt(s): {str(e)}")
+                    if raise_errors:
+                        raise
+                    return _technical_difficulties(e)
 
         return "Unable to process your request at this time. Please try again later."
 
-    def chat_with_patient(self, message: str) -> str:
-        """Handle patient chat queries"""
+    async def _stream_request(
+        self,
+        prompt: str,
+        system_instruction: Optional[SystemInstruction] = None,
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+        semantic: bool = False,
+    ) -> AsyncIterator[str]:
+        """Stream a completion from OpenRouter, yielding text deltas as they arrive
+
+        Connection failures are retried like _make_request until the first token;
+        a stream interrupted midway ends with an apology instead of raising. If
+        the provider rejects stream=True, the full response is yielded at once.
+        Cache hits, exact or semantic, are yielded as a single chunk.
+        """
+        max_tokens = max_tokens or config.AI_MAX_TOKENS
+        temperature = config.AI_TEMPERATURE if temperature is None else temperature
+
+        use_semantic = False
+        cache_key = self._cache_key(prompt, system_instruction, max_tokens, temperature)
+        if cache_key:
+            cached = _response_cache.get(cache_key)
+            if cached is not None:
+                logger.info("Returning cached AI response")
+                yield cached
+                return
+
+            use_semantic = semantic and _semantic_cache is not None
+            if use_semantic:
+                cached = _semantic_cache.get(str(system_instruction), prompt)
+                if cached is not None:
+                    yield cached
+                    return
+
+        messages = self._build_messages(prompt, system_instruction)
+        tokens = _estimate_tokens(prompt, system_instruction, max_tokens)
+
+        # A stream occupies its slot until the last token arrives
+        await _token_budget.acquire(tokens)
+        stream = None
+        async with _request_limiter():
+            for attempt in range(self.max_retries):
+                try:
+                    stream = await self.client.chat.completions.create(
+                        model=self.model_name,
+                        messages=messages,
+                        temperature=temperature,
+                        max_tokens=max_tokens,
+                        stream=True,
+                    )
+                    break
+                except openai.BadRequestError as e:
+                    logger.warning(f"Streaming rejected, falling back to a single response: {e}")
+                    break
+                except Exception as e:
+                    logger.error(f"Stream attempt {attempt + 1} failed: {str(e)}")
+                    if _is_retryable(e) and attempt < self.max_retries - 1:
+                        await asyncio.sleep(self._backoff_delay(attempt))
+                    else:
+                        yield "I'm experiencing technical difficulties. Please try again in a moment."
+                        return
+
+            if stream is not None:
+                parts = []
+                async for text in self._relay_stream(stream, parts):
+                    yield text
+                if parts and cache_key:
+                    content = "".join(parts)
+                    _response_cache.set(cache_key, content)
+                    if use_semantic:
+                        _semantic_cache.set(str(system_instruction), prompt, content)
+                return
+
+        # Outside the limiter: _make_request takes its own slot
+        yield await self._make_request(
+            prompt,
+            system_instruction,
+            semantic=semantic,
+            max_tokens=max_tokens,
+            temperature=temperature,
+        )
 
-        system_instruction = """You are HealthAI, an intelligent healthcare assistant. Your role is to:
-1. Provide accurate, evidence-based health information
-2. Be empathetic and supportive
-3. Always remind users that you are an AI assistant and not a substitute for professional medical advice
-4. Encourage users to consult healthcare professionals for serious concerns
-5. Be clear and concise in your responses
-6. Ask clarifying questions when needed
+    @staticmethod
+    async def _relay_stream(stream, parts: List[str]) -> AsyncIterator[str]:
+        """Yield a completion stream's text deltas, collecting them into parts
+
+        parts is cleared if the stream is interrupted, so a partial answer is never cached.
+        """
+        try:
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    text = chunk.choices[0].delta.content
+                    parts.append(text)
+                    yield text
+        except Exception as e:
+            logger.error(f"AI response stream interrupted: {str(e)}")
+            parts.clear()
+            yield "\n\nI'm experiencing technical difficulties. Please try again in a moment."
+            return
+
+        if not parts:
+            yield "I apologize, but I couldn't generate a response. Please try again."
+
+    def _backoff_delay(self, attempt: int) -> float:
+        """Exponential backoff with jitter so concurrent retries don't synchronize"""
+        delay = self.retry_delay * (2**attempt) + random.uniform(0, self.retry_delay)
+        return min(delay, config.AI_RETRY_MAX_DELAY)
+
+    async def chat_completion(
+        self,
+        system_prompt: SystemInstruction,
+        user_message: str,
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+    ) -> str:
+        """Send a message with a caller-built system prompt (used by context-aware chat)"""
+        return await self._make_request(
+            user_message, system_prompt, max_tokens=max_tokens, temperature=temperature
+        )
 
-Important: Always include a disclaimer that you are not a doctor and users should seek professional medical advice for diagnosis and treatment."""
+    async def batch_complete(
+        self, items: List[Tuple[str, Optional[SystemInstruction]]], semantic: bool = False
+    ) -> List[str]:
+        """Complete several prompts concurrently, bounded by config.AI_MAX_CONCURRENCY
 
-        return self._make_request(message, system_instruction)
+        Args:
+            items: (prompt, system_instruction) pairs
+            semantic: Also match paraphrased prompts via the semantic cache
 
-    def analyze_symptoms(self, symptoms: str) -> str:
-        """Analyze symptoms and suggest possible conditions"""
+        Returns:
+            Responses in the same order as items; failed items get an apology message
+        """
+        semaphore = asyncio.Semaphore(config.AI_MAX_CONCURRENCY)
 
-        system_instruction = """You are a medical symptom analyzer. Based on the symptoms provided:
-1. List possible conditions that could cause these symptoms (from most to least likely)
-2. Explain why each condition might be relevant
-3. Suggest when to seek immediate medical attention
-4. Recommend appropriate next steps
+        async def complete(prompt: str, system_instruction: Optional[SystemInstruction]) -> str:
+            async with semaphore:
+                return await self._make_request(prompt, system_instruction, semantic=semantic)
 
-IMPORTANT: Always emphasize that this is not a diagnosis and users must consult a healthcare professional for proper evaluation.
+        results = await asyncio.gather(
+            *(complete(prompt, system_instruction) for prompt, system_instruction in items),
+            return_exceptions=True,
+        )
 
-Format your response clearly with:
-- Possible Conditions (with likelihood)
-- When to Seek Immediate Care
-- Recommended Next Steps
-- Disclaimer"""
+        responses = []
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"Batch item failed: {str(result)}")
+                responses.append(
+                    "I'm experiencing technical difficulties. Please try again in a moment."
+                )
+            else:
+                responses.append(result)
+        return responses
 
-        prompt = f"Please analyze these symptoms and provide possible conditions:\n\n{symptoms}"
-        return self._make_request(prompt, system_instruction)
+    async def chat_with_patient(self, message: str) -> str:
+        """Handle patient chat queries"""
 
-    def generate_treatment_plan(self, condition: str, patient_info: dict) -> str:
-        """Generate a treatment plan recommendation"""
+        return await self._make_request(message, PATIENT_CHAT_INSTRUCTION, semantic=True)
 
-        system_instruction = """You are a healthcare planning assistant. Generate a comprehensive treatment plan that includes:
-1. Overview of the condition
-2. Recommended lifestyle modifications
-3. Dietary recommendations
-4. Exercise suggestions
-5. When to follow up with healthcare providers
-6. Warning signs to watch for
+    def stream_chat_with_patient(self, message: str) -> AsyncIterator[str]:
+        """Handle patient chat queries, streaming the response as it is generated"""
+        return self._stream_request(message, PATIENT_CHAT_INSTRUCTION, semantic=True)
 
-IMPORTANT: This is a general wellness plan, not a medical prescription. Always remind users to consult their healthcare provider before starting any treatment."""
+    async def batch_chat_with_patient(self, messages: List[str]) -> List[str]:
+        """Handle several patient chat queries concurrently"""
+        return await self.batch_complete(
+            [(message, PATIENT_CHAT_INSTRUCTION) for message in messages], semantic=True
+        )
 
+    async def analyze_symptoms(self, symptoms: str) -> str:
+        """Analyze symptoms and suggest possible conditions
+
+        With config.AI_COALESCE_WINDOW_MS set, concurrent analyses are coalesced
+        into shared bulk requests. They carry only the symptom text and a static
+        instruction; prompts built from a patient's records are never batched.
+        """
+
+        prompt = f"Please analyze these symptoms and provide possible conditions:\n\n{symptoms}"
+        if config.AI_COALESCE_WINDOW_MS <= 0:
+            return await self._make_request(prompt, SYMPTOM_ANALYSIS_INSTRUCTION)
+        return await _symptom_coalescer().submit(self, prompt)
+
+    @staticmethod
+    def _treatment_plan_prompt(condition: str, patient_info: dict) -> str:
+        """Build the user prompt for a single treatment plan"""
         patient_context = (
             f"Patient: {patient_info.get('age')} years old, {patient_info.get('gender')}"
         )
-        prompt = f"{patient_context}\n\nCondition: {condition}\n\nPlease generate a comprehensive treatment and wellness plan."
+        return f"{patient_context}\n\nCondition: {condition}\n\nPlease generate a comprehensive treatment and wellness plan."
 
-        return self._make_request(prompt, system_instruction)
-
-    def get_health_advice(self, topic: str) -> str:
-        """Get general health advice on a topic"""
+    async def generate_treatment_plan(self, condition: str, patient_info: dict) -> str:
+        """Generate a treatment plan recommendation"""
 
-        system_instruction = """You are a health educator. Provide clear, evidence-based information about health topics.
-Include:
-1. Key facts about the topic
-2. Best practices
-3. Common misconceptions
-4. When to consult a healthcare provider
+        prompt = self._treatment_plan_prompt(condition, patient_info)
+        return await self._make_request(prompt, TREATMENT_PLAN_INSTRUCTION)
+
+    async def generate_treatment_plans_bulk(self, items: List[Dict]) -> List[str]:
+        """Generate treatment plans for many patients, several patients per request
+
+        Patients are row-marshaled into prompts of config.AI_BULK_BATCH_SIZE so
+        back-office jobs (evaluations, migrations) stay under the provider's
+        requests-per-minute limit. Batches run concurrently, bounded by
+        config.AI_MAX_CONCURRENCY; a batch whose JSON cannot be parsed is retried
+        one patient per request, while a batch whose request failed is not.
+
+        Args:
+            items: Dicts with condition, age and gender keys
+
+        Returns:
+            One plan per item, in the same order as items
+        """
+        size = max(1, config.AI_BULK_BATCH_SIZE)
+        batches = [items[start : start + size] for start in range(0, len(items), size)]
+        semaphore = asyncio.Semaphore(config.AI_MAX_CONCURRENCY)
+
+        async def complete(batch: List[Dict]) -> Optional[List[str]]:
+            patients = [
+                {
+                    "patient": number,
+                    "age": item.get("age"),
+                    "gender": item.get("gender"),
+                    "condition": item.get("condition"),
+                }
+                for number, item in enumerate(batch, start=1)
+            ]
+            prompt = (
+                f"Generate a plan for each of the following {len(batch)} patients. "
+                f'Return a JSON object {{"plans": [...]}} with exactly {len(batch)} strings.'
+                f"\n\n{json.dumps(patients, indent=2)}"
+            )
+            async with semaphore:
+                try:
+                    content = await self._make_request(
+                        prompt,
+                        BULK_TREATMENT_PLAN_INSTRUCTION,
+                        max_tokens=config.AI_MAX_TOKENS * len(batch),
+                        response_format={"type": "json_object"},
+                        raise_errors=True,
+                    )
+                except Exception as e:
+                    # Retrying per patient would only multiply the failing calls
+                    return [_technical_difficulties(e)] * len(batch)
+            return _parse_bulk_plans(content, len(batch))
+
+        results = await asyncio.gather(*(complete(batch) for batch in batches))
+
+        plans = []
+        for batch, batch_plans in zip(batches, results):
+            if batch_plans is None:
+                logger.warning(
+                    f"Bulk treatment plan response malformed; retrying {len(batch)} patient(s) individually"
+                )
+                batch_plans = await self.batch_complete(
+                    [
+                        (
+                            self._treatment_plan_prompt(item.get("condition"), item),
+                            TREATMENT_PLAN_INSTRUCTION,
+                        )
+                        for item in batch
+                    ]
+                )
+            plans.extend(batch_plans)
+        return plans
 
-Keep responses informative but accessible to general audiences."""
+    async def get_health_advice(self, topic: str) -> str:
+        """Get general health advice on a topic"""
 
         prompt = f"Please provide information and advice about: {topic}"
-        return self._make_request(prompt, system_instruction)
+        return await self._make_request(prompt, HEALTH_ADVICE_INSTRUCTION, semantic=True)
 
 
 def get_ai_client() -> Optional[HealthAIClient]:
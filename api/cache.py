@@ -0,0 +1,388 @@
+"""
+Per-user read cache for API GET endpoints.
+
+Cached values are serialized JSON response bodies, so a hit is returned as-is
+without touching the database or Pydantic. Entries live in Redis when REDIS_URL
+is set and the redis package is installed, otherwise in an in-process TTL cache.
+The in-process cache cannot see writes handled by other workers, so it is only
+used when the API runs a single worker; multi-worker runs need Redis to cache.
+Each user has a version counter per resource family; writes bump it so every
+cached read for that user and family becomes unreachable at once, and stale
+entries simply age out.
+
+Routes that opt in can also fall back to a longer-lived stale copy when the
+database is unreachable, flagged to the client with a Warning header.
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import threading
+from typing import Any, Callable, Dict, Optional
+
+from fastapi import Response
+from pydantic import TypeAdapter
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from backend.ai.response_cache import ResponseCache
+from backend.utils.logger import get_logger
+from config import config
+
+logger = get_logger(__name__)
+
+
+def _connect_redis(url: str):
+    """Create a Redis client, or None if redis is unavailable"""
+    try:
+        import redis
+    except ImportError:
+        logger.warning("redis package not installed; using in-process API cache")
+        return None
+    return redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+
+
+class _Flight:
+    """A cache miss being loaded, which concurrent readers of the same key wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.body: Optional[bytes] = None
+
+
+class UserReadCache:
+    """
+    TTL cache of JSON response bodies, keyed by user, route and query params
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        ttl_seconds: int = 10,
+        max_size: int = 4096,
+        redis_url: Optional[str] = None,
+        enabled: bool = True,
+        stale_ttl_seconds: int = 0,
+        shared_only: bool = False,
+    ):
+        """
+        Initialize read cache
+
+        Args:
+            namespace: Resource family, e.g. "medical-history"
+            ttl_seconds: Seconds a cached response stays valid
+            max_size: Maximum in-process entries before LRU eviction
+            redis_url: Redis connection URL; in-process cache when empty
+            enabled: When False, every lookup misses and nothing is stored
+            stale_ttl_seconds: Seconds a copy is kept for outage fallback; 0 disables
+            shared_only: Disable caching unless Redis is connected, for multi-process runs
+                where another worker's writes could not invalidate in-process entries
+        """
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds
+        self.stale_ttl_seconds = stale_ttl_seconds
+        self._redis = _connect_redis(redis_url) if enabled and redis_url else None
+        if enabled and shared_only and self._redis is None:
+            logger.warning(
+                "API cache %s disabled: multiple workers need REDIS_URL to share it", namespace
+            )
+            enabled = False
+        self.enabled = enabled
+        self._local = ResponseCache(max_size=max_size, ttl_seconds=ttl_seconds)
+        self._stale = (
+            ResponseCache(max_size=max_size, ttl_seconds=stale_ttl_seconds)
+            if stale_ttl_seconds
+            else None
+        )
+        self._versions: Dict[int, int] = {}
+        self._in_flight: Dict[str, _Flight] = {}
+        self._lock = threading.Lock()
+
+    def _version(self, user_id: int) -> int:
+        """Current cache version for a user"""
+        if self._redis is not None:
+            return int(self._redis.get(f"{self.namespace}:{user_id}:v") or 0)
+        with self._lock:
+            return self._versions.get(user_id, 0)
+
+    def _key(self, user_id: int, route: str, params: Dict[str, Any]) -> str:
+        """Cache key for one user's view of a route"""
+        query = json.dumps(params, sort_keys=True, default=str)
+        return f"{self.namespace}:{user_id}:{self._version(user_id)}:{route}:{query}"
+
+    @staticmethod
+    def _fernet(user_id: int):
+        """Per-user cipher so cached PHI is never stored in Redis as plaintext"""
+        from cryptography.fernet import Fernet
+
+        digest = hmac.new(
+            config.SECRET_KEY.encode("utf-8"),
+            f"api-cache:{user_id}".encode("utf-8"),
+            hashlib.sha256,
+        ).digest()
+        return Fernet(base64.urlsafe_b64encode(digest))
+
+    def get(self, user_id: int, route: str, **params) -> Optional[bytes]:
+        """
+        Get a cached response body
+
+        Args:
+            user_id: Owner of the cached data
+            route: Route name
+            **params: Query parameters that affect the response
+
+        Returns:
+            JSON body, or None on a miss
+        """
+        if not self.enabled:
+            return None
+
+        try:
+            return self._read(user_id, self._key(user_id, route, params))
+        except Exception as e:
+            logger.warning("API cache read failed: %s", e)
+            return None
+
+    def _read(self, user_id: int, key: str) -> Optional[bytes]:
+        """Read a body by its full cache key"""
+        if self._redis is not None:
+            token = self._redis.get(key)
+            return self._fernet(user_id).decrypt(token) if token else None
+        return self._local.get(key)
+
+    def _write(self, user_id: int, key: str, body: bytes) -> None:
+        """Store a body under its full cache key, plus its stale copy if enabled"""
+        if self._redis is not None:
+            token = self._fernet(user_id).encrypt(body)
+            self._redis.setex(key, self.ttl_seconds, token)
+            if self.stale_ttl_seconds:
+                self._redis.setex(f"{key}:stale", self.stale_ttl_seconds, token)
+            return
+
+        self._local.set(key, body)
+        if self._stale is not None:
+            self._stale.set(key, body)
+
+    def get_stale(self, user_id: int, route: str, **params) -> Optional[bytes]:
+        """
+        Get the last stored body for the user's current version, even if expired
+
+        Only meant for outage fallback; a write since then bumps the version,
+        so a stale copy never predates the user's own changes.
+
+        Args:
+            user_id: Owner of the cached data
+            route: Route name
+            **params: Query parameters that affect the response
+
+        Returns:
+            JSON body, or None if no stale copy is kept
+        """
+        if not self.enabled or not self.stale_ttl_seconds:
+            return None
+
+        try:
+            key = self._key(user_id, route, params)
+            if self._redis is not None:
+                token = self._redis.get(f"{key}:stale")
+                return self._fernet(user_id).decrypt(token) if token else None
+            return self._stale.get(key)
+        except Exception as e:
+            logger.warning("API cache stale read failed: %s", e)
+            return None
+
+    def set(self, user_id: int, route: str, body: bytes, **params) -> None:
+        """
+        Store a response body
+
+        Args:
+            user_id: Owner of the cached data
+            route: Route name
+            body: Serialized JSON body
+            **params: Query parameters that affect the response
+        """
+        if not self.enabled:
+            return
+
+        try:
+            self._write(user_id, self._key(user_id, route, params), body)
+        except Exception as e:
+            logger.warning("API cache write failed: %s", e)
+
+    def get_or_load(self, user_id: int, route: str, load: Callable[[], bytes], **params) -> bytes:
+        """
+        Get a cached body, loading it at most once across concurrent misses
+
+        Requests that miss on the same key while a load is already running
+        wait for it and reuse its body instead of issuing their own queries.
+        The key is fixed before loading, so a write landing mid-load bumps the
+        version and the result is never cached as the newer data.
+
+        Args:
+            user_id: Owner of the cached data
+            route: Route name
+            load: Callable producing the serialized JSON body on a miss
+            **params: Query parameters that affect the response
+
+        Returns:
+            JSON body
+        """
+        if not self.enabled:
+            return load()
+
+        try:
+            key = self._key(user_id, route, params)
+            body = self._read(user_id, key)
+        except Exception as e:
+            logger.warning("API cache read failed: %s", e)
+            return load()
+        if body is not None:
+            return body
+
+        with self._lock:
+            flight = self._in_flight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._in_flight[key] = _Flight()
+
+        if not leader:
+            flight.done.wait()
+            # The leader's load failed; load (and fail) independently
+            return flight.body if flight.body is not None else load()
+
+        try:
+            flight.body = load()
+            try:
+                self._write(user_id, key, flight.body)
+            except Exception as e:
+                logger.warning("API cache write failed: %s", e)
+            return flight.body
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+            flight.done.set()
+
+    def invalidate(self, user_id: int) -> None:
+        """
+        Drop every cached response for a user in this namespace
+
+        Args:
+            user_id: User whose data changed
+        """
+        if not self.enabled:
+            return
+
+        if self._redis is not None:
+            try:
+                self._redis.incr(f"{self.namespace}:{user_id}:v")
+            except Exception as e:
+                logger.warning("API cache invalidation failed: %s", e)
+            return
+
+        with self._lock:
+            self._versions[user_id] = self._versions.get(user_id, 0) + 1
+
+    def clear(self) -> None:
+        """Remove all in-process entries"""
+        self._local.clear()
+        if self._stale is not None:
+            self._stale.clear()
+        with self._lock:
+            self._versions.clear()
+
+
+def _etag(body: bytes) -> str:
+    """Weak ETag for a response body"""
+    return f'W/"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against an ETag using weak comparison"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        tag.strip().removeprefix("W/") == etag.removeprefix("W/")
+        for tag in if_none_match.split(",")
+    )
+
+
+def cached_json(
+    cache: UserReadCache,
+    user_id: int,
+    route: str,
+    adapter: TypeAdapter,
+    load: Callable[[], Any],
+    *,
+    if_none_match: Optional[str] = None,
+    allow_stale: bool = False,
+    **params,
+) -> Response:
+    """
+    Serve a GET response from cache, or load, serialize once and cache it.
+
+    Rows are validated straight from ORM attributes and dumped to JSON by
+    pydantic-core in one pass, instead of building dicts that FastAPI then
+    re-validates against the response model. Concurrent misses share one
+    load. Responses carry an ETag of the
+    body, and a client already holding it gets an empty 304 instead.
+
+    With allow_stale, a database outage serves the last stored body with a
+    Warning: 110 header instead of failing.
+
+    Args:
+        cache: Read cache for the resource family
+        user_id: Owner of the data
+        route: Route name
+        adapter: TypeAdapter for the route's response model
+        load: Callable returning the ORM rows (or dicts) on a cache miss
+        if_none_match: The request's If-None-Match header
+        allow_stale: Serve a stale copy when the database is unreachable
+        **params: Query parameters that affect the response
+
+    Returns:
+        JSON response, or 304 Not Modified when the client's copy is current
+    """
+    stale = False
+    try:
+        body = cache.get_or_load(
+            user_id,
+            route,
+            lambda: adapter.dump_json(adapter.validate_python(load(), from_attributes=True)),
+            **params,
+        )
+    except (OperationalError, PoolTimeoutError):
+        body = cache.get_stale(user_id, route, **params) if allow_stale else None
+        if body is None:
+            raise
+        logger.warning("Database unavailable; serving stale %s/%s", cache.namespace, route)
+        stale = True
+
+    etag = _etag(body)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if stale:
+        headers["Warning"] = '110 - "Response is Stale"'
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def _build_cache(namespace: str, ttl_seconds: Optional[int] = None) -> UserReadCache:
+    """Build a read cache from the API cache settings"""
+    return UserReadCache(
+        namespace,
+        ttl_seconds=ttl_seconds or config.API_CACHE_TTL,
+        max_size=config.API_CACHE_MAX_SIZE,
+        redis_url=config.REDIS_URL,
+        enabled=config.API_CACHE_ENABLED,
+        stale_ttl_seconds=config.API_CACHE_STALE_TTL,
+        # Mirrors api.main, which only starts API_WORKERS processes outside development
+        shared_only=not config.is_development() and config.API_WORKERS > 1,
+    )
+
+
+medical_history_cache = _build_cache("medical-history")
+treatment_cache = _build_cache("treatment")
+user_cache = _build_cache("user", config.API_USER_CACHE_TTL)
@@ -8,6 +8,7 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.orm import Session
 
+from backend.services.treatment_service import TreatmentService
 from backend.utils.database import get_db_manager
 from backend.utils.jwt import verify_token
 from backend.utils.logger import get_logger
@@ -31,18 +32,34 @@ def get_db() -> Generator[Session, None, None]:
         session.close()
 
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security), db: Session = Depends(get_db)
-) -> dict:
+async def get_treatment_service(db: Session = Depends(get_db)) -> TreatmentService:
+    """
+    Dependency for a treatment service bound to the request's session.
+
+    Declared async because construction never blocks, so FastAPI runs it
+    inline rather than dispatching it to the threadpool. FastAPI caches it
+    per request, so every consumer in one request shares the instance.
+
+    Args:
+        db: Database session
+
+    Returns:
+        TreatmentService instance
+    """
+    return TreatmentService(db)
+
+
+async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict:
     """
     Dependency for getting current authenticated user.
 
+    Only the token is inspected, so no database session is opened here.
+
     Args:
         credentials: HTTP authorization credentials
-        db: Database session
 
     Returns:
-        User data dictionary
+        User data dictionary (id, username, and age/gender when the token carries them)
 
     Raises:
         HTTPException: If authentication fails
@@ -66,7 +83,12 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    return {"id": int(user_id), "username": payload.get("username")}
+    return {
+        "id": int(user_id),
+        "username": payload.get("username"),
+        "age": payload.get("age"),
+        "gender": payload.get("gender"),
+    }
 
 
 async def get_current_active_user(current_user: dict = Depends(get_current_user)) -> dict:
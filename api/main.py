@@ -3,22 +3,59 @@ HealthAI FastAPI Application.
 Main API entry point with all routers and middleware.
 """
 
+import asyncio
+import sys
+import time
+from contextlib import asynccontextmanager, closing
+from typing import AsyncIterator, Dict, Optional, Tuple
+
 from fastapi import FastAPI, Request, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 from slowapi.util import get_remote_address
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 
+from ai_client import close_ai_client, warm_up_ai_client
 from api.routers import auth, chat, enhanced_chat, health, medical_history, treatment
+from backend.services.retention_service import RetentionService
+from backend.utils.database import get_db_manager
 from backend.utils.logger import get_logger
 from config import config
+from validation import ValidationError
 
 logger = get_logger(__name__)
 
 # Initialize rate limiter
 limiter = Limiter(key_func=get_remote_address)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Warm the OpenRouter connection pool on startup and close it on shutdown"""
+    # Build the OpenAPI schema once at startup; FastAPI keeps it on
+    # app.openapi_schema, so the first /docs hit no longer walks every model
+    app.openapi()
+    if config.CHAT_HISTORY_RETENTION_DAYS > 0 or config.SYMPTOM_LOG_RETENTION_DAYS > 0:
+        await asyncio.to_thread(_purge_expired_records)
+    await warm_up_ai_client()
+    yield
+    await close_ai_client()
+
+
+def _purge_expired_records() -> None:
+    """Apply the retention windows once; a failure is logged and never blocks startup"""
+    try:
+        with closing(get_db_manager().get_session()) as session:
+            RetentionService(session).purge_expired()
+    except Exception as e:
+        logger.error(f"Retention purge failed: {str(e)}")
+
+
 # Create FastAPI app
 app = FastAPI(
     title="HealthAI API",
@@ -26,6 +63,7 @@ app = FastAPI(
     version="2.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 # Add rate limiting
@@ -55,7 +93,9 @@ app.include_router(enhanced_chat.router, prefix=config.API_PREFIX)
 app.include_router(medical_history.router, prefix=config.API_PREFIX)
 
 
-@app.get("/", tags=["Root"])
+# Every JSON route declares a response model so FastAPI serializes it straight to
+# bytes with pydantic-core (faster than a custom ORJSONResponse class)
+@app.get("/", tags=["Root"], response_model=Dict[str, str])
 async def root():
     """Root endpoint"""
     return {
@@ -66,24 +106,42 @@ async def root():
     }
 
 
-@app.get("/health", tags=["Health Check"])
-async def health_check():
+# Last database probe as (monotonic timestamp, status)
+_db_health: Optional[Tuple[float, str]] = None
+
+
+def _check_database() -> str:
     """
-    Health check endpoint for monitoring and load balancers.
+    Probe the database, reusing the last result for HEALTH_CHECK_CACHE_SECONDS.
+
+    Returns:
+        "healthy" or "unhealthy"
     """
-    try:
-        # Check database connection
-        from backend.utils.database import get_db_manager
+    global _db_health
+    now = time.monotonic()
+    if _db_health and now - _db_health[0] < config.HEALTH_CHECK_CACHE_SECONDS:
+        return _db_health[1]
 
-        db_manager = get_db_manager()
-        session = db_manager.get_session()
-        session.execute("SELECT 1")
-        session.close()
+    try:
+        with closing(get_db_manager().get_session()) as session:
+            session.execute(text("SELECT 1"))
         db_status = "healthy"
     except Exception as e:
         logger.error(f"Database health check failed: {str(e)}")
         db_status = "unhealthy"
 
+    _db_health = (now, db_status)
+    return db_status
+
+
+@app.get("/health", tags=["Health Check"], response_model=Dict[str, str])
+async def health_check():
+    """
+    Health check endpoint for monitoring and load balancers.
+    """
+    # The probe blocks on a pool checkout and a round trip, so keep it off the event loop
+    db_status = await run_in_threadpool(_check_database)
+
     # Check AI API (optional - can be slow)
     ai_status = "healthy" if config.OPENROUTER_API_KEY else "not_configured"
 
@@ -97,6 +155,27 @@ async def health_check():
     }
 
 
+@app.exception_handler(ValidationError)
+async def validation_exception_handler(request: Request, exc: ValidationError):
+    """Map input validation failures from the service layer to 422"""
+    return JSONResponse(
+        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        content={"detail": str(exc)},
+    )
+
+
+@app.exception_handler(OperationalError)
+@app.exception_handler(PoolTimeoutError)
+async def database_unavailable_handler(request: Request, exc: Exception):
+    """Report lost connections and pool exhaustion as a retryable 503"""
+    logger.error(f"Database unavailable: {str(exc)}")
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Database temporarily unavailable"},
+        headers={"Retry-After": "1"},
+    )
+
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     """Global exception handler"""
@@ -110,10 +189,16 @@ async def global_exception_handler(request: Request, exc: Exception):
 if __name__ == "__main__":
     import uvicorn
 
+    reload = config.is_development()
+
     uvicorn.run(
         "api.main:app",
         host=config.API_HOST,
         port=config.API_PORT,
-        reload=config.is_development(),
+        reload=reload,
+        # uvicorn does not support multiple workers together with reload
+        workers=None if reload else config.API_WORKERS,
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
         log_level=config.LOG_LEVEL.lower(),
     )
@@ -2,15 +2,16 @@
 Authentication router for user registration and login.
 """
 
-from datetime import timedelta
+from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
 
+from api.cache import cached_json, user_cache
 from api.dependencies import get_current_user, get_db
 from api.schemas.user import TokenResponse, UserCreate, UserLogin, UserResponse
 from backend.exceptions.auth_exceptions import InvalidCredentialsError, UserAlreadyExistsError
-from backend.exceptions.validation_exceptions import ValidationError
 from backend.services.auth_service import AuthService
 from backend.utils.jwt import create_access_token, create_refresh_token
 from backend.utils.logger import get_logger
@@ -18,9 +19,11 @@ from backend.utils.logger import get_logger
 logger = get_logger(__name__)
 router = APIRouter()
 
+_user_adapter = TypeAdapter(UserResponse)
+
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-async def register(user_data: UserCreate, db: Session = Depends(get_db)):
+def register(user_data: UserCreate, db: Session = Depends(get_db)):
     """
     Register a new user.
 
@@ -45,17 +48,10 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
 
     except UserAlreadyExistsError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
-    except ValidationError as e:
-        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
-    except Exception as e:
-        logger.error(f"Registration error: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Registration failed"
-        )
 
 
 @router.post("/login", response_model=TokenResponse)
-async def login(credentials: UserLogin, db: Session = Depends(get_db)):
+def login(credentials: UserLogin, db: Session = Depends(get_db)):
     """
     Login and get access token.
 
@@ -70,14 +66,23 @@ async def login(credentials: UserLogin, db: Session = Depends(get_db)):
         auth_service = AuthService(db)
         user = auth_service.login_user(credentials.username, credentials.password)
 
-        # Create tokens
+        # Create tokens; the access token carries the profile fields used to
+        # personalize AI prompts so those requests skip a user lookup
         access_token = create_access_token(
-            data={"sub": str(user["id"]), "username": user["username"]}
+            data={
+                "sub": str(user["id"]),
+                "username": user["username"],
+                "age": user["age"],
+                "gender": user["gender"],
+            }
         )
         refresh_token = create_refresh_token(
             data={"sub": str(user["id"]), "username": user["username"]}
         )
 
+        # Most clients fetch /me right after logging in
+        user_cache.set(user["id"], "me", _user_adapter.dump_json(UserResponse(**user)))
+
         logger.info(f"User logged in via API: {user['username']}")
 
         return TokenResponse(
@@ -90,38 +95,34 @@ async def login(credentials: UserLogin, db: Session = Depends(get_db)):
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    except Exception as e:
-        logger.error(f"Login error: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Login failed"
-        )
 
 
 @router.get("/me", response_model=UserResponse)
-async def get_current_user_info(
-    current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)
+def get_current_user_info(
+    if_none_match: Optional[str] = Header(None),
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db),
 ):
     """
     Get current user information.
 
+    Profiles are cached per user, so repeat calls skip the user lookup.
+
     Args:
+        if_none_match: If-None-Match header for conditional requests
         current_user: Current authenticated user
         db: Database session
 
     Returns:
         User information
     """
-    try:
-        auth_service = AuthService(db)
-        user = auth_service.get_user_by_id(current_user["id"])
 
+    def load_user() -> dict:
+        user = AuthService(db).get_user_by_id(current_user["id"])
         if not user:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+        return user
 
-        return UserResponse(**user)
-
-    except Exception as e:
-        logger.error(f"Error fetching user info: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to fetch user info"
-        )
+    return cached_json(
+        user_cache, current_user["id"], "me", _user_adapter, load_user, if_none_match=if_none_match
+    )
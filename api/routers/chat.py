@@ -2,13 +2,17 @@
 Chat router for AI conversations.
 """
 
-from typing import List
+from typing import AsyncIterator, Dict, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic_core import to_json
 from sqlalchemy.orm import Session
 
 from api.dependencies import get_current_user, get_db
 from api.schemas.chat import (
+    ChatBatchRequest,
     ChatMessageCreate,
     ChatMessageResponse,
     SymptomAnalysisRequest,
@@ -16,6 +20,7 @@ from api.schemas.chat import (
     TreatmentPlanGenerationResponse,
     TreatmentPlanRequest,
 )
+from backend.services.auth_service import AuthService
 from backend.services.chat_service import ChatService
 from backend.utils.logger import get_logger
 
@@ -40,43 +45,100 @@ async def send_message(
     Returns:
         Chat message with AI response
     """
-    try:
-        chat_service = ChatService(db)
-        result = chat_service.send_message(current_user["id"], message_data.message)
-        return ChatMessageResponse(**result)
+    chat_service = ChatService(db)
+    result = await chat_service.send_message(current_user["id"], message_data.message)
+    return ChatMessageResponse(**result)
+
 
+async def _sse_events(events: AsyncIterator[Dict]) -> AsyncIterator[str]:
+    """Format service events as Server-Sent Events"""
+    # Headers are already sent once streaming starts, so errors can only be
+    # reported in-band rather than through the global exception handler
+    try:
+        async for event in events:
+            # pydantic-core encodes datetimes natively, with no jsonable_encoder pass
+            yield f"data: {to_json(event).decode()}\n\n"
     except Exception as e:
-        logger.error(f"Chat error: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to process message"
-        )
+        logger.error(f"Chat stream error: {str(e)}")
+        yield f"data: {to_json({'error': 'Failed to process message'}).decode()}\n\n"
+
+
+@router.post("/message/stream")
+async def stream_message(
+    message_data: ChatMessageCreate,
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Send a chat message and stream the AI response as Server-Sent Events.
+
+    Each event is `data: {"delta": "..."}`; the final event carries `"done": true`
+    with the saved message id and timestamp.
+
+    Args:
+        message_data: Chat message
+        current_user: Current authenticated user
+        db: Database session
+
+    Returns:
+        text/event-stream response
+    """
+    chat_service = ChatService(db)
+    events = chat_service.stream_message(current_user["id"], message_data.message)
+
+    return StreamingResponse(
+        _sse_events(events),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post("/batch", response_model=List[ChatMessageResponse])
+async def send_message_batch(
+    batch_data: ChatBatchRequest,
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Send several chat messages and get AI responses concurrently.
+
+    Args:
+        batch_data: Chat messages (up to 10)
+        current_user: Current authenticated user
+        db: Database session
+
+    Returns:
+        Chat messages with AI responses, in request order
+    """
+    chat_service = ChatService(db)
+    results = await chat_service.send_messages(current_user["id"], batch_data.messages)
+    # response_model validates and serializes the rows once
+    return results
 
 
 @router.get("/history", response_model=List[ChatMessageResponse])
-async def get_chat_history(
-    limit: int = 50, current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)
+def get_chat_history(
+    limit: int = 50,
+    before_id: Optional[int] = None,
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db),
 ):
     """
     Get chat history for current user.
 
     Args:
         limit: Maximum number of messages
+        before_id: Only return messages older than this id, for loading earlier pages
         current_user: Current authenticated user
         db: Database session
 
     Returns:
         List of chat messages
     """
-    try:
-        chat_service = ChatService(db)
-        history = chat_service.get_chat_history(current_user["id"], limit)
-        return [ChatMessageResponse(**msg) for msg in history]
-
-    except Exception as e:
-        logger.error(f"Error fetching chat history: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to fetch chat history"
-        )
+    chat_service = ChatService(db)
+    history = chat_service.get_chat_history(current_user["id"], limit, before_id)
+    # response_model validates and serializes the rows once
+    return history
 
 
 @router.post("/symptoms", response_model=SymptomAnalysisResponse)
@@ -96,16 +158,9 @@ async def analyze_symptoms(
     Returns:
         Symptom analysis
     """
-    try:
-        chat_service = ChatService(db)
-        result = chat_service.analyze_symptoms(current_user["id"], symptom_data.symptoms)
-        return SymptomAnalysisResponse(**result)
-
-    except Exception as e:
-        logger.error(f"Symptom analysis error: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to analyze symptoms"
-        )
+    chat_service = ChatService(db)
+    result = await chat_service.analyze_symptoms(current_user["id"], symptom_data.symptoms)
+    return SymptomAnalysisResponse(**result)
 
 
 @router.post("/treatment-plan", response_model=TreatmentPlanGenerationResponse)
@@ -125,33 +180,25 @@ async def generate_treatment_plan(
     Returns:
         Generated treatment plan
     """
-    try:
-        chat_service = ChatService(db)
-
-        # Get user info for personalization
-        from backend.services.auth_service import AuthService
-
-        auth_service = AuthService(db)
-        user = auth_service.get_user_by_id(current_user["id"])
+    chat_service = ChatService(db)
 
+    # Profile fields come from the token; tokens issued before they were
+    # embedded fall back to a user lookup
+    if current_user.get("age") is None or current_user.get("gender") is None:
+        user = await run_in_threadpool(AuthService(db).get_user_by_id, current_user["id"])
         patient_info = {"age": user["age"], "gender": user["gender"]}
+    else:
+        patient_info = {"age": current_user["age"], "gender": current_user["gender"]}
 
-        plan = chat_service.generate_treatment_plan(
-            current_user["id"], plan_request.condition, patient_info
-        )
-
-        return TreatmentPlanGenerationResponse(condition=plan_request.condition, plan=plan)
+    plan = await chat_service.generate_treatment_plan(
+        current_user["id"], plan_request.condition, patient_info
+    )
 
-    except Exception as e:
-        logger.error(f"Treatment plan generation error: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to generate treatment plan",
-        )
+    return TreatmentPlanGenerationResponse(condition=plan_request.condition, plan=plan)
 
 
 @router.delete("/history", status_code=status.HTTP_204_NO_CONTENT)
-async def clear_chat_history(
+def clear_chat_history(
     current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)
 ):
     """
@@ -161,13 +208,6 @@ async def clear_chat_history(
         current_user: Current authenticated user
         db: Database session
     """
-    try:
-        chat_service = ChatService(db)
-        chat_service.clear_history(current_user["id"])
-        logger.info(f"Chat history cleared for user {current_user['id']}")
-
-    except Exception as e:
-        logger.error(f"Error clearing chat history: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to clear chat history"
-        )
+    chat_service = ChatService(db)
+    chat_service.clear_history(current_user["id"])
+    logger.info(f"Chat history cleared for user {current_user['id']}")
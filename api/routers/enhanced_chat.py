@@ -2,7 +2,7 @@
 Enhanced Chat Router - Context-aware AI chat with medical intelligence
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 
 from api.dependencies import get_current_user, get_db
@@ -37,18 +37,10 @@ async def send_contextual_message(
     - Safety checks and warnings
     - Comprehensive responses (300-500 words)
     """
-    try:
-        service = EnhancedChatService(db)
-        result = service.send_contextual_message(current_user["id"], message_data.message)
+    service = EnhancedChatService(db)
+    result = await service.send_contextual_message(current_user["id"], message_data.message)
 
-        return ContextualMessageResponse(**result)
-
-    except Exception as e:
-        logger.error(f"Enhanced chat error: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to process message",
-        )
+    return ContextualMessageResponse(**result)
 
 
 @router.post("/analyze-symptoms", response_model=SymptomAnalysisResponse)
@@ -67,18 +59,10 @@ async def analyze_symptoms_contextual(
     - Detailed assessment (500-700 words)
     - Safety warnings
     """
-    try:
-        service = EnhancedChatService(db)
-        result = service.analyze_symptoms_with_context(current_user["id"], symptom_data.symptoms)
-
-        return SymptomAnalysisResponse(**result)
+    service = EnhancedChatService(db)
+    result = await service.analyze_symptoms_with_context(current_user["id"], symptom_data.symptoms)
 
-    except Exception as e:
-        logger.error(f"Symptom analysis error: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to analyze symptoms",
-        )
+    return SymptomAnalysisResponse(**result)
 
 
 @router.post("/treatment-plan", response_model=TreatmentPlanResponse)
@@ -97,17 +81,9 @@ async def generate_personalized_treatment_plan(
     - Age and gender-specific guidance
     - Comprehensive plans (700-1000 words)
     """
-    try:
-        service = EnhancedChatService(db)
-        result = service.generate_treatment_plan_with_context(
-            current_user["id"], plan_request.condition
-        )
-
-        return TreatmentPlanResponse(**result)
+    service = EnhancedChatService(db)
+    result = await service.generate_treatment_plan_with_context(
+        current_user["id"], plan_request.condition
+    )
 
-    except Exception as e:
-        logger.error(f"Treatment plan error: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to generate treatment plan",
-        )
+    return TreatmentPlanResponse(**result)
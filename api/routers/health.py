@@ -2,13 +2,20 @@
 Health metrics router.
 """
 
+from datetime import date
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Body, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from api.dependencies import get_current_user, get_db
-from api.schemas.health import HealthMetricCreate, HealthMetricResponse, HealthStatisticsResponse
+from api.schemas.health import (
+    HealthDailySummaryResponse,
+    HealthMetricCreate,
+    HealthMetricResponse,
+    HealthStatisticsResponse,
+)
+from api.schemas.medical_history import MAX_BULK_ITEMS
 from backend.services.health_service import HealthService
 from backend.utils.logger import get_logger
 
@@ -17,67 +24,76 @@ router = APIRouter()
 
 
 @router.post("/metrics", response_model=HealthMetricResponse, status_code=status.HTTP_201_CREATED)
-async def record_metric(
+def record_metric(
     metric_data: HealthMetricCreate,
     current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     """Record a health metric."""
-    try:
-        health_service = HealthService(db)
-        metric = health_service.record_metric(
-            user_id=current_user["id"],
-            metric_type=metric_data.metric_type,
-            value=metric_data.value,
-            unit=metric_data.unit,
-            notes=metric_data.notes,
-        )
-        return HealthMetricResponse(**metric)
-    except Exception as e:
-        logger.error(f"Error recording metric: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to record metric"
-        )
+    health_service = HealthService(db)
+    metric = health_service.record_metric(
+        user_id=current_user["id"],
+        metric_type=metric_data.metric_type,
+        value=metric_data.value,
+        unit=metric_data.unit,
+        notes=metric_data.notes,
+    )
+    return HealthMetricResponse(**metric)
+
+
+@router.post(
+    "/metrics/bulk",
+    response_model=List[HealthMetricResponse],
+    status_code=status.HTTP_201_CREATED,
+)
+def record_metrics_bulk(
+    metrics: List[HealthMetricCreate] = Body(..., min_length=1, max_length=MAX_BULK_ITEMS),
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Record a batch of health metrics, such as a wearable sync, in one INSERT."""
+    health_service = HealthService(db)
+    return health_service.record_metrics(current_user["id"], [m.model_dump() for m in metrics])
 
 
 @router.get("/metrics", response_model=List[HealthMetricResponse])
-async def get_metrics(
+def get_metrics(
     metric_type: Optional[str] = None,
     limit: int = 100,
     current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     """Get health metrics."""
-    try:
-        health_service = HealthService(db)
-        metrics = health_service.get_metrics(current_user["id"], metric_type, limit)
-        return [HealthMetricResponse(**m) for m in metrics]
-    except Exception as e:
-        logger.error(f"Error fetching metrics: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to fetch metrics"
-        )
+    health_service = HealthService(db)
+    metrics = health_service.get_metrics(current_user["id"], metric_type, limit)
+    # response_model validates and serializes the rows once
+    return metrics
+
+
+@router.get("/daily/{metric_type}", response_model=List[HealthDailySummaryResponse])
+def get_daily_summary(
+    metric_type: str,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Get a metric rolled up per day, for charting long ranges."""
+    health_service = HealthService(db)
+    return health_service.get_daily_summary(current_user["id"], metric_type, start, end)
 
 
 @router.get("/statistics/{metric_type}", response_model=HealthStatisticsResponse)
-async def get_statistics(
+def get_statistics(
     metric_type: str, current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)
 ):
     """Get statistics for a specific metric type."""
-    try:
-        health_service = HealthService(db)
-        stats = health_service.get_statistics(current_user["id"], metric_type)
-
-        if not stats:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="No data found for this metric type"
-            )
-
-        return HealthStatisticsResponse(**stats)
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error fetching statistics: {str(e)}")
+    health_service = HealthService(db)
+    stats = health_service.get_statistics(current_user["id"], metric_type)
+
+    if not stats:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to fetch statistics"
+            status_code=status.HTTP_404_NOT_FOUND, detail="No data found for this metric type"
         )
+
+    return HealthStatisticsResponse(**stats)
@@ -2,15 +2,20 @@
 Medical History API Router - Manage patient medical history
 """
 
-from typing import List
+from typing import Iterable, Iterator, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Body, Depends, Header, HTTPException, status
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
 
+from api.cache import cached_json, medical_history_cache
 from api.dependencies import get_current_user, get_db
 from api.schemas.medical_history import (
+    MAX_BULK_ITEMS,
     AllergyCreate,
     AllergyResponse,
+    BulkCreateResponse,
     MedicalConditionCreate,
     MedicalConditionResponse,
     MedicationCreate,
@@ -18,7 +23,6 @@ from api.schemas.medical_history import (
     SymptomLogCreate,
     SymptomLogResponse,
 )
-from backend.models.user import User
 from backend.repositories.allergy_repository import AllergyRepository
 from backend.repositories.medical_history_repository import MedicalHistoryRepository
 from backend.repositories.medication_repository import MedicationRepository
@@ -26,6 +30,26 @@ from backend.repositories.symptom_repository import SymptomRepository
 
 router = APIRouter(prefix="/medical-history", tags=["Medical History"])
 
+# List responses are serialized straight from ORM rows (see cached_json)
+_conditions_adapter = TypeAdapter(List[MedicalConditionResponse])
+_medications_adapter = TypeAdapter(List[MedicationResponse])
+_allergies_adapter = TypeAdapter(List[AllergyResponse])
+_symptoms_adapter = TypeAdapter(List[SymptomLogResponse])
+
+
+def _json_array_chunks(adapter: TypeAdapter, batches: Iterable[List]) -> Iterator[bytes]:
+    """Serialize row batches into one JSON array, yielding a chunk per batch"""
+    yield b"["
+    first = True
+    for batch in batches:
+        if not batch:
+            continue
+        # Strip each batch's brackets and join them with commas
+        chunk = adapter.dump_json(adapter.validate_python(batch, from_attributes=True))[1:-1]
+        yield chunk if first else b"," + chunk
+        first = False
+    yield b"]"
+
 
 # Medical Conditions Endpoints
 @router.post(
@@ -33,13 +57,13 @@ router = APIRouter(prefix="/medical-history", tags=["Medical History"])
 )
 def add_medical_condition(
     condition: MedicalConditionCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     """Add a new medical condition"""
     repo = MedicalHistoryRepository(db)
     new_condition = repo.add_condition(
-        user_id=current_user.id,
+        user_id=current_user["id"],
         condition_name=condition.condition_name,
         status=condition.status,
         severity=condition.severity,
@@ -48,32 +72,62 @@ def add_medical_condition(
     )
     if not new_condition:
         raise HTTPException(status_code=500, detail="Failed to add condition")
-    return new_condition.to_dict()
+    medical_history_cache.invalidate(current_user["id"])
+    return new_condition
+
+
+@router.post(
+    "/conditions/bulk",
+    response_model=BulkCreateResponse[MedicalConditionResponse],
+    status_code=status.HTTP_201_CREATED,
+)
+def add_medical_conditions_bulk(
+    conditions: List[MedicalConditionCreate] = Body(..., min_length=1, max_length=MAX_BULK_ITEMS),
+    best_effort: bool = False,
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Add many medical conditions in one INSERT (set best_effort to skip bad rows)"""
+    repo = MedicalHistoryRepository(db)
+    created, failed = repo.bulk_add_conditions(
+        current_user["id"], [c.model_dump() for c in conditions], best_effort=best_effort
+    )
+    medical_history_cache.invalidate(current_user["id"])
+    return {"created": created, "failed": failed}
 
 
 @router.get("/conditions", response_model=List[MedicalConditionResponse])
 def get_medical_conditions(
     status: str = None,
-    current_user: User = Depends(get_current_user),
+    if_none_match: Optional[str] = Header(None),
+    current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     """Get all medical conditions for current user"""
     repo = MedicalHistoryRepository(db)
-    conditions = repo.get_by_user(current_user.id, status=status)
-    return [c.to_dict() for c in conditions]
+    return cached_json(
+        medical_history_cache,
+        current_user["id"],
+        "conditions",
+        _conditions_adapter,
+        lambda: repo.get_by_user(current_user["id"], status=status, rows=True),
+        status=status,
+        if_none_match=if_none_match,
+        allow_stale=True,
+    )
 
 
 # Medications Endpoints
 @router.post("/medications", response_model=MedicationResponse, status_code=status.HTTP_201_CREATED)
 def add_medication(
     medication: MedicationCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     """Add a new medication"""
     repo = MedicationRepository(db)
     new_med = repo.add_medication(
-        user_id=current_user.id,
+        user_id=current_user["id"],
         medication_name=medication.medication_name,
         dosage=medication.dosage,
         frequency=medication.frequency,
@@ -84,46 +138,76 @@ def add_medication(
     )
     if not new_med:
         raise HTTPException(status_code=500, detail="Failed to add medication")
-    return new_med.to_dict()
+    medical_history_cache.invalidate(current_user["id"])
+    return new_med
+
+
+@router.post(
+    "/medications/bulk",
+    response_model=BulkCreateResponse[MedicationResponse],
+    status_code=status.HTTP_201_CREATED,
+)
+def add_medications_bulk(
+    medications: List[MedicationCreate] = Body(..., min_length=1, max_length=MAX_BULK_ITEMS),
+    best_effort: bool = False,
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Add many medications in one INSERT (set best_effort to skip bad rows)"""
+    repo = MedicationRepository(db)
+    created, failed = repo.bulk_add_medications(
+        current_user["id"], [m.model_dump() for m in medications], best_effort=best_effort
+    )
+    medical_history_cache.invalidate(current_user["id"])
+    return {"created": created, "failed": failed}
 
 
 @router.get("/medications", response_model=List[MedicationResponse])
 def get_medications(
     status: str = None,
-    current_user: User = Depends(get_current_user),
+    if_none_match: Optional[str] = Header(None),
+    current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     """Get all medications for current user"""
     repo = MedicationRepository(db)
-    medications = repo.get_by_user(current_user.id, status=status)
-    return [m.to_dict() for m in medications]
+    return cached_json(
+        medical_history_cache,
+        current_user["id"],
+        "medications",
+        _medications_adapter,
+        lambda: repo.get_by_user(current_user["id"], status=status, rows=True),
+        status=status,
+        if_none_match=if_none_match,
+    )
 
 
 @router.patch("/medications/{medication_id}/discontinue", response_model=MedicationResponse)
 def discontinue_medication(
     medication_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     """Mark medication as discontinued"""
     repo = MedicationRepository(db)
-    medication = repo.discontinue_medication(medication_id)
+    medication = repo.discontinue_medication(medication_id, current_user["id"])
     if not medication:
         raise HTTPException(status_code=404, detail="Medication not found")
-    return medication.to_dict()
+    medical_history_cache.invalidate(current_user["id"])
+    return medication
 
 
 # Allergies Endpoints
 @router.post("/allergies", response_model=AllergyResponse, status_code=status.HTTP_201_CREATED)
 def add_allergy(
     allergy: AllergyCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     """Add a new allergy"""
     repo = AllergyRepository(db)
     new_allergy = repo.add_allergy(
-        user_id=current_user.id,
+        user_id=current_user["id"],
         allergen=allergy.allergen,
         reaction=allergy.reaction,
         severity=allergy.severity,
@@ -134,31 +218,40 @@ def add_allergy(
     )
     if not new_allergy:
         raise HTTPException(status_code=500, detail="Failed to add allergy")
-    return new_allergy.to_dict()
+    medical_history_cache.invalidate(current_user["id"])
+    return new_allergy
 
 
 @router.get("/allergies", response_model=List[AllergyResponse])
 def get_allergies(
-    current_user: User = Depends(get_current_user),
+    if_none_match: Optional[str] = Header(None),
+    current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     """Get all allergies for current user"""
     repo = AllergyRepository(db)
-    allergies = repo.get_by_user(current_user.id)
-    return [a.to_dict() for a in allergies]
+    return cached_json(
+        medical_history_cache,
+        current_user["id"],
+        "allergies",
+        _allergies_adapter,
+        lambda: repo.get_by_user(current_user["id"], rows=True),
+        if_none_match=if_none_match,
+        allow_stale=True,
+    )
 
 
 # Symptom Logs Endpoints
 @router.post("/symptoms", response_model=SymptomLogResponse, status_code=status.HTTP_201_CREATED)
 def log_symptom(
     symptom: SymptomLogCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     """Log a new symptom"""
     repo = SymptomRepository(db)
     new_symptom = repo.log_symptom(
-        user_id=current_user.id,
+        user_id=current_user["id"],
         symptom_description=symptom.symptom_description,
         severity=symptom.severity,
         body_part=symptom.body_part,
@@ -175,28 +268,59 @@ def log_symptom(
     )
     if not new_symptom:
         raise HTTPException(status_code=500, detail="Failed to log symptom")
-    return new_symptom.to_dict()
+    medical_history_cache.invalidate(current_user["id"])
+    return new_symptom
+
+
+@router.post(
+    "/symptoms/bulk",
+    response_model=BulkCreateResponse[SymptomLogResponse],
+    status_code=status.HTTP_201_CREATED,
+)
+def log_symptoms_bulk(
+    symptoms: List[SymptomLogCreate] = Body(..., min_length=1, max_length=MAX_BULK_ITEMS),
+    best_effort: bool = False,
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Log many symptoms in one INSERT, e.g. when a device syncs offline entries"""
+    repo = SymptomRepository(db)
+    created, failed = repo.bulk_log_symptoms(
+        current_user["id"], [s.model_dump() for s in symptoms], best_effort=best_effort
+    )
+    medical_history_cache.invalidate(current_user["id"])
+    return {"created": created, "failed": failed}
 
 
 @router.get("/symptoms", response_model=List[SymptomLogResponse])
 def get_symptoms(
     limit: int = 50,
-    current_user: User = Depends(get_current_user),
+    if_none_match: Optional[str] = Header(None),
+    current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     """Get symptom logs for current user"""
     repo = SymptomRepository(db)
-    symptoms = repo.get_by_user(current_user.id, limit=limit)
-    return [s.to_dict() for s in symptoms]
+    return cached_json(
+        medical_history_cache,
+        current_user["id"],
+        "symptoms",
+        _symptoms_adapter,
+        lambda: repo.get_by_user(current_user["id"], limit=limit, rows=True),
+        limit=limit,
+        if_none_match=if_none_match,
+    )
 
 
 @router.get("/symptoms/recent", response_model=List[SymptomLogResponse])
 def get_recent_symptoms(
     days: int = 30,
-    current_user: User = Depends(get_current_user),
+    current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
-    """Get recent symptoms (last N days)"""
+    """Get recent symptoms (last N days), streamed since the window is unbounded"""
     repo = SymptomRepository(db)
-    symptoms = repo.get_recent_symptoms(current_user.id, days=days)
-    return [s.to_dict() for s in symptoms]
+    return StreamingResponse(
+        _json_array_chunks(_symptoms_adapter, repo.iter_recent_symptoms(current_user["id"], days)),
+        media_type="application/json",
+    )
@@ -2,12 +2,13 @@
 Treatment plans router.
 """
 
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from pydantic import TypeAdapter
 
-from api.dependencies import get_current_user, get_db
+from api.cache import cached_json, treatment_cache
+from api.dependencies import get_current_user, get_treatment_service
 from api.schemas.treatment import TreatmentPlanCreate, TreatmentPlanResponse
 from backend.services.treatment_service import TreatmentService
 from backend.utils.logger import get_logger
@@ -15,91 +16,87 @@ from backend.utils.logger import get_logger
 logger = get_logger(__name__)
 router = APIRouter()
 
+_plan_adapter = TypeAdapter(TreatmentPlanResponse)
+_plans_adapter = TypeAdapter(List[TreatmentPlanResponse])
+
 
 @router.post("/plans", response_model=TreatmentPlanResponse, status_code=status.HTTP_201_CREATED)
-async def create_plan(
+def create_plan(
     plan_data: TreatmentPlanCreate,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    treatment_service: TreatmentService = Depends(get_treatment_service),
 ):
     """Create a treatment plan."""
-    try:
-        treatment_service = TreatmentService(db)
-        plan = treatment_service.create_plan(
-            user_id=current_user["id"],
-            title=plan_data.title,
-            condition=plan_data.condition,
-            plan_details=plan_data.plan_details,
-        )
-        return TreatmentPlanResponse(**plan)
-    except Exception as e:
-        logger.error(f"Error creating treatment plan: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to create treatment plan",
-        )
+    plan = treatment_service.create_plan(
+        user_id=current_user["id"],
+        title=plan_data.title,
+        condition=plan_data.condition,
+        plan_details=plan_data.plan_details,
+    )
+    treatment_cache.invalidate(current_user["id"])
+    return TreatmentPlanResponse(**plan)
 
 
 @router.get("/plans", response_model=List[TreatmentPlanResponse])
-async def get_plans(current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
+def get_plans(
+    if_none_match: Optional[str] = Header(None),
+    current_user: dict = Depends(get_current_user),
+    treatment_service: TreatmentService = Depends(get_treatment_service),
+):
     """Get all treatment plans for current user."""
-    try:
-        treatment_service = TreatmentService(db)
-        plans = treatment_service.get_user_plans(current_user["id"])
-        return [TreatmentPlanResponse(**p) for p in plans]
-    except Exception as e:
-        logger.error(f"Error fetching treatment plans: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to fetch treatment plans",
-        )
+    return cached_json(
+        treatment_cache,
+        current_user["id"],
+        "plans",
+        _plans_adapter,
+        lambda: treatment_service.get_user_plans(current_user["id"]),
+        if_none_match=if_none_match,
+        allow_stale=True,
+    )
 
 
 @router.get("/plans/{plan_id}", response_model=TreatmentPlanResponse)
-async def get_plan(
-    plan_id: int, current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)
+def get_plan(
+    plan_id: int,
+    if_none_match: Optional[str] = Header(None),
+    current_user: dict = Depends(get_current_user),
+    treatment_service: TreatmentService = Depends(get_treatment_service),
 ):
     """Get a specific treatment plan."""
-    try:
-        treatment_service = TreatmentService(db)
-        plan = treatment_service.get_plan_by_id(current_user["id"], plan_id)
 
+    def load_plan() -> dict:
+        plan = treatment_service.get_plan_by_id(current_user["id"], plan_id)
         if not plan:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Treatment plan not found"
             )
+        return plan
 
-        return TreatmentPlanResponse(**plan)
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error fetching treatment plan: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to fetch treatment plan",
-        )
+    return cached_json(
+        treatment_cache,
+        current_user["id"],
+        "plan",
+        _plan_adapter,
+        load_plan,
+        plan_id=plan_id,
+        if_none_match=if_none_match,
+        allow_stale=True,
+    )
 
 
 @router.delete("/plans/{plan_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_plan(
-    plan_id: int, current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)
+def delete_plan(
+    plan_id: int,
+    current_user: dict = Depends(get_current_user),
+    treatment_service: TreatmentService = Depends(get_treatment_service),
 ):
     """Delete a treatment plan."""
-    try:
-        treatment_service = TreatmentService(db)
-        deleted = treatment_service.delete_plan(current_user["id"], plan_id)
+    deleted = treatment_service.delete_plan(current_user["id"], plan_id)
 
-        if not deleted:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="Treatment plan not found"
-            )
-
-        logger.info(f"Treatment plan {plan_id} deleted by user {current_user['id']}")
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error deleting treatment plan: {str(e)}")
+    if not deleted:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to delete treatment plan",
+            status_code=status.HTTP_404_NOT_FOUND, detail="Treatment plan not found"
         )
+
+    treatment_cache.invalidate(current_user["id"])
+    logger.info("Treatment plan %s deleted by user %s", plan_id, current_user["id"])
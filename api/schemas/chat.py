@@ -3,9 +3,9 @@ Pydantic schemas for chat-related requests and responses.
 """
 
 from datetime import datetime
-from typing import Optional
+from typing import List
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class ChatMessageCreate(BaseModel):
@@ -14,6 +14,12 @@ class ChatMessageCreate(BaseModel):
     message: str = Field(..., min_length=1, max_length=5000)
 
 
+class ChatBatchRequest(BaseModel):
+    """Schema for sending several chat messages at once"""
+
+    messages: List[str] = Field(..., min_length=1, max_length=10)
+
+
 class ChatMessageResponse(BaseModel):
     """Schema for chat message response"""
 
@@ -22,8 +28,7 @@ class ChatMessageResponse(BaseModel):
     response: str
     timestamp: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class SymptomAnalysisRequest(BaseModel):
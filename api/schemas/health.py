@@ -2,10 +2,10 @@
 Pydantic schemas for health metrics.
 """
 
-from datetime import datetime
+from datetime import date, datetime
 from typing import Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class HealthMetricCreate(BaseModel):
@@ -27,8 +27,17 @@ class HealthMetricResponse(BaseModel):
     notes: Optional[str]
     recorded_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+
+
+class HealthDailySummaryResponse(BaseModel):
+    """Schema for one day of a metric's daily rollup"""
+
+    day: date
+    average: float
+    minimum: float
+    maximum: float
+    count: int
 
 
 class HealthStatisticsResponse(BaseModel):
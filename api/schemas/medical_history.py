@@ -3,9 +3,23 @@ Pydantic schemas for medical history API
 """
 
 from datetime import date, datetime
-from typing import Optional
+from typing import Generic, List, Literal, Optional, TypeVar
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+
+# Maximum records accepted by a single bulk create request
+MAX_BULK_ITEMS = 500
+
+ResponseT = TypeVar("ResponseT")
+
+
+class BulkCreateResponse(BaseModel, Generic[ResponseT]):
+    """Schema for bulk create response"""
+
+    created: List[ResponseT]
+    failed: List[int] = Field(
+        default_factory=list, description="Indexes of request items that were not stored"
+    )
 
 
 # Medical Condition Schemas
@@ -14,8 +28,8 @@ class MedicalConditionCreate(BaseModel):
 
     condition_name: str = Field(..., min_length=1, max_length=200)
     diagnosed_date: Optional[date] = None
-    status: str = Field(default="active", pattern="^(active|resolved|chronic|managed)$")
-    severity: Optional[str] = Field(None, pattern="^(mild|moderate|severe)$")
+    status: Literal["active", "resolved", "chronic", "managed"] = "active"
+    severity: Optional[Literal["mild", "moderate", "severe"]] = None
     notes: Optional[str] = None
 
 
@@ -25,15 +39,14 @@ class MedicalConditionResponse(BaseModel):
     id: int
     user_id: int
     condition_name: str
-    diagnosed_date: Optional[str]
+    diagnosed_date: Optional[date]
     status: str
     severity: Optional[str]
     notes: Optional[str]
-    created_at: str
-    updated_at: str
+    created_at: datetime
+    updated_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # Medication Schemas
@@ -58,16 +71,15 @@ class MedicationResponse(BaseModel):
     dosage: Optional[str]
     frequency: Optional[str]
     route: Optional[str]
-    start_date: Optional[str]
-    end_date: Optional[str]
+    start_date: Optional[date]
+    end_date: Optional[date]
     status: str
     reason: Optional[str]
     prescribing_doctor: Optional[str]
-    created_at: str
-    updated_at: str
+    created_at: datetime
+    updated_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # Allergy Schemas
@@ -75,12 +87,9 @@ class AllergyCreate(BaseModel):
     """Schema for creating an allergy"""
 
     allergen: str = Field(..., min_length=1, max_length=200)
-    allergen_type: Optional[str] = Field(None, pattern="^(medication|food|environmental|other)$")
+    allergen_type: Optional[Literal["medication", "food", "environmental", "other"]] = None
     reaction: str = Field(..., min_length=1)
-    severity: str = Field(
-        default="moderate",
-        pattern="^(mild|moderate|severe|life-threatening)$",
-    )
+    severity: Literal["mild", "moderate", "severe", "life-threatening"] = "moderate"
     verified_date: Optional[date] = None
     verified_by: Optional[str] = Field(None, max_length=200)
     notes: Optional[str] = None
@@ -95,14 +104,13 @@ class AllergyResponse(BaseModel):
     allergen_type: Optional[str]
     reaction: str
     severity: str
-    verified_date: Optional[str]
+    verified_date: Optional[date]
     verified_by: Optional[str]
     notes: Optional[str]
-    created_at: str
-    updated_at: str
+    created_at: datetime
+    updated_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # Symptom Log Schemas
@@ -120,7 +128,7 @@ class SymptomLogCreate(BaseModel):
     triggers: Optional[str] = None
     relieving_factors: Optional[str] = None
     aggravating_factors: Optional[str] = None
-    impact_on_life: Optional[str] = Field(None, pattern="^(none|mild|moderate|severe)$")
+    impact_on_life: Optional[Literal["none", "mild", "moderate", "severe"]] = None
     notes: Optional[str] = None
 
 
@@ -132,7 +140,7 @@ class SymptomLogResponse(BaseModel):
     symptom_description: str
     body_part: Optional[str]
     severity: Optional[int]
-    onset_date: Optional[str]
+    onset_date: Optional[datetime]
     duration: Optional[str]
     frequency: Optional[str]
     quality: Optional[str]
@@ -142,10 +150,9 @@ class SymptomLogResponse(BaseModel):
     aggravating_factors: Optional[str]
     impact_on_life: Optional[str]
     notes: Optional[str]
-    logged_at: str
+    logged_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # Enhanced Chat Schemas
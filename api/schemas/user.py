@@ -5,7 +5,7 @@ Pydantic schemas for user-related requests and responses.
 from datetime import datetime
 from typing import Optional
 
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, ConfigDict, Field, validator
 
 
 class UserBase(BaseModel):
@@ -40,8 +40,7 @@ class UserResponse(UserBase):
 
     id: int
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class TokenResponse(BaseModel):
@@ -1,14 +1,23 @@
 import os
+from copy import copy
 from datetime import datetime, timedelta
+from types import MappingProxyType
+from typing import Any, Mapping
 
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 import streamlit as st
 from dotenv import load_dotenv
 
 from ai_client import get_ai_client
+from backend.utils.async_utils import iter_sync, run_sync
+from backend.utils.gc_tuning import tune_gc
+from config import config
 from db import DatabaseManager, User
+from validation import InputValidator
+
+# Chat turns are buffered and written in batches of this size
+CHAT_FLUSH_EVERY = 5
+# Saved chat turns loaded per "Load older messages" page
+CHAT_HISTORY_PAGE_SIZE = 10
 
 # Load environment variables from .env file
 load_dotenv()
@@ -23,6 +32,10 @@ st.set_page_config(
 
 
 # Initialize database and Gemini API
+# st.cache_resource returns the same object on every rerun without hashing,
+# pickling or copying it. Never pass these singletons as arguments to an
+# @st.cache_data function, whose arguments are hashed on every call; read the
+# module globals inside it instead.
 @st.cache_resource
 def init_database():
     return DatabaseManager()
@@ -49,15 +62,43 @@ if not os.environ.get("OPENROUTER_API_KEY"):
 
 gemini = init_ai_client()
 
-# Session state initialization
-if "logged_in" not in st.session_state:
-    st.session_state.logged_in = False
-if "user" not in st.session_state:
-    st.session_state.user = None
-if "page" not in st.session_state:
-    st.session_state.page = "chat"
-if "chat_messages" not in st.session_state:
-    st.session_state.chat_messages = []
+# After the singletons exist, so they are frozen along with the imports
+tune_gc(config.STREAMLIT_GC_GEN0_THRESHOLD)
+
+# Streamlit re-executes this script on every interaction, so lookup tables
+# live in imported modules (built once per process) and are only aliased here
+METRIC_UNITS = InputValidator.METRIC_UNITS
+METRIC_TYPES = InputValidator.METRIC_TYPES
+
+NAV_PAGES = ("💬 Patient Chat", "🔍 Symptom Checker", "📋 Treatment Plans", "📊 Health Analytics")
+SESSION_DEFAULTS: Mapping[str, Any] = MappingProxyType(
+    {
+        "logged_in": False,
+        "user": None,
+        "page": "chat",
+        "chat_messages": [],
+        "chat_write_buffer": [],
+        # "start" until the first page is loaded, None once no older turns remain
+        "chat_history_cursor": "start",
+        # Saved plans as loaded at login; None means reload on next view
+        "treatment_plans": None,
+    }
+)
+
+# Session state initialization; mutable defaults are copied per session
+for _key, _default in SESSION_DEFAULTS.items():
+    st.session_state.setdefault(_key, copy(_default))
+
+
+def flush_chat_buffer():
+    """Save buffered chat turns in one batch"""
+    if not st.session_state.chat_write_buffer or not st.session_state.user:
+        return
+    try:
+        db.add_chat_messages(st.session_state.user["id"], st.session_state.chat_write_buffer)
+        st.session_state.chat_write_buffer = []
+    except Exception as e:
+        st.error(f"Failed to save chat: {str(e)}")
 
 
 def show_medical_disclaimer():
@@ -101,8 +142,11 @@ def login_page():
             if not login_username or not login_password:
                 st.error("Please enter both username and password")
             else:
-                user = db.authenticate_user(login_username, login_password)
-                if user:
+                bootstrap = db.authenticate_and_bootstrap(
+                    login_username, login_password, chat_limit=CHAT_HISTORY_PAGE_SIZE
+                )
+                if bootstrap:
+                    user = bootstrap.user
                     st.session_state.logged_in = True
                     st.session_state.user = {
                         "id": user.id,
@@ -111,6 +155,10 @@ def login_page():
                         "age": user.age,
                         "gender": user.gender,
                     }
+                    # The first chat page and saved plans came with the login query
+                    st.session_state.chat_messages = []
+                    prepend_chat_history(bootstrap.chat_history)
+                    st.session_state.treatment_plans = bootstrap.treatment_plans
                     st.success(f"Welcome back, {user.full_name}!")
                     st.rerun()
                 else:
@@ -150,17 +198,42 @@ def login_page():
                     st.error(f"Registration failed: {str(e)}")
 
 
+def load_older_chat_history():
+    """Prepend the next page of saved chat turns to the transcript"""
+    cursor = st.session_state.chat_history_cursor
+    history = db.get_chat_history(
+        st.session_state.user["id"],
+        limit=CHAT_HISTORY_PAGE_SIZE,
+        before_id=None if cursor == "start" else cursor,
+    )
+    prepend_chat_history(history)
+
+
+def prepend_chat_history(history):
+    """Prepend one page of saved chat turns (newest first) and advance the cursor"""
+    older = []
+    for h in reversed(history):
+        older.append({"role": "user", "content": h.message})
+        older.append({"role": "assistant", "content": h.response})
+    st.session_state.chat_messages = older + st.session_state.chat_messages
+
+    # A short page means nothing older is left
+    st.session_state.chat_history_cursor = (
+        history[-1].id if len(history) == CHAT_HISTORY_PAGE_SIZE else None
+    )
+
+
 def patient_chat_page():
     """AI-powered patient chat interface"""
     st.title("💬 Patient Chat")
     st.markdown("Ask me anything about your health concerns. I'm here to help!")
 
-    # Load chat history
-    if not st.session_state.chat_messages:
-        history = db.get_chat_history(st.session_state.user["id"], limit=20)
-        for h in reversed(history):
-            st.session_state.chat_messages.append({"role": "user", "content": h.message})
-            st.session_state.chat_messages.append({"role": "assistant", "content": h.response})
+    # Load the latest chat history, and older pages on demand
+    if st.session_state.chat_history_cursor == "start":
+        load_older_chat_history()
+    if st.session_state.chat_history_cursor is not None:
+        if st.button("Load older messages"):
+            load_older_chat_history()
 
     # Display chat messages
     for message in st.session_state.chat_messages:
@@ -176,20 +249,19 @@ def patient_chat_page():
 
         # Get AI response
         with st.chat_message("assistant"):
-            with st.spinner("Thinking..."):
-                if gemini:
-                    response = gemini.chat_with_patient(prompt)
-                else:
-                    response = "I'm currently unavailable. Please try again later."
-
+            # Tokens are painted as they arrive; write_stream returns the full text
+            if gemini:
+                response = st.write_stream(iter_sync(gemini.stream_chat_with_patient(prompt)))
+            else:
+                response = "I'm currently unavailable. Please try again later."
                 st.markdown(response)
-                st.session_state.chat_messages.append({"role": "assistant", "content": response})
 
-                # Save to database
-                try:
-                    db.add_chat_message(st.session_state.user["id"], prompt, response)
-                except Exception as e:
-                    st.error(f"Failed to save chat: {str(e)}")
+            st.session_state.chat_messages.append({"role": "assistant", "content": response})
+
+            # Buffer the turn; it is saved with the next batch, on leaving the page or on logout
+            st.session_state.chat_write_buffer.append((prompt, response, datetime.utcnow()))
+            if len(st.session_state.chat_write_buffer) >= CHAT_FLUSH_EVERY:
+                flush_chat_buffer()
 
 
 def symptom_checker_page():
@@ -213,7 +285,7 @@ def symptom_checker_page():
         else:
             with st.spinner("Analyzing symptoms..."):
                 if gemini:
-                    analysis = gemini.analyze_symptoms(symptoms)
+                    analysis = run_sync(gemini.analyze_symptoms(symptoms))
 
                     st.markdown("### Analysis Results")
                     st.markdown(analysis)
@@ -265,7 +337,7 @@ def treatment_plan_page():
                             "gender": st.session_state.user["gender"],
                         }
 
-                        plan = gemini.generate_treatment_plan(condition, patient_info)
+                        plan = run_sync(gemini.generate_treatment_plan(condition, patient_info))
                         st.session_state.generated_plan = plan
                         st.session_state.plan_condition = condition
                     else:
@@ -291,6 +363,7 @@ def treatment_plan_page():
                             condition=st.session_state.plan_condition,
                             plan_details=st.session_state.generated_plan,
                         )
+                        st.session_state.treatment_plans = None
                         st.success("Treatment plan saved successfully!")
                         st.session_state.generated_plan = None
                         st.session_state.plan_condition = None
@@ -305,7 +378,9 @@ def treatment_plan_page():
     with tab2:
         st.subheader("Your Saved Treatment Plans")
 
-        plans = db.get_treatment_plans(st.session_state.user["id"])
+        if st.session_state.treatment_plans is None:
+            st.session_state.treatment_plans = db.get_treatment_plans(st.session_state.user["id"])
+        plans = st.session_state.treatment_plans
 
         if not plans:
             st.info("You don't have any saved treatment plans yet.")
@@ -318,6 +393,69 @@ def treatment_plan_page():
                     st.markdown(plan.plan_details)
 
 
+@st.cache_data(ttl=600, max_entries=256, show_spinner=False)
+def build_metric_chart(user_id, metric_type, version):
+    """Build the trend figure, statistics and table for one metric
+
+    Cached across reruns; version is the (newest id, count) stamp of the
+    series, so recording a metric invalidates the cached chart immediately.
+    Arguments are hashed on every call, so only plain keys are passed; db is
+    read from the module global.
+
+    Returns:
+        (figure, statistics, display table), or None if there is no data
+    """
+    # Deferred so pages without charts never pay for importing pandas and Plotly
+    import pandas as pd
+    import plotly.graph_objects as go
+
+    series = db.get_health_metric_series(user_id, metric_type)
+    if series is None:
+        return None
+
+    # Prepare data for visualization, straight from the column arrays
+    unit = series["unit"]
+    values = series["Value"]
+    df = pd.DataFrame(
+        {"Date": series["Date"], "Value": values, "Notes": series["Notes"]}, copy=False
+    )
+
+    # Create interactive plot
+    fig = go.Figure()
+
+    fig.add_trace(
+        go.Scatter(
+            x=df["Date"],
+            y=df["Value"],
+            mode="lines+markers",
+            name=metric_type,
+            line=dict(color="#1f77b4", width=2),
+            marker=dict(size=8),
+            hovertemplate="<b>%{x}</b><br>Value: %{y}<extra></extra>",
+        )
+    )
+
+    fig.update_layout(
+        title=f"{metric_type} Trend",
+        xaxis_title="Date",
+        yaxis_title=f"{metric_type} ({unit})",
+        hovermode="x unified",
+        height=400,
+    )
+
+    stats = {
+        "latest": float(values[-1]),
+        "average": float(values.mean()),
+        "minimum": float(values.min()),
+        "maximum": float(values.max()),
+        "unit": unit,
+    }
+
+    display_df = df.copy()
+    display_df["Date"] = display_df["Date"].dt.strftime("%Y-%m-%d %H:%M")
+    return fig, stats, display_df
+
+
 def health_analytics_page():
     """Health analytics dashboard"""
     st.title("📊 Health Analytics")
@@ -330,31 +468,11 @@ def health_analytics_page():
         col1, col2 = st.columns(2)
 
         with col1:
-            metric_type = st.selectbox(
-                "Metric Type",
-                [
-                    "Heart Rate",
-                    "Blood Pressure (Systolic)",
-                    "Blood Pressure (Diastolic)",
-                    "Blood Glucose",
-                    "Weight",
-                    "Temperature",
-                    "Oxygen Saturation",
-                ],
-            )
+            metric_type = st.selectbox("Metric Type", METRIC_TYPES)
 
         with col2:
             # Set appropriate units based on metric type
-            unit_mapping = {
-                "Heart Rate": "bpm",
-                "Blood Pressure (Systolic)": "mmHg",
-                "Blood Pressure (Diastolic)": "mmHg",
-                "Blood Glucose": "mg/dL",
-                "Weight": "kg",
-                "Temperature": "°F",
-                "Oxygen Saturation": "%",
-            }
-            unit = unit_mapping.get(metric_type, "unit")
+            unit = METRIC_UNITS.get(metric_type, "unit")
             st.text_input("Unit", value=unit, disabled=True)
 
         value = st.number_input("Value", min_value=0.0, step=0.1)
@@ -380,78 +498,35 @@ def health_analytics_page():
         st.subheader("Your Health Trends")
 
         # Metric selector for visualization
-        available_metrics = [
-            "Heart Rate",
-            "Blood Pressure (Systolic)",
-            "Blood Pressure (Diastolic)",
-            "Blood Glucose",
-            "Weight",
-            "Temperature",
-            "Oxygen Saturation",
-        ]
-
-        selected_metric = st.selectbox("Select Metric to Visualize", available_metrics)
+        selected_metric = st.selectbox("Select Metric to Visualize", METRIC_TYPES)
 
-        metrics = db.get_health_metrics(st.session_state.user["id"], metric_type=selected_metric)
+        user_id = st.session_state.user["id"]
+        version = db.get_health_metric_version(user_id, selected_metric)
+        chart = build_metric_chart(user_id, selected_metric, version)
 
-        if not metrics:
+        if chart is None:
             st.info(
                 f"No data recorded for {selected_metric} yet. Start tracking by adding metrics above!"
             )
         else:
-            # Prepare data for visualization
-            df = pd.DataFrame(
-                [
-                    {
-                        "Date": m.recorded_at,
-                        "Value": m.value,
-                        "Notes": str(m.notes) if m.notes else "",
-                    }
-                    for m in reversed(metrics)
-                ]
-            )
-
-            # Create interactive plot
-            fig = go.Figure()
-
-            fig.add_trace(
-                go.Scatter(
-                    x=df["Date"],
-                    y=df["Value"],
-                    mode="lines+markers",
-                    name=selected_metric,
-                    line=dict(color="#1f77b4", width=2),
-                    marker=dict(size=8),
-                    hovertemplate="<b>%{x}</b><br>Value: %{y}<extra></extra>",
-                )
-            )
-
-            fig.update_layout(
-                title=f"{selected_metric} Trend",
-                xaxis_title="Date",
-                yaxis_title=f"{selected_metric} ({metrics[0].unit})",
-                hovermode="x unified",
-                height=400,
-            )
-
+            fig, stats, display_df = chart
             st.plotly_chart(fig, use_container_width=True)
 
             # Show statistics
+            unit = stats["unit"]
             col1, col2, col3, col4 = st.columns(4)
 
             with col1:
-                st.metric("Latest", f"{df['Value'].iloc[-1]:.1f} {metrics[0].unit}")
+                st.metric("Latest", f"{stats['latest']:.1f} {unit}")
             with col2:
-                st.metric("Average", f"{df['Value'].mean():.1f} {metrics[0].unit}")
+                st.metric("Average", f"{stats['average']:.1f} {unit}")
             with col3:
-                st.metric("Minimum", f"{df['Value'].min():.1f} {metrics[0].unit}")
+                st.metric("Minimum", f"{stats['minimum']:.1f} {unit}")
             with col4:
-                st.metric("Maximum", f"{df['Value'].max():.1f} {metrics[0].unit}")
+                st.metric("Maximum", f"{stats['maximum']:.1f} {unit}")
 
             # Show data table
             st.markdown("### Recent Measurements")
-            display_df = df.copy()
-            display_df["Date"] = display_df["Date"].dt.strftime("%Y-%m-%d %H:%M")
             st.dataframe(display_df, use_container_width=True)
 
 
@@ -469,22 +544,28 @@ def main():
         # Navigation menu
         page = st.sidebar.radio(
             "Navigation",
-            ["💬 Patient Chat", "🔍 Symptom Checker", "📋 Treatment Plans", "📊 Health Analytics"],
+            NAV_PAGES,
             key="navigation",
         )
 
         # Logout button
         st.sidebar.markdown("---")
         if st.sidebar.button("Logout", type="secondary"):
+            flush_chat_buffer()
             st.session_state.logged_in = False
             st.session_state.user = None
             st.session_state.chat_messages = []
+            st.session_state.chat_history_cursor = "start"
+            st.session_state.treatment_plans = None
             st.rerun()
 
         # Show medical disclaimer
         show_medical_disclaimer()
 
         # Route to selected page
+        if page != "💬 Patient Chat":
+            flush_chat_buffer()
+
         if page == "💬 Patient Chat":
             patient_chat_page()
         elif page == "🔍 Symptom Checker":
@@ -2,7 +2,83 @@
 Prompt Builder - Constructs context-aware prompts for medical AI
 """
 
-from backend.ai.prompt_templates import MedicalPromptTemplates, PromptFormatter
+import re
+from typing import Optional, Tuple
+
+from backend.ai.prompt_templates import (
+    FIRST_CONVERSATION,
+    MedicalPromptTemplates,
+    PromptFormatter,
+)
+from backend.ai.types import PatientContext
+
+# PatientContext list field -> formatter for that list
+_LIST_FIELDS = {
+    "medical_history": PromptFormatter.format_medical_history,
+    "current_medications": PromptFormatter.format_medications,
+    "allergies": PromptFormatter.format_allergies,
+    "recent_symptoms": PromptFormatter.format_recent_symptoms,
+    "conversation_context": PromptFormatter.format_conversation_context,
+}
+
+# Immediate actions for every emergency, already formatted as bullet lines
+_BASE_ACTIONS = (
+    "- Stay calm and call emergency services immediately",
+    "- Do not drive yourself - call ambulance or have someone drive you",
+    "- If alone, unlock door for emergency responders",
+    "- Have list of current medications ready",
+    "- Note time symptoms started",
+)
+_BASE_ACTIONS_TEXT = "\n".join(_BASE_ACTIONS)
+
+# Emergency symptom keyword -> extra immediate action bullet
+_SYMPTOM_ACTIONS = {
+    "chest pain": "- Sit down and rest, chew aspirin if not allergic",
+    "difficulty breathing": "- Sit upright, loosen tight clothing",
+    "bleeding": "- Apply direct pressure to wound",
+}
+
+# Token budgets for each side of a summarized conversation turn. No tokenizer
+# is shared by every OpenRouter model, so ~4 characters per token is assumed.
+_CHARS_PER_TOKEN = 4
+_SUMMARY_MESSAGE_TOKENS = 25
+_SUMMARY_RESPONSE_TOKENS = 40
+
+# One case-insensitive pass over the symptoms finds every keyword at once,
+# instead of lowercasing the text and scanning it again per keyword
+_SYMPTOM_PATTERN = re.compile("|".join(map(re.escape, _SYMPTOM_ACTIONS)), re.IGNORECASE)
+
+
+def _clip(text: str, max_tokens: int) -> str:
+    """Clip text to about max_tokens at a word boundary, marking only a real cut"""
+    limit = max_tokens * _CHARS_PER_TOKEN
+    if len(text) <= limit:
+        return text
+    cut = text.rfind(" ", 0, limit)
+    return text[: cut if cut > 0 else limit].rstrip() + "..."
+
+
+class _PatientFields(dict):
+    """
+    Template fields for _CompiledTemplate.render, filled from a patient context on first use
+
+    Only placeholders a template actually contains are formatted, and any the
+    patient context has no data for render as "Unknown" instead of raising.
+    """
+
+    def __init__(self, patient_context: PatientContext, **fields):
+        super().__init__(fields)
+        self.patient_context = patient_context
+
+    def __missing__(self, key: str) -> str:
+        value = getattr(self.patient_context, key, None)
+        format_items = _LIST_FIELDS.get(key)
+        if format_items is not None:
+            value = format_items(value)
+        elif value is None:
+            value = "Unknown"
+        self[key] = value
+        return value
 
 
 class MedicalPromptBuilder:
@@ -14,32 +90,34 @@ class MedicalPromptBuilder:
         self.templates = MedicalPromptTemplates()
         self.formatter = PromptFormatter()
 
-    def build_system_prompt(self, patient_context: dict) -> str:
+    def build_system_prompt(
+        self, patient_context: PatientContext, task_instructions: Optional[str] = None
+    ) -> Tuple[str, ...]:
         """
-        Build system prompt with complete patient context
+        Build system prompt blocks with complete patient context
+
+        Static blocks come first and the patient context last, so the client
+        can mark each as a prompt-cache breakpoint and every patient shares
+        the cached static prefix.
 
         Args:
             patient_context: Dict with age, gender, medical_history, medications, allergies, etc.
+            task_instructions: Optional static instructions for the task, from
+                the first element of a build_*_prompt result
 
         Returns:
-            Formatted system prompt with patient context
+            System blocks: base prompt, task instructions if any, patient context
         """
-        return self.templates.SYSTEM_PROMPT.format(
-            age=patient_context.get("age", "Unknown"),
-            gender=patient_context.get("gender", "Unknown"),
-            medical_history=self.formatter.format_medical_history(
-                patient_context.get("medical_history", [])
-            ),
-            current_medications=self.formatter.format_medications(
-                patient_context.get("current_medications", [])
-            ),
-            allergies=self.formatter.format_allergies(patient_context.get("allergies", [])),
-            recent_symptoms=self.formatter.format_recent_symptoms(
-                patient_context.get("recent_symptoms", [])
-            ),
+        patient_block = self.templates.SYSTEM_PATIENT_CONTEXT.render(
+            _PatientFields(patient_context)
         )
+        if task_instructions is None:
+            return (self.templates.SYSTEM_PROMPT, patient_block)
+        return (self.templates.SYSTEM_PROMPT, task_instructions, patient_block)
 
-    def build_symptom_analysis_prompt(self, symptoms: str, patient_context: dict) -> str:
+    def build_symptom_analysis_prompt(
+        self, symptoms: str, patient_context: PatientContext
+    ) -> Tuple[str, str]:
         """
         Build comprehensive symptom analysis prompt
 
@@ -48,21 +126,14 @@ class MedicalPromptBuilder:
             patient_context: Patient medical context
 
         Returns:
-            Formatted symptom analysis prompt
+            (static task instructions, formatted request with symptoms and context)
         """
-        return self.templates.SYMPTOM_ANALYSIS_PROMPT.format(
-            symptoms=symptoms,
-            age=patient_context.get("age", "Unknown"),
-            gender=patient_context.get("gender", "Unknown"),
-            medical_history=self.formatter.format_medical_history(
-                patient_context.get("medical_history", [])
-            ),
-            current_medications=self.formatter.format_medications(
-                patient_context.get("current_medications", [])
-            ),
-        )
+        instructions, request = self.templates.SYMPTOM_ANALYSIS_PROMPT
+        return instructions, request.render(_PatientFields(patient_context, symptoms=symptoms))
 
-    def build_treatment_plan_prompt(self, condition: str, patient_context: dict) -> str:
+    def build_treatment_plan_prompt(
+        self, condition: str, patient_context: PatientContext
+    ) -> Tuple[str, str]:
         """
         Build personalized treatment plan prompt
 
@@ -71,37 +142,38 @@ class MedicalPromptBuilder:
             patient_context: Patient medical context
 
         Returns:
-            Formatted treatment plan prompt
+            (static task instructions, formatted request with condition and profile)
         """
-        return self.templates.TREATMENT_PLAN_PROMPT.format(
-            condition=condition,
-            age=patient_context.get("age", "Unknown"),
-            gender=patient_context.get("gender", "Unknown"),
-            medical_history=self.formatter.format_medical_history(
-                patient_context.get("medical_history", [])
-            ),
-            current_medications=self.formatter.format_medications(
-                patient_context.get("current_medications", [])
-            ),
-            allergies=self.formatter.format_allergies(patient_context.get("allergies", [])),
-        )
-
-    def build_follow_up_prompt(self, current_message: str, conversation_history: list) -> str:
+        instructions, request = self.templates.TREATMENT_PLAN_PROMPT
+        return instructions, request.render(_PatientFields(patient_context, condition=condition))
+
+    def build_follow_up_prompt(
+        self,
+        current_message: str,
+        conversation_history: list,
+        patient_context: Optional[PatientContext] = None,
+    ) -> Tuple[str, str]:
         """
         Build follow-up conversation prompt with history
 
         Args:
             current_message: Patient's current message
             conversation_history: List of previous conversations
+            patient_context: Optional patient medical context
 
         Returns:
-            Formatted follow-up prompt
+            (static task instructions, formatted request with summary and update)
         """
         # Summarize previous conversations
         summary = self._summarize_conversations(conversation_history)
 
-        return self.templates.FOLLOW_UP_PROMPT.format(
-            previous_conversation_summary=summary, current_message=current_message
+        instructions, request = self.templates.FOLLOW_UP_PROMPT
+        return instructions, request.render(
+            _PatientFields(
+                patient_context or PatientContext(),
+                previous_conversation_summary=summary,
+                current_message=current_message,
+            )
         )
 
     def build_emergency_response(self, emergency_symptoms: str, urgency_explanation: str) -> str:
@@ -117,42 +189,36 @@ class MedicalPromptBuilder:
         """
         immediate_actions = self._get_immediate_actions(emergency_symptoms)
 
-        return self.templates.EMERGENCY_RESPONSE.format(
-            emergency_symptoms=emergency_symptoms,
-            urgency_explanation=urgency_explanation,
-            immediate_actions=immediate_actions,
+        return self.templates.EMERGENCY_RESPONSE_PROMPT.render(
+            {
+                "emergency_symptoms": emergency_symptoms,
+                "urgency_explanation": urgency_explanation,
+                "immediate_actions": immediate_actions,
+            }
         )
 
     def _summarize_conversations(self, conversations: list) -> str:
         """Summarize recent conversations for context"""
         if not conversations:
-            return "First conversation with patient"
+            return FIRST_CONVERSATION
 
-        summaries = []
-        for conv in conversations[-3:]:  # Last 3 conversations
-            msg = conv.get("message", "")[:100]
-            resp = conv.get("response", "")[:150]
-            summaries.append(f"Patient: {msg}...\nDr. HealthAI: {resp}...")
-
-        return "\n\n".join(summaries)
+        return "\n\n".join(
+            f"Patient: {_clip(conv.get('message') or '', _SUMMARY_MESSAGE_TOKENS)}\n"
+            f"Dr. HealthAI: {_clip(conv.get('response') or '', _SUMMARY_RESPONSE_TOKENS)}"
+            for conv in conversations[-3:]  # Last 3 conversations
+        )
 
     def _get_immediate_actions(self, symptoms: str) -> str:
         """Get immediate actions for emergency symptoms"""
-        # Basic emergency actions
-        actions = [
-            "Stay calm and call emergency services immediately",
-            "Do not drive yourself - call ambulance or have someone drive you",
-            "If alone, unlock door for emergency responders",
-            "Have list of current medications ready",
-            "Note time symptoms started",
-        ]
-
-        # Add symptom-specific actions
-        if "chest pain" in symptoms.lower():
-            actions.append("Sit down and rest, chew aspirin if not allergic")
-        elif "difficulty breathing" in symptoms.lower():
-            actions.append("Sit upright, loosen tight clothing")
-        elif "bleeding" in symptoms.lower():
-            actions.append("Apply direct pressure to wound")
-
-        return "\n".join([f"- {action}" for action in actions])
+        extras = self._extra_actions(symptoms)
+        if not extras:
+            return _BASE_ACTIONS_TEXT
+        return "\n".join(_BASE_ACTIONS + extras)
+
+    @staticmethod
+    def _extra_actions(symptoms: str) -> tuple:
+        """Symptom-specific action bullets, one per distinct keyword mentioned, in table order"""
+        matched = {match.group(0).lower() for match in _SYMPTOM_PATTERN.finditer(symptoms)}
+        if not matched:
+            return ()
+        return tuple(action for keyword, action in _SYMPTOM_ACTIONS.items() if keyword in matched)
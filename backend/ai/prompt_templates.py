@@ -4,6 +4,52 @@ Advanced Medical Prompt Templates
 Sophisticated prompt engineering for intelligent medical AI responses.
 """
 
+import re
+from functools import lru_cache
+from typing import List, Mapping, Tuple
+
+_FIELD_PATTERN = re.compile(r"\{(\w+)\}")
+
+
+class _CompiledTemplate:
+    """
+    Prompt template split once into literal chunks and field names
+
+    Rendering joins the precomputed chunks with one lookup per field, instead
+    of str.format re-parsing the whole template on every call. Templates use
+    plain {name} fields only, without format specs or escaped braces.
+    """
+
+    def __init__(self, template: str):
+        self.template = template
+        self.segments: List[str] = []
+        self.keys: List[str] = []
+        start = 0
+        for match in _FIELD_PATTERN.finditer(template):
+            self.segments.append(template[start : match.start()])
+            self.keys.append(match.group(1))
+            start = match.end()
+        self.tail = template[start:]
+
+    def render(self, fields: Mapping) -> str:
+        """
+        Fill the template's fields
+
+        Args:
+            fields: Field values by name; a dict subclass with __missing__
+                is only asked for the fields this template contains
+
+        Returns:
+            Rendered prompt
+        """
+        parts = []
+        append = parts.append
+        for segment, key in zip(self.segments, self.keys):
+            append(segment)
+            append(str(fields[key]))
+        append(self.tail)
+        return "".join(parts)
+
 
 class MedicalPromptTemplates:
     """
@@ -44,15 +90,6 @@ CRITICAL SAFETY RULES:
 - Consider drug interactions with current medications
 - Account for patient's age, gender, and medical history in all recommendations
 
-PATIENT CONTEXT AVAILABLE:
-- Age: {age}
-- Gender: {gender}
-- Medical History: {medical_history}
-- Current Medications: {current_medications}
-- Known Allergies: {allergies}
-- Recent Symptoms: {recent_symptoms}
-- Previous Conversations: {conversation_context}
-
 COMMUNICATION STYLE:
 - Professional yet warm and approachable
 - Use medical terminology but always explain it
@@ -62,16 +99,25 @@ COMMUNICATION STYLE:
 
 Remember: You are a trusted medical advisor providing education and guidance, always keeping patient safety as the top priority."""
 
-    SYMPTOM_ANALYSIS_PROMPT = """The patient presents with the following symptoms:
-{symptoms}
-
-PATIENT CONTEXT:
-- Age: {age}, Gender: {gender}
+    # Sent as the last system block, after every static one, so the static
+    # instructions stay a cacheable prefix shared by all patients
+    SYSTEM_PATIENT_CONTEXT = _CompiledTemplate(
+        """PATIENT CONTEXT AVAILABLE:
+- Age: {age}
+- Gender: {gender}
 - Medical History: {medical_history}
 - Current Medications: {current_medications}
 - Known Allergies: {allergies}
+- Recent Symptoms: {recent_symptoms}
+- Previous Conversations: {conversation_context}"""
+    )
 
-YOUR TASK: Conduct a comprehensive symptom analysis following this structure:
+    # Templates below are (static instructions, dynamic suffix template) pairs:
+    # the static half never changes and is sent as a cacheable system block,
+    # only the suffix is rendered with patient data
+
+    SYMPTOM_ANALYSIS_PROMPT = (
+        """YOUR TASK: Conduct a comprehensive symptom analysis of the symptoms the patient presents with, following this structure:
 
 1. **INITIAL ASSESSMENT** (100-150 words)
    - Acknowledge the patient's concerns with empathy
@@ -127,17 +173,21 @@ SAFETY CHECKS:
 - Check for allergy concerns
 - Note any contraindications
 
-Remember: Be thorough, empathetic, and safety-focused. If symptoms suggest anything serious, strongly recommend immediate medical evaluation."""
-
-    TREATMENT_PLAN_PROMPT = """Generate a comprehensive, personalized treatment and wellness plan for: {condition}
+Remember: Be thorough, empathetic, and safety-focused. If symptoms suggest anything serious, strongly recommend immediate medical evaluation.""",
+        _CompiledTemplate(
+            """The patient presents with the following symptoms:
+{symptoms}
 
-PATIENT PROFILE:
-- Age: {age}
-- Gender: {gender}
+PATIENT CONTEXT:
+- Age: {age}, Gender: {gender}
 - Medical History: {medical_history}
 - Current Medications: {current_medications}
-- Known Allergies: {allergies}
-- Lifestyle Factors: {lifestyle_factors}
+- Known Allergies: {allergies}"""
+        ),
+    )
+
+    TREATMENT_PLAN_PROMPT = (
+        """Generate a comprehensive, personalized treatment and wellness plan for the condition and patient profile given in the request.
 
 COMPREHENSIVE TREATMENT PLAN STRUCTURE:
 
@@ -188,8 +238,8 @@ COMPREHENSIVE TREATMENT PLAN STRUCTURE:
    - Important questions to ask your doctor about medications
    
    **Potential Interactions:**
-   - Considerations with current medications: {current_medications}
-   - Allergy considerations: {allergies}
+   - Considerations with the patient's current medications
+   - Allergy considerations for the patient's known allergies
    - Important drug-food interactions
    
    **What to Discuss with Your Healthcare Provider:**
@@ -246,20 +296,22 @@ CRITICAL SAFETY REMINDERS:
 - This is educational guidance, not a prescription
 - Regular medical supervision is essential
 
-Remember: Create a comprehensive, actionable plan that empowers the patient while emphasizing the importance of professional medical supervision."""
-
-    FOLLOW_UP_PROMPT = """This is a follow-up conversation with a patient you've been helping.
-
-PREVIOUS CONVERSATION SUMMARY:
-{previous_conversation_summary}
-
-PATIENT'S CURRENT UPDATE:
-{current_message}
+Remember: Create a comprehensive, actionable plan that empowers the patient while emphasizing the importance of professional medical supervision.""",
+        _CompiledTemplate(
+            """CONDITION: {condition}
 
-PATIENT CONTEXT:
-- Age: {age}, Gender: {gender}
+PATIENT PROFILE:
+- Age: {age}
+- Gender: {gender}
 - Medical History: {medical_history}
 - Current Medications: {current_medications}
+- Known Allergies: {allergies}
+- Lifestyle Factors: {lifestyle_factors}"""
+        ),
+    )
+
+    FOLLOW_UP_PROMPT = (
+        """This is a follow-up conversation with a patient you've been helping. The request gives a summary of the previous conversation, the patient's current update and their context.
 
 YOUR TASK:
 
@@ -296,9 +348,23 @@ YOUR TASK:
    - Re-evaluate urgency level
    - Update recommendations for seeking care if needed
 
-Remember: Maintain continuity, show you're tracking their progress, and provide thoughtful, evolving guidance based on their journey."""
+Remember: Maintain continuity, show you're tracking their progress, and provide thoughtful, evolving guidance based on their journey.""",
+        _CompiledTemplate(
+            """PREVIOUS CONVERSATION SUMMARY:
+{previous_conversation_summary}
 
-    EMERGENCY_RESPONSE_PROMPT = """⚠️ EMERGENCY PROTOCOL ACTIVATED ⚠️
+PATIENT'S CURRENT UPDATE:
+{current_message}
+
+PATIENT CONTEXT:
+- Age: {age}, Gender: {gender}
+- Medical History: {medical_history}
+- Current Medications: {current_medications}"""
+        ),
+    )
+
+    EMERGENCY_RESPONSE_PROMPT = _CompiledTemplate(
+        """⚠️ EMERGENCY PROTOCOL ACTIVATED ⚠️
 
 The patient has mentioned symptoms that may indicate a medical emergency:
 {emergency_symptoms}
@@ -329,8 +395,10 @@ YOUR IMMEDIATE RESPONSE:
    - Allergies
 
 DO NOT provide routine medical advice. DO NOT suggest waiting or monitoring. EMPHASIZE URGENCY."""
+    )
 
-    MEDICATION_SAFETY_PROMPT = """The patient is asking about medications or treatments.
+    MEDICATION_SAFETY_PROMPT = _CompiledTemplate(
+        """The patient is asking about medications or treatments.
 
 PATIENT CONTEXT:
 - Current Medications: {current_medications}
@@ -365,6 +433,55 @@ CRITICAL SAFETY PROTOCOL:
 
 Always end with: "Please discuss any medication changes with your healthcare provider or pharmacist who can review your complete medical history and current medications."
 """
+    )
+
+
+def _snapshot(items: list, *fields: Tuple[str, str]) -> Tuple[Tuple, ...]:
+    """Hashable copy of the (field, default) values a formatter reads from each item"""
+    return tuple(tuple(item.get(name, default) for name, default in fields) for item in items)
+
+
+# No-data text for each section. An empty list returns one of these before any
+# snapshot is taken or cache consulted, which is the common case for new patients.
+NO_MEDICAL_HISTORY = "No significant medical history reported"
+NO_MEDICATIONS = "No current medications reported"
+NO_ALLERGIES = "No known allergies"
+NO_RECENT_SYMPTOMS = "No recent symptoms logged"
+FIRST_CONVERSATION = "First conversation with patient"
+
+# Formatting is cached on the field snapshot, so the several prompts built
+# from one patient context (and repeat turns) reuse the same fragments. The
+# snapshot doubles as the record version: an edit changes it, so stale text is
+# never served and nothing needs invalidating. Sized for one entry per section
+# for each of a few thousand active patients.
+_FRAGMENT_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=_FRAGMENT_CACHE_SIZE)
+def _format_medical_history(conditions: Tuple[Tuple, ...]) -> str:
+    return "\n".join(f"- {name} ({status})" for name, status in conditions)
+
+
+@lru_cache(maxsize=_FRAGMENT_CACHE_SIZE)
+def _format_medications(medications: Tuple[Tuple, ...]) -> str:
+    # Empty fields are omitted rather than stripped off afterwards
+    return "\n".join(
+        f"- {name}{f' {dosage}' if dosage else ''}{f' {frequency}' if frequency else ''}"
+        for name, dosage, frequency in medications
+    )
+
+
+@lru_cache(maxsize=_FRAGMENT_CACHE_SIZE)
+def _format_allergies(allergies: Tuple[Tuple, ...]) -> str:
+    return "\n".join(
+        f"- {allergen} ({severity}):{f' {reaction}' if reaction else ''}"
+        for allergen, severity, reaction in allergies
+    )
+
+
+@lru_cache(maxsize=_FRAGMENT_CACHE_SIZE)
+def _format_recent_symptoms(symptoms: Tuple[Tuple, ...]) -> str:
+    return "\n".join(f"- {date}: {desc}" for desc, date in symptoms)
 
 
 class PromptFormatter:
@@ -376,70 +493,54 @@ class PromptFormatter:
     def format_medical_history(conditions: list) -> str:
         """Format medical history for prompt"""
         if not conditions:
-            return "No significant medical history reported"
-
-        formatted = []
-        for condition in conditions:
-            status = condition.get("status", "unknown")
-            name = condition.get("condition_name", "Unknown condition")
-            formatted.append(f"- {name} ({status})")
-
-        return "\n".join(formatted)
+            return NO_MEDICAL_HISTORY
+        return _format_medical_history(
+            _snapshot(conditions, ("condition_name", "Unknown condition"), ("status", "unknown"))
+        )
 
     @staticmethod
     def format_medications(medications: list) -> str:
         """Format current medications for prompt"""
         if not medications:
-            return "No current medications reported"
-
-        formatted = []
-        for med in medications:
-            name = med.get("medication_name", "Unknown")
-            dosage = med.get("dosage", "")
-            frequency = med.get("frequency", "")
-            formatted.append(f"- {name} {dosage} {frequency}".strip())
-
-        return "\n".join(formatted)
+            return NO_MEDICATIONS
+        return _format_medications(
+            _snapshot(
+                medications, ("medication_name", "Unknown"), ("dosage", ""), ("frequency", "")
+            )
+        )
 
     @staticmethod
     def format_allergies(allergies: list) -> str:
         """Format allergies for prompt"""
         if not allergies:
-            return "No known allergies"
-
-        formatted = []
-        for allergy in allergies:
-            allergen = allergy.get("allergen", "Unknown")
-            severity = allergy.get("severity", "unknown severity")
-            reaction = allergy.get("reaction", "")
-            formatted.append(f"- {allergen} ({severity}): {reaction}".strip())
-
-        return "\n".join(formatted)
+            return NO_ALLERGIES
+        return _format_allergies(
+            _snapshot(
+                allergies,
+                ("allergen", "Unknown"),
+                ("severity", "unknown severity"),
+                ("reaction", ""),
+            )
+        )
 
     @staticmethod
     def format_recent_symptoms(symptoms: list) -> str:
         """Format recent symptom history"""
         if not symptoms:
-            return "No recent symptoms logged"
-
-        formatted = []
-        for symptom in symptoms[:5]:  # Last 5 symptoms
-            desc = symptom.get("symptom_description", "")
-            date = symptom.get("logged_at", "")
-            formatted.append(f"- {date}: {desc}")
-
-        return "\n".join(formatted)
+            return NO_RECENT_SYMPTOMS
+        # Last 5 symptoms
+        return _format_recent_symptoms(
+            _snapshot(symptoms[:5], ("symptom_description", ""), ("logged_at", ""))
+        )
 
     @staticmethod
     def format_conversation_context(conversations: list) -> str:
         """Format recent conversation history"""
         if not conversations:
-            return "First conversation with patient"
-
-        formatted = []
-        for conv in conversations[-3:]:  # Last 3 conversations
-            message = conv.get("message", "")
-            response_summary = conv.get("response", "")[:150] + "..."
-            formatted.append(f"Patient: {message}\nDr. HealthAI: {response_summary}\n")
+            return FIRST_CONVERSATION
 
-        return "\n".join(formatted)
+        return "\n".join(
+            f"Patient: {conv.get('message', '')}\n"
+            f"Dr. HealthAI: {(conv.get('response') or '')[:150]}...\n"
+            for conv in conversations[-3:]  # Last 3 conversations
+        )
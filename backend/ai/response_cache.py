@@ -0,0 +1,90 @@
+"""
+Response Cache - In-process exact-match cache for AI completions
+Avoids repeat OpenRouter calls for identical prompts within a TTL window
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU cache with per-entry TTL for AI responses
+    """
+
+    def __init__(self, max_size: int = 4096, ttl_seconds: int = 1800):
+        """
+        Initialize response cache
+
+        Args:
+            max_size: Maximum number of cached responses before LRU eviction
+            ttl_seconds: Seconds a cached response stays valid
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(*parts) -> str:
+        """
+        Build a cache key from the request fields
+
+        Args:
+            *parts: Values that uniquely identify a completion request
+                    (model, temperature, max tokens, system instruction, prompt)
+
+        Returns:
+            SHA-256 hex digest of the serialized fields
+        """
+        serialized = json.dumps([str(part) if part is not None else None for part in parts])
+        return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Get a cached response if present and not expired
+
+        Args:
+            key: Cache key from make_key()
+
+        Returns:
+            Cached response text or None
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            response, created_at = entry
+            if time.monotonic() - created_at > self.ttl_seconds:
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return response
+
+    def set(self, key: str, response: str) -> None:
+        """
+        Store a response, evicting the least recently used entries if full
+
+        Args:
+            key: Cache key from make_key()
+            response: Response text to cache
+        """
+        with self._lock:
+            self._entries[key] = (response, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all cached responses"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -3,12 +3,50 @@ Safety Checker - Validates AI responses for medical safety
 """
 
 import re
-from typing import Dict, List
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 
+from backend.ai.types import PatientContext
 from backend.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Canned reply for emergency symptoms; returned without calling the AI model
+EMERGENCY_RESPONSE = """
+🚨 **EMERGENCY - SEEK IMMEDIATE MEDICAL ATTENTION** 🚨
+
+Your symptoms may indicate a medical emergency. Please:
+
+1. **Call emergency services (911) immediately** or go to the nearest emergency room
+2. Do NOT wait or try to treat this at home
+3. If alone, call someone to be with you or unlock your door for emergency responders
+
+**While waiting for help:**
+- Stay calm
+- Sit or lie down in a comfortable position
+- Do not eat or drink anything
+- Have your medication list ready if possible
+
+**This is NOT the time for online medical advice. Get professional help NOW.**
+
+---
+*If this is not an emergency, please rephrase your question and I'll be happy to help.*
+        """
+
+
+@lru_cache(maxsize=1024)
+def _allergen_pattern(allergens: Tuple[str, ...]) -> re.Pattern:
+    """
+    Scan of lowercased text reporting, at every position, the longest allergen starting there.
+
+    An allergen occurs in the text exactly when it is a substring of one of the
+    reported matches, so a single pass finds every allergen, overlapping ones
+    included. Cached on the allergen tuple, so a patient's pattern is compiled
+    once across their responses.
+    """
+    alternation = "|".join(map(re.escape, sorted(set(allergens), key=len, reverse=True)))
+    return re.compile(f"(?=({alternation}))")
+
 
 class MedicalSafetyChecker:
     """
@@ -34,8 +72,24 @@ class MedicalSafetyChecker:
         "severe burns",
         "poisoning",
         "overdose",
+        "can't breathe",
+        "can’t breathe",
+        "cannot breathe",
+        "not breathing",
+        "suicide",
+        "kill myself",
     ]
 
+    # Single pass over the text instead of one substring scan per keyword.
+    # Longest keywords first so the most specific one is reported; only a leading
+    # word boundary so plurals ("seizures") still match.
+    _EMERGENCY_PATTERN = re.compile(
+        r"\b(?:"
+        + "|".join(re.escape(k) for k in sorted(EMERGENCY_KEYWORDS, key=len, reverse=True))
+        + ")",
+        re.IGNORECASE,
+    )
+
     # Patterns that suggest medication prescriptions (should be avoided)
     MEDICATION_PRESCRIPTION_PATTERNS = [
         r"take \d+\s*mg",
@@ -46,16 +100,32 @@ class MedicalSafetyChecker:
         r"you should take \w+",
     ]
 
-    def __init__(self):
-        self.logger = get_logger(__name__)
+    # All prescription patterns in one scan; group p<i> names the pattern that matched.
+    # The patterns are lowercase and run on the lowercased response, so no IGNORECASE.
+    _PRESCRIPTION_PATTERN = re.compile(
+        "|".join(f"(?P<p{i}>{p})" for i, p in enumerate(MEDICATION_PRESCRIPTION_PATTERNS))
+    )
+
+    # Words suggesting a response discusses treatment, for medication interaction reminders
+    TREATMENT_WORDS = ("treatment", "medication", "drug", "medicine")
+
+    # Words suggesting a response needs an emergency care disclaimer
+    SERIOUS_KEYWORDS = ("severe", "serious", "emergency", "urgent", "immediate", "critical")
 
-    def check_response(self, response: str, patient_context: Dict) -> Dict:
+    # Whole words only, so "severely" or "critically" alone don't demand the disclaimer
+    _SERIOUS_PATTERN = re.compile(r"\b(?:" + "|".join(SERIOUS_KEYWORDS) + r")\b")
+
+    def check_response(
+        self, response: str, patient_context: PatientContext, fast_fail: bool = False
+    ) -> Dict:
         """
         Comprehensive safety check of AI response
 
         Args:
             response: AI generated response
             patient_context: Patient medical context
+            fast_fail: Stop at the first high-severity finding, skipping the
+                remaining checks; for callers that only gate on severity
 
         Returns:
             {
@@ -68,36 +138,36 @@ class MedicalSafetyChecker:
         flags = []
         severity = "low"
 
+        # Lowercased once; every check below matches against this copy
+        response_lower = response.lower()
+
         # Check for medication prescription attempts
-        if self._check_medication_prescription(response):
+        if self._check_medication_prescription(response_lower):
             flags.append("Response contains medication prescription language")
             severity = "high"
+            if fast_fail:
+                return self._build_result(flags, severity)
 
         # Check for allergy conflicts
-        allergy_conflicts = self._check_allergy_conflicts(response, patient_context)
+        allergy_conflicts = self._check_allergy_conflicts(response_lower, patient_context)
         if allergy_conflicts:
             flags.extend(allergy_conflicts)
             severity = "high"
+            if fast_fail:
+                return self._build_result(flags, severity)
 
         # Check for medication interaction warnings needed
-        interaction_warnings = self._check_medication_interactions(response, patient_context)
+        interaction_warnings = self._check_medication_interactions(response_lower, patient_context)
         if interaction_warnings:
             flags.extend(interaction_warnings)
             severity = "medium" if severity == "low" else severity
 
         # Check if emergency disclaimer is needed
-        if self._needs_emergency_disclaimer(response):
+        if self._needs_emergency_disclaimer(response_lower):
             flags.append("Response should include emergency care disclaimer")
             severity = "medium" if severity == "low" else severity
 
-        has_concerns = len(flags) > 0
-
-        return {
-            "has_concerns": has_concerns,
-            "flags": flags,
-            "severity": severity,
-            "recommendations": self._generate_recommendations(flags),
-        }
+        return self._build_result(flags, severity)
 
     def detect_emergency_symptoms(self, text: str) -> bool:
         """
@@ -109,80 +179,105 @@ class MedicalSafetyChecker:
         Returns:
             True if emergency symptoms detected
         """
-        text_lower = text.lower()
-        for keyword in self.EMERGENCY_KEYWORDS:
-            if keyword in text_lower:
-                logger.warning(f"Emergency keyword detected: {keyword}")
-                return True
-        return False
-
-    def _check_medication_prescription(self, response: str) -> bool:
-        """Check if response contains medication prescription language"""
-        for pattern in self.MEDICATION_PRESCRIPTION_PATTERNS:
-            if re.search(pattern, response, re.IGNORECASE):
-                logger.warning(f"Medication prescription pattern detected: {pattern}")
-                return True
-        return False
-
-    def _check_allergy_conflicts(self, response: str, patient_context: Dict) -> List[str]:
-        """Check for potential allergy conflicts"""
+        return self.find_emergency_keyword(text) is not None
+
+    def find_emergency_keyword(self, text: str) -> Optional[str]:
+        """
+        Find the first emergency keyword mentioned in text
+
+        Args:
+            text: Text to check
+
+        Returns:
+            Matched keyword (lowercased) or None
+        """
+        match = self._EMERGENCY_PATTERN.search(text)
+        if match is None:
+            return None
+
+        keyword = match.group(0).lower()
+        logger.warning(f"Emergency keyword detected: {keyword}")
+        return keyword
+
+    def _check_medication_prescription(self, response_lower: str) -> bool:
+        """Check if the lowercased response contains medication prescription language"""
+        match = self._PRESCRIPTION_PATTERN.search(response_lower)
+        if match is None:
+            return False
+
+        pattern = self.MEDICATION_PRESCRIPTION_PATTERNS[int(match.lastgroup[1:])]
+        logger.warning(f"Medication prescription pattern detected: {pattern}")
+        return True
+
+    def _check_allergy_conflicts(
+        self, response_lower: str, patient_context: PatientContext
+    ) -> List[str]:
+        """Check the lowercased response for potential allergy conflicts"""
         conflicts = []
-        allergies = patient_context.get("allergies", [])
+        allergies = [
+            (allergy, allergy.get("allergen", "").lower()) for allergy in patient_context.allergies
+        ]
+        allergens = tuple(allergen for _, allergen in allergies if allergen)
+        if not allergens:
+            return conflicts
 
-        for allergy in allergies:
-            allergen = allergy.get("allergen", "").lower()
-            if allergen and allergen in response.lower():
+        found = {match.group(1) for match in _allergen_pattern(allergens).finditer(response_lower)}
+        for allergy, allergen in allergies:
+            if allergen and any(allergen in text for text in found):
                 severity = allergy.get("severity", "unknown")
                 conflicts.append(f"⚠️ ALLERGY ALERT: Patient allergic to {allergen} ({severity})")
                 logger.warning(f"Allergy conflict detected: {allergen}")
 
         return conflicts
 
-    def _check_medication_interactions(self, response: str, patient_context: Dict) -> List[str]:
-        """Check if response should mention medication interactions"""
+    def _check_medication_interactions(
+        self, response_lower: str, patient_context: PatientContext
+    ) -> List[str]:
+        """Check if the lowercased response should mention medication interactions"""
         warnings = []
-        current_meds = patient_context.get("current_medications", [])
+        current_meds = patient_context.current_medications
 
         # If patient is on medications and response mentions treatments
-        if current_meds and any(
-            word in response.lower() for word in ["treatment", "medication", "drug", "medicine"]
-        ):
+        if current_meds and any(word in response_lower for word in self.TREATMENT_WORDS):
             warnings.append(
                 "Response should remind patient to discuss with doctor about current medications"
             )
 
         return warnings
 
-    def _needs_emergency_disclaimer(self, response: str) -> bool:
-        """Check if response needs emergency care disclaimer"""
-        serious_keywords = [
-            "severe",
-            "serious",
-            "emergency",
-            "urgent",
-            "immediate",
-            "critical",
-        ]
-        return any(keyword in response.lower() for keyword in serious_keywords)
+    def _needs_emergency_disclaimer(self, response_lower: str) -> bool:
+        """Check if the lowercased response needs emergency care disclaimer"""
+        return self._SERIOUS_PATTERN.search(response_lower) is not None
+
+    def _build_result(self, flags: List[str], severity: str) -> Dict:
+        """Build the check_response result for the flags found so far"""
+        return {
+            "has_concerns": len(flags) > 0,
+            "flags": flags,
+            "severity": severity,
+            "recommendations": self._generate_recommendations(flags),
+        }
 
     def _generate_recommendations(self, flags: List[str]) -> List[str]:
         """Generate safety recommendations based on flags"""
         recommendations = []
+        # Lowercased once for all four checks; no keyword spans a line break
+        flags_lower = "\n".join(flags).lower()
 
-        if any("prescription" in flag.lower() for flag in flags):
+        if "prescription" in flags_lower:
             recommendations.append(
                 "Remove specific medication names and dosages. Use general medication classes instead."
             )
 
-        if any("allergy" in flag.lower() for flag in flags):
+        if "allergy" in flags_lower:
             recommendations.append("Add prominent allergy warning at the beginning of response.")
 
-        if any("interaction" in flag.lower() for flag in flags):
+        if "interaction" in flags_lower:
             recommendations.append(
                 "Add reminder to discuss with healthcare provider about current medications."
             )
 
-        if any("emergency" in flag.lower() for flag in flags):
+        if "emergency" in flags_lower:
             recommendations.append("Add clear guidance on when to seek emergency medical care.")
 
         return recommendations
@@ -0,0 +1,180 @@
+"""
+Semantic Cache - Similarity-based cache for AI completions
+Returns a prior answer when a new prompt is a close paraphrase of a cached one
+"""
+
+import hashlib
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from backend.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+Embedder = Callable[[str], "np.ndarray"]
+
+
+class _Namespace:
+    """Vectors and responses cached for a single system instruction"""
+
+    def __init__(self):
+        self.vectors: Optional[np.ndarray] = None
+        self.responses: List[str] = []
+        self.created_at: List[float] = []
+
+
+class SemanticCache:
+    """
+    Cosine-similarity cache over prompt embeddings
+
+    Entries are partitioned per system instruction so that advice, symptom and
+    treatment contexts never answer each other's prompts.
+    """
+
+    def __init__(
+        self,
+        embedder: Optional[Embedder] = None,
+        model_name: str = "sentence-transformers/all-MiniLM-L6-v2",
+        threshold: float = 0.85,
+        max_entries: int = 1024,
+        ttl_seconds: int = 1800,
+    ):
+        """
+        Initialize semantic cache
+
+        Args:
+            embedder: Callable mapping text to a vector. If None, a
+                      sentence-transformers model is loaded on first use.
+            model_name: sentence-transformers model used when no embedder is given
+            threshold: Minimum cosine similarity for a cache hit
+            max_entries: Maximum cached prompts per system instruction
+            ttl_seconds: Seconds a cached response stays valid
+        """
+        self.model_name = model_name
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._embedder = embedder
+        self._embedder_unavailable = False
+        self._namespaces: Dict[str, _Namespace] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether an embedding model is available"""
+        return self._get_embedder() is not None
+
+    def _get_embedder(self) -> Optional[Embedder]:
+        """Load the sentence-transformers model lazily, if installed"""
+        if self._embedder is not None or self._embedder_unavailable:
+            return self._embedder
+
+        try:
+            from sentence_transformers import SentenceTransformer
+
+            model = SentenceTransformer(self.model_name)
+            self._embedder = lambda text: model.encode(text)
+            logger.info("Semantic cache loaded embedding model: %s", self.model_name)
+        except Exception as e:
+            self._embedder_unavailable = True
+            logger.warning("Semantic cache disabled, embedding model unavailable: %s", e)
+
+        return self._embedder
+
+    @staticmethod
+    def _namespace_key(system_instruction: Optional[str]) -> str:
+        return hashlib.sha256((system_instruction or "").encode("utf-8")).hexdigest()
+
+    def _embed(self, text: str) -> Optional[np.ndarray]:
+        """Embed and L2-normalize text"""
+        embedder = self._get_embedder()
+        if embedder is None:
+            return None
+
+        vector = np.asarray(embedder(text), dtype=np.float32).reshape(-1)
+        norm = np.linalg.norm(vector)
+        if norm == 0:
+            return None
+        return vector / norm
+
+    def _evict_expired(self, namespace: _Namespace) -> None:
+        """Drop entries older than the TTL (entries are stored oldest first)"""
+        cutoff = time.monotonic() - self.ttl_seconds
+        expired = 0
+        while expired < len(namespace.created_at) and namespace.created_at[expired] < cutoff:
+            expired += 1
+
+        if expired:
+            namespace.vectors = namespace.vectors[expired:]
+            del namespace.responses[:expired]
+            del namespace.created_at[:expired]
+
+    def get(self, system_instruction: Optional[str], prompt: str) -> Optional[str]:
+        """
+        Get a cached response for a semantically similar prompt
+
+        Args:
+            system_instruction: System instruction the prompt is sent with
+            prompt: User prompt
+
+        Returns:
+            Cached response text or None
+        """
+        vector = self._embed(prompt)
+        if vector is None:
+            return None
+
+        with self._lock:
+            namespace = self._namespaces.get(self._namespace_key(system_instruction))
+            if namespace is None or not namespace.responses:
+                return None
+
+            self._evict_expired(namespace)
+            if not namespace.responses:
+                return None
+
+            similarities = namespace.vectors @ vector
+            best = int(np.argmax(similarities))
+            if similarities[best] >= self.threshold:
+                logger.info("Semantic cache hit (similarity %.3f)", similarities[best])
+                return namespace.responses[best]
+
+        return None
+
+    def set(self, system_instruction: Optional[str], prompt: str, response: str) -> None:
+        """
+        Cache a response for a prompt
+
+        Args:
+            system_instruction: System instruction the prompt was sent with
+            prompt: User prompt
+            response: Response text to cache
+        """
+        vector = self._embed(prompt)
+        if vector is None:
+            return
+
+        with self._lock:
+            key = self._namespace_key(system_instruction)
+            namespace = self._namespaces.setdefault(key, _Namespace())
+
+            if namespace.vectors is None:
+                namespace.vectors = vector.reshape(1, -1)
+            else:
+                namespace.vectors = np.vstack([namespace.vectors, vector])
+            namespace.responses.append(response)
+            namespace.created_at.append(time.monotonic())
+
+            overflow = len(namespace.responses) - self.max_entries
+            if overflow > 0:
+                namespace.vectors = namespace.vectors[overflow:]
+                del namespace.responses[:overflow]
+                del namespace.created_at[:overflow]
+
+    def clear(self) -> None:
+        """Remove all cached responses"""
+        with self._lock:
+            self._namespaces.clear()
@@ -0,0 +1,27 @@
+"""
+Types - Value objects passed between the context service and prompt builders
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+
+@dataclass(frozen=True, slots=True)
+class PatientContext:
+    """
+    Complete patient medical context for AI, compiled once per request
+
+    Fields are read as attributes by the prompt builders and safety checker.
+    Missing scalars are None and missing lists are empty tuples, so callers
+    never need dict.get defaults.
+    """
+
+    user_id: Optional[int] = None
+    age: Optional[int] = None
+    gender: Optional[str] = None
+    full_name: Optional[str] = None
+    medical_history: Tuple[Dict, ...] = ()
+    current_medications: Tuple[Dict, ...] = ()
+    allergies: Tuple[Dict, ...] = ()
+    recent_symptoms: Tuple[Dict, ...] = ()
+    conversation_context: Tuple[Dict, ...] = ()
@@ -6,12 +6,22 @@ Authentication-related exceptions.
 class AuthenticationError(Exception):
     """Base exception for authentication errors"""
 
-    pass
+    __slots__ = ()
+
+    @property
+    def message(self) -> str:
+        """Error message, formatted only when read"""
+        return super().__str__()
+
+    def __str__(self) -> str:
+        return self.message
 
 
 class InvalidCredentialsError(AuthenticationError):
     """Raised when login credentials are invalid"""
 
+    __slots__ = ("message",)
+
     def __init__(self, message: str = "Invalid username or password"):
         self.message = message
         super().__init__(self.message)
@@ -20,22 +30,36 @@ class InvalidCredentialsError(AuthenticationError):
 class UserAlreadyExistsError(AuthenticationError):
     """Raised when attempting to create a user with existing username"""
 
+    __slots__ = ("username",)
+
     def __init__(self, username: str):
-        self.message = f"User with username '{username}' already exists"
-        super().__init__(self.message)
+        self.username = username
+        super().__init__(username)
+
+    @property
+    def message(self) -> str:
+        return f"User with username '{self.username}' already exists"
 
 
 class UserNotFoundError(AuthenticationError):
     """Raised when user is not found"""
 
+    __slots__ = ("identifier",)
+
     def __init__(self, identifier: str):
-        self.message = f"User not found: {identifier}"
-        super().__init__(self.message)
+        self.identifier = identifier
+        super().__init__(identifier)
+
+    @property
+    def message(self) -> str:
+        return f"User not found: {self.identifier}"
 
 
 class SessionExpiredError(AuthenticationError):
     """Raised when user session has expired"""
 
+    __slots__ = ("message",)
+
     def __init__(self, message: str = "Session has expired. Please login again."):
         self.message = message
         super().__init__(self.message)
@@ -44,6 +68,8 @@ class SessionExpiredError(AuthenticationError):
 class UnauthorizedError(AuthenticationError):
     """Raised when user is not authorized to perform an action"""
 
+    __slots__ = ("message",)
+
     def __init__(self, message: str = "You are not authorized to perform this action"):
         self.message = message
         super().__init__(self.message)
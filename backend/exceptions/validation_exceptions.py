@@ -1,62 +1,108 @@
 """
 Validation-related exceptions.
+
+Messages are formatted when read (str(exc) or exc.message) rather than at
+raise time, so an exception that is caught and discarded never builds one.
 """
 
 
 class ValidationError(Exception):
     """Base exception for validation errors"""
 
-    pass
+    __slots__ = ()
+
+    @property
+    def message(self) -> str:
+        """Error message, formatted only when read"""
+        return super().__str__()
+
+    def __str__(self) -> str:
+        return self.message
 
 
 class InvalidInputError(ValidationError):
     """Raised when input fails validation"""
 
+    __slots__ = ("field", "reason")
+
     def __init__(self, field: str, message: str):
         self.field = field
-        self.message = f"Invalid {field}: {message}"
-        super().__init__(self.message)
+        self.reason = message
+        super().__init__(field, message)
+
+    @property
+    def message(self) -> str:
+        return f"Invalid {self.field}: {self.reason}"
 
 
 class InputTooLongError(ValidationError):
     """Raised when input exceeds maximum length"""
 
+    __slots__ = ("field", "max_length", "actual_length")
+
     def __init__(self, field: str, max_length: int, actual_length: int):
         self.field = field
         self.max_length = max_length
         self.actual_length = actual_length
-        self.message = f"{field} exceeds maximum length of {max_length} (got {actual_length})"
-        super().__init__(self.message)
+        super().__init__(field, max_length, actual_length)
+
+    @property
+    def message(self) -> str:
+        return (
+            f"{self.field} exceeds maximum length of {self.max_length} "
+            f"(got {self.actual_length})"
+        )
 
 
 class InputTooShortError(ValidationError):
     """Raised when input is below minimum length"""
 
+    __slots__ = ("field", "min_length", "actual_length")
+
     def __init__(self, field: str, min_length: int, actual_length: int):
         self.field = field
         self.min_length = min_length
         self.actual_length = actual_length
-        self.message = f"{field} must be at least {min_length} characters (got {actual_length})"
-        super().__init__(self.message)
+        super().__init__(field, min_length, actual_length)
+
+    @property
+    def message(self) -> str:
+        return (
+            f"{self.field} must be at least {self.min_length} characters "
+            f"(got {self.actual_length})"
+        )
 
 
 class InvalidFormatError(ValidationError):
     """Raised when input format is invalid"""
 
+    __slots__ = ("field", "expected_format")
+
     def __init__(self, field: str, expected_format: str):
         self.field = field
         self.expected_format = expected_format
-        self.message = f"{field} has invalid format. Expected: {expected_format}"
-        super().__init__(self.message)
+        super().__init__(field, expected_format)
+
+    @property
+    def message(self) -> str:
+        return f"{self.field} has invalid format. Expected: {self.expected_format}"
 
 
 class ValueOutOfRangeError(ValidationError):
     """Raised when numeric value is out of acceptable range"""
 
+    __slots__ = ("field", "min_val", "max_val", "actual_val")
+
     def __init__(self, field: str, min_val: float, max_val: float, actual_val: float):
         self.field = field
         self.min_val = min_val
         self.max_val = max_val
         self.actual_val = actual_val
-        self.message = f"{field} must be between {min_val} and {max_val} (got {actual_val})"
-        super().__init__(self.message)
+        super().__init__(field, min_val, max_val, actual_val)
+
+    @property
+    def message(self) -> str:
+        return (
+            f"{self.field} must be between {self.min_val} and {self.max_val} "
+            f"(got {self.actual_val})"
+        )
@@ -4,16 +4,32 @@ Allergy Models - Track patient allergies and reactions
 
 from datetime import date, datetime
 
-from sqlalchemy import Column, Date, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import Column, Date, DateTime, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import relationship
 
-from backend.models.user import Base
+from backend.models.severity import SeverityLabel
+from backend.models.user import Base, DictSerializableMixin
 
 
-class Allergy(Base):
+class Allergy(DictSerializableMixin, Base):
     """Patient allergies and adverse reactions"""
 
     __tablename__ = "allergies"
+    _REPR_FIELDS = ("id", "user_id", "allergen", "severity")
+
+    _FIELDS = (
+        "id",
+        "user_id",
+        "allergen",
+        "allergen_type",
+        "reaction",
+        "severity",
+        "verified_date",
+        "verified_by",
+        "notes",
+        "created_at",
+        "updated_at",
+    )
 
     id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
@@ -21,7 +37,7 @@ class Allergy(Base):
     allergen_type = Column(String(50), nullable=True)  # medication, food, environmental, other
     reaction = Column(Text, nullable=False)  # Description of reaction
     severity = Column(
-        String(50), nullable=False, default="moderate"
+        SeverityLabel, nullable=False, default="moderate"
     )  # mild, moderate, severe, life-threatening
     verified_date = Column(Date, nullable=True)  # When allergy was confirmed
     verified_by = Column(String(200), nullable=True)  # Doctor who verified
@@ -32,21 +48,5 @@ class Allergy(Base):
     # Relationships
     user = relationship("User", back_populates="allergies")
 
-    def __repr__(self) -> str:
-        return f"<Allergy(user_id={self.user_id}, allergen='{self.allergen}', severity='{self.severity}')>"
-
-    def to_dict(self) -> dict:
-        """Convert to dictionary for API responses"""
-        return {
-            "id": self.id,
-            "user_id": self.user_id,
-            "allergen": self.allergen,
-            "allergen_type": self.allergen_type,
-            "reaction": self.reaction,
-            "severity": self.severity,
-            "verified_date": (self.verified_date.isoformat() if self.verified_date else None),
-            "verified_by": self.verified_by,
-            "notes": self.notes,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
-        }
+    # Indexes matching the per-user list reads
+    __table_args__ = (Index("idx_allergy_user_severity", "user_id", "severity", "created_at"),)
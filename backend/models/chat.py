@@ -14,6 +14,7 @@ class ChatHistory(Base):
     """Chat history model for storing user conversations with AI"""
 
     __tablename__ = "chat_history"
+    _REPR_FIELDS = ("id", "user_id", "timestamp")
 
     id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
@@ -24,8 +25,8 @@ class ChatHistory(Base):
     # Relationships
     user = relationship("User", back_populates="chat_history")
 
-    # Indexes for performance
-    __table_args__ = (Index("idx_user_timestamp", "user_id", "timestamp"),)
-
-    def __repr__(self) -> str:
-        return f"<ChatHistory(id={self.id}, user_id={self.user_id}, timestamp='{self.timestamp}')>"
+    # Indexes for performance; (user_id, id) serves keyset-paginated history
+    __table_args__ = (
+        Index("idx_user_timestamp", "user_id", "timestamp"),
+        Index("idx_chat_user_id", "user_id", "id"),
+    )
@@ -14,6 +14,7 @@ class HealthMetric(Base):
     """Health metric model for tracking various health measurements"""
 
     __tablename__ = "health_metrics"
+    _REPR_FIELDS = ("id", "metric_type", "value", "unit")
 
     id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
@@ -28,12 +29,7 @@ class HealthMetric(Base):
 
     # Indexes for performance
     __table_args__ = (
-        Index("idx_user_metric_type", "user_id", "metric_type"),
+        # Trailing recorded_at serves per-type chart and latest-value reads without a sort
+        Index("idx_user_metric_type_recorded", "user_id", "metric_type", "recorded_at"),
         Index("idx_user_recorded", "user_id", "recorded_at"),
     )
-
-    def __repr__(self) -> str:
-        return (
-            f"<HealthMetric(id={self.id}, type='{self.metric_type}', "
-            f"value={self.value} {self.unit})>"
-        )
@@ -4,16 +4,30 @@ Medical History Models - Track patient medical conditions over time
 
 from datetime import date, datetime
 
-from sqlalchemy import Column, Date, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import Column, Date, DateTime, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import relationship
 
-from backend.models.user import Base
+from backend.models.severity import SeverityLabel
+from backend.models.user import Base, DictSerializableMixin
 
 
-class MedicalCondition(Base):
+class MedicalCondition(DictSerializableMixin, Base):
     """Patient's medical conditions and diagnoses"""
 
     __tablename__ = "medical_conditions"
+    _REPR_FIELDS = ("id", "user_id", "condition_name", "status")
+
+    _FIELDS = (
+        "id",
+        "user_id",
+        "condition_name",
+        "diagnosed_date",
+        "status",
+        "severity",
+        "notes",
+        "created_at",
+        "updated_at",
+    )
 
     id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
@@ -22,7 +36,7 @@ class MedicalCondition(Base):
     status = Column(
         String(50), nullable=False, default="active"
     )  # active, resolved, chronic, managed
-    severity = Column(String(50), nullable=True)  # mild, moderate, severe
+    severity = Column(SeverityLabel, nullable=True)  # mild, moderate, severe
     notes = Column(Text, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -30,19 +44,9 @@ class MedicalCondition(Base):
     # Relationships
     user = relationship("User", back_populates="medical_conditions")
 
-    def __repr__(self) -> str:
-        return f"<MedicalCondition(user_id={self.user_id}, condition='{self.condition_name}', status='{self.status}')>"
-
-    def to_dict(self) -> dict:
-        """Convert to dictionary for API responses"""
-        return {
-            "id": self.id,
-            "user_id": self.user_id,
-            "condition_name": self.condition_name,
-            "diagnosed_date": (self.diagnosed_date.isoformat() if self.diagnosed_date else None),
-            "status": self.status,
-            "severity": self.severity,
-            "notes": self.notes,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
-        }
+    # Indexes matching the per-user list reads
+    __table_args__ = (
+        # Trailing created_at serves status-filtered lists without a sort
+        Index("idx_condition_user_status_created", "user_id", "status", "created_at"),
+        Index("idx_condition_user_created", "user_id", "created_at"),
+    )
@@ -4,16 +4,34 @@ Medication Models - Track current and past medications
 
 from datetime import date, datetime
 
-from sqlalchemy import Column, Date, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import Column, Date, DateTime, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import relationship
 
-from backend.models.user import Base
+from backend.models.user import Base, DictSerializableMixin
 
 
-class Medication(Base):
+class Medication(DictSerializableMixin, Base):
     """Patient's current and past medications"""
 
     __tablename__ = "medications"
+    _REPR_FIELDS = ("id", "user_id", "medication_name", "status")
+
+    _FIELDS = (
+        "id",
+        "user_id",
+        "medication_name",
+        "dosage",
+        "frequency",
+        "route",
+        "start_date",
+        "end_date",
+        "status",
+        "reason",
+        "prescribing_doctor",
+        "notes",
+        "created_at",
+        "updated_at",
+    )
 
     id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
@@ -33,24 +51,9 @@ class Medication(Base):
     # Relationships
     user = relationship("User", back_populates="medications")
 
-    def __repr__(self) -> str:
-        return f"<Medication(user_id={self.user_id}, medication='{self.medication_name}', status='{self.status}')>"
-
-    def to_dict(self) -> dict:
-        """Convert to dictionary for API responses"""
-        return {
-            "id": self.id,
-            "user_id": self.user_id,
-            "medication_name": self.medication_name,
-            "dosage": self.dosage,
-            "frequency": self.frequency,
-            "route": self.route,
-            "start_date": self.start_date.isoformat() if self.start_date else None,
-            "end_date": self.end_date.isoformat() if self.end_date else None,
-            "status": self.status,
-            "reason": self.reason,
-            "prescribing_doctor": self.prescribing_doctor,
-            "notes": self.notes,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
-        }
+    # Indexes matching the per-user list reads
+    __table_args__ = (
+        # Trailing start_date serves the active-medications read without a sort
+        Index("idx_medication_user_status_start", "user_id", "status", "start_date"),
+        Index("idx_medication_user_created", "user_id", "created_at"),
+    )
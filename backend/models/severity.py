@@ -0,0 +1,70 @@
+"""
+Severity scale shared by allergies and medical conditions
+
+create_all never alters an existing column, so a database created while
+severity was String(50) keeps a VARCHAR column. On PostgreSQL convert it
+once, for both allergies and medical_conditions:
+
+    ALTER TABLE allergies ALTER COLUMN severity TYPE smallint
+        USING CASE severity WHEN 'mild' THEN 1 WHEN 'moderate' THEN 2
+        WHEN 'severe' THEN 3 WHEN 'life-threatening' THEN 4 END;
+
+SQLite cannot change a column type. There the same CASE in an UPDATE
+stores the ranks as numeric text, which SeverityLabel reads back as labels
+and which still compares in rank order against integer bounds.
+"""
+
+from enum import IntEnum
+from typing import Optional, Union
+
+from sqlalchemy import SmallInteger
+from sqlalchemy.types import TypeDecorator
+
+
+class Severity(IntEnum):
+    """Clinical severity, ordered from least to most severe"""
+
+    MILD = 1
+    MODERATE = 2
+    SEVERE = 3
+    LIFE_THREATENING = 4
+
+    @property
+    def label(self) -> str:
+        """API label, e.g. "life-threatening" """
+        return self.name.lower().replace("_", "-")
+
+    @classmethod
+    def from_label(cls, label: str) -> "Severity":
+        """Severity for an API label"""
+        return cls[label.upper().replace("-", "_")]
+
+
+class SeverityLabel(TypeDecorator):
+    """
+    Severity stored as its SmallInteger rank and read back as its label
+
+    Models, repositories and the API keep working with labels ("severe"),
+    while the database holds a narrow integer, so ORDER BY and range filters
+    follow clinical order instead of alphabetical order. Comparisons may
+    use a label or a Severity member.
+    """
+
+    impl = SmallInteger
+    cache_ok = True
+
+    def process_bind_param(self, value: Optional[Union[str, int]], dialect) -> Optional[int]:
+        if value is None or isinstance(value, int):
+            return value
+        return Severity.from_label(value).value
+
+    def process_result_value(self, value: Optional[Union[str, int]], dialect) -> Optional[str]:
+        if value is None:
+            return value
+        if isinstance(value, str):
+            # A column still typed VARCHAR returns ranks as numeric text, or
+            # labels that were never converted
+            if not value.isdigit():
+                return value
+            value = int(value)
+        return Severity(value).label
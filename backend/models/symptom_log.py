@@ -4,16 +4,36 @@ Symptom Log Models - Detailed symptom tracking over time
 
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import relationship
 
-from backend.models.user import Base
+from backend.models.user import Base, DictSerializableMixin
 
 
-class SymptomLog(Base):
+class SymptomLog(DictSerializableMixin, Base):
     """Detailed symptom tracking for pattern analysis"""
 
     __tablename__ = "symptom_logs"
+    _REPR_FIELDS = ("id", "user_id", "severity")
+
+    _FIELDS = (
+        "id",
+        "user_id",
+        "symptom_description",
+        "body_part",
+        "severity",
+        "onset_date",
+        "duration",
+        "frequency",
+        "quality",
+        "associated_symptoms",
+        "triggers",
+        "relieving_factors",
+        "aggravating_factors",
+        "impact_on_life",
+        "notes",
+        "logged_at",
+    )
 
     id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
@@ -35,26 +55,5 @@ class SymptomLog(Base):
     # Relationships
     user = relationship("User", back_populates="symptom_logs")
 
-    def __repr__(self) -> str:
-        return f"<SymptomLog(user_id={self.user_id}, symptom='{self.symptom_description[:50]}...', severity={self.severity})>"
-
-    def to_dict(self) -> dict:
-        """Convert to dictionary for API responses"""
-        return {
-            "id": self.id,
-            "user_id": self.user_id,
-            "symptom_description": self.symptom_description,
-            "body_part": self.body_part,
-            "severity": self.severity,
-            "onset_date": self.onset_date.isoformat() if self.onset_date else None,
-            "duration": self.duration,
-            "frequency": self.frequency,
-            "quality": self.quality,
-            "associated_symptoms": self.associated_symptoms,
-            "triggers": self.triggers,
-            "relieving_factors": self.relieving_factors,
-            "aggravating_factors": self.aggravating_factors,
-            "impact_on_life": self.impact_on_life,
-            "notes": self.notes,
-            "logged_at": self.logged_at.isoformat() if self.logged_at else None,
-        }
+    # Indexes matching the per-user list reads
+    __table_args__ = (Index("idx_symptom_user_logged", "user_id", "logged_at"),)
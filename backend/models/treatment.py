@@ -14,6 +14,7 @@ class TreatmentPlan(Base):
     """Treatment plan model for storing personalized health plans"""
 
     __tablename__ = "treatment_plans"
+    _REPR_FIELDS = ("id", "title", "condition")
 
     id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
@@ -27,6 +28,3 @@ class TreatmentPlan(Base):
 
     # Indexes for performance
     __table_args__ = (Index("idx_user_created", "user_id", "created_at"),)
-
-    def __repr__(self) -> str:
-        return f"<TreatmentPlan(id={self.id}, title='{self.title}', condition='{self.condition}')>"
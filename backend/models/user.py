@@ -2,20 +2,68 @@
 User model for authentication and user management.
 """
 
-from datetime import datetime
+from datetime import date, datetime
+from typing import Tuple
 
-import bcrypt
 from sqlalchemy import Column, DateTime, Integer, String
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 
-Base = declarative_base()
+from backend.utils.passwords import hash_password, needs_rehash, verify_password
+
+
+class _ModelBase:
+    """
+    Behaviour shared by every model
+
+    __repr__ reads only state already in the instance __dict__, so logging
+    or an error message never triggers a refresh SELECT on an expired
+    instance, nor fails on a detached one. Unloaded fields are left out.
+    """
+
+    # Fields shown by __repr__, when loaded
+    _REPR_FIELDS: Tuple[str, ...] = ("id",)
+
+    def __repr__(self) -> str:
+        loaded = vars(self)
+        fields = ", ".join(
+            f"{name}={loaded[name]!r}" for name in self._REPR_FIELDS if name in loaded
+        )
+        return f"<{type(self).__name__}({fields})>"
+
+
+Base = declarative_base(cls=_ModelBase)
+
+
+class DictSerializableMixin:
+    """
+    to_dict for models, read straight from the instance's loaded state
+
+    Loaded column values sit in the instance __dict__, so reading them from
+    vars() skips the per-column descriptor and InstanceState machinery.
+    Attributes not loaded yet (expired after a commit, or deferred) fall
+    back to normal attribute access, which loads them.
+    """
+
+    # Serialized columns, in API response order
+    _FIELDS: Tuple[str, ...] = ()
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary for API responses, with dates as ISO strings"""
+        loaded = vars(self)
+        result = {}
+        for name in self._FIELDS:
+            value = loaded[name] if name in loaded else getattr(self, name)
+            # datetime is a date subclass, so this covers both column types
+            result[name] = value.isoformat() if isinstance(value, date) else value
+        return result
 
 
 class User(Base):
     """User model for authentication and profile management"""
 
     __tablename__ = "users"
+    _REPR_FIELDS = ("id", "username", "full_name")
 
     id = Column(Integer, primary_key=True)
     username = Column(String(50), unique=True, nullable=False, index=True)
@@ -44,12 +92,12 @@ class User(Base):
 
     def set_password(self, password: str) -> None:
         """Hash and set password"""
-        salt = bcrypt.gensalt()
-        self.password_hash = bcrypt.hashpw(password.encode("utf-8"), salt).decode("utf-8")
+        self.password_hash = hash_password(password)
 
     def check_password(self, password: str) -> bool:
         """Verify password"""
-        return bcrypt.checkpw(password.encode("utf-8"), self.password_hash.encode("utf-8"))
+        return verify_password(self.password_hash, password)
 
-    def __repr__(self) -> str:
-        return f"<User(id={self.id}, username='{self.username}', full_name='{self.full_name}')>"
+    def password_needs_rehash(self) -> bool:
+        """Whether the stored hash predates the current hashing settings"""
+        return needs_rehash(self.password_hash)
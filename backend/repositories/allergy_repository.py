@@ -6,9 +6,11 @@ from datetime import datetime
 from typing import List, Optional
 
 from sqlalchemy import desc
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 
 from backend.models.allergy import Allergy
+from backend.models.severity import Severity
 from backend.repositories.base import BaseRepository
 from backend.utils.logger import get_logger
 
@@ -20,38 +22,41 @@ class AllergyRepository(BaseRepository[Allergy]):
 
     def __init__(self, db: Session):
         super().__init__(Allergy, db)
-        self.session = db
 
-    def get_by_user(self, user_id: int) -> List[Allergy]:
-        """Get all allergies for a user"""
+    def get_by_user(self, user_id: int, rows: bool = False) -> List[Allergy]:
+        """Get all allergies for a user (as read-only column rows if rows is set)"""
         try:
             allergies = (
-                self.db.query(Allergy)
+                self._query(rows)
                 .filter(Allergy.user_id == user_id)
                 .order_by(desc(Allergy.severity), desc(Allergy.created_at))
                 .all()
             )
-            logger.info(f"Retrieved {len(allergies)} allergies for user {user_id}")
+            logger.debug("Retrieved %s allergies for user %s", len(allergies), user_id)
             return allergies
 
+        except SQLAlchemyError:
+            # An unreachable database must not look like an empty history
+            raise
         except Exception as e:
-            logger.error(f"Error retrieving allergies for user {user_id}: {e}")
+            logger.error("Error retrieving allergies for user %s: %s", user_id, e)
             return []
 
-    def get_severe_allergies(self, user_id: int) -> List[Allergy]:
-        """Get severe/life-threatening allergies"""
+    def get_severe_allergies(self, user_id: int, rows: bool = False) -> List[Allergy]:
+        """Get severe/life-threatening allergies (as read-only column rows if rows is set)"""
         try:
             allergies = (
-                self.db.query(Allergy)
+                self._query(rows)
                 .filter(
                     Allergy.user_id == user_id,
-                    Allergy.severity.in_(["severe", "life-threatening"]),
+                    # One range scan of the (user_id, severity) index prefix
+                    Allergy.severity >= Severity.SEVERE,
                 )
                 .all()
             )
             return allergies
         except Exception as e:
-            logger.error(f"Error retrieving severe allergies for user {user_id}: {e}")
+            logger.error("Error retrieving severe allergies for user %s: %s", user_id, e)
             return []
 
     def add_allergy(
@@ -67,7 +72,7 @@ class AllergyRepository(BaseRepository[Allergy]):
     ) -> Optional[Allergy]:
         """Add a new allergy"""
         try:
-            allergy = Allergy(
+            return self.create(
                 user_id=user_id,
                 allergen=allergen,
                 allergen_type=allergen_type,
@@ -77,16 +82,15 @@ class AllergyRepository(BaseRepository[Allergy]):
                 verified_by=verified_by,
                 notes=notes,
             )
-            return self.create(allergy)
         except Exception as e:
-            logger.error(f"Error adding allergy: {e}")
+            logger.error("Error adding allergy: %s", e)
             return None
 
     def check_allergen(self, user_id: int, allergen_name: str) -> Optional[Allergy]:
         """Check if user has specific allergy"""
         try:
             allergy = (
-                self.db.query(Allergy)
+                self._query()
                 .filter(
                     Allergy.user_id == user_id,
                     Allergy.allergen.ilike(f"%{allergen_name}%"),
@@ -95,5 +99,5 @@ class AllergyRepository(BaseRepository[Allergy]):
             )
             return allergy
         except Exception as e:
-            logger.error(f"Error checking allergen: {e}")
+            logger.error("Error checking allergen: %s", e)
             return None
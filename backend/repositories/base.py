@@ -2,9 +2,10 @@
 Base repository with common CRUD operations.
 """
 
-from typing import Generic, List, Optional, Type, TypeVar
+from typing import Dict, Generic, List, Optional, Tuple, Type, TypeVar
 
-from sqlalchemy.orm import Session
+from sqlalchemy import insert
+from sqlalchemy.orm import Query, Session, raiseload
 
 from backend.models.user import Base
 from backend.utils.logger import get_logger
@@ -29,9 +30,32 @@ class BaseRepository(Generic[ModelType]):
         self.model = model
         self.session = session
 
+    def _query(self, rows: bool = False) -> Query:
+        """
+        Query for list reads that never lazy-loads relationships.
+
+        Serializers only read columns, so any relationship access on the
+        returned rows raises instead of silently issuing one SELECT per row.
+
+        Args:
+            rows: Select the table's columns as plain Row tuples instead of
+                model instances. Rows expose the same attribute names but skip
+                identity-map and instrumentation overhead, which suits reads
+                that are only serialized.
+
+        Returns:
+            Query over the model with all relationship loading disabled
+        """
+        if rows:
+            return self.session.query(*self.model.__table__.columns)
+        return self.session.query(self.model).options(raiseload("*"))
+
     def create(self, **kwargs) -> ModelType:
         """
-        Create a new record.
+        Create a new record with one INSERT ... RETURNING.
+
+        The returned instance is fully loaded and detached, so reading it
+        after commit never issues a refresh SELECT.
 
         Args:
             **kwargs: Model attributes
@@ -40,17 +64,88 @@ class BaseRepository(Generic[ModelType]):
             Created model instance
         """
         try:
-            instance = self.model(**kwargs)
-            self.session.add(instance)
+            instance = self.session.scalars(
+                insert(self.model).values(**kwargs).returning(self.model)
+            ).one()
+            self._detach_loaded([instance])
             self.session.commit()
-            self.session.refresh(instance)
-            logger.info(f"Created {self.model.__name__} with id={instance.id}")
+            logger.info("Created %s with id=%s", self.model.__name__, instance.id)
             return instance
         except Exception as e:
             self.session.rollback()
-            logger.error(f"Error creating {self.model.__name__}: {str(e)}")
+            logger.error("Error creating %s: %s", self.model.__name__, e)
+            raise
+
+    def bulk_create(self, rows: List[Dict]) -> List[ModelType]:
+        """
+        Create many records with one multi-row INSERT ... RETURNING.
+
+        All rows are committed together or not at all.
+
+        Args:
+            rows: Model attributes, one dict per record
+
+        Returns:
+            Created model instances, in the same order as rows
+        """
+        try:
+            instances = list(
+                self.session.scalars(
+                    insert(self.model).returning(self.model, sort_by_parameter_order=True),
+                    rows,
+                )
+            )
+            self._detach_loaded(instances)
+            self.session.commit()
+            logger.info("Bulk created %s %s records", len(instances), self.model.__name__)
+            return instances
+        except Exception as e:
+            self.session.rollback()
+            logger.error("Error bulk creating %s: %s", self.model.__name__, e)
             raise
 
+    def bulk_create_best_effort(self, rows: List[Dict]) -> Tuple[List[ModelType], List[int]]:
+        """
+        Create many records, skipping rows the database rejects.
+
+        Tries the single multi-row INSERT first and only falls back to one
+        savepoint per row if that fails.
+
+        Args:
+            rows: Model attributes, one dict per record
+
+        Returns:
+            Tuple of (created model instances, indexes of rows that failed)
+        """
+        try:
+            return self.bulk_create(rows), []
+        except Exception:
+            pass
+
+        created, failed = [], []
+        for index, row in enumerate(rows):
+            try:
+                with self.session.begin_nested():
+                    instance = self.model(**row)
+                    self.session.add(instance)
+                created.append(instance)
+            except Exception as e:
+                logger.warning("Skipping %s row %s: %s", self.model.__name__, index, e)
+                failed.append(index)
+        self._detach_loaded(created)
+        self.session.commit()
+        return created, failed
+
+    def _detach_loaded(self, instances: List[ModelType]) -> None:
+        """
+        Detach freshly inserted instances before commit.
+
+        Their columns are already loaded, and commit would otherwise expire
+        them so that serializing N rows cost N refresh SELECTs.
+        """
+        for instance in instances:
+            self.session.expunge(instance)
+
     def get_by_id(self, id: int) -> Optional[ModelType]:
         """
         Get record by ID.
@@ -94,11 +189,11 @@ class BaseRepository(Generic[ModelType]):
                     setattr(instance, key, value)
                 self.session.commit()
                 self.session.refresh(instance)
-                logger.info(f"Updated {self.model.__name__} with id={id}")
+                logger.info("Updated %s with id=%s", self.model.__name__, id)
             return instance
         except Exception as e:
             self.session.rollback()
-            logger.error(f"Error updating {self.model.__name__}: {str(e)}")
+            logger.error("Error updating %s: %s", self.model.__name__, e)
             raise
 
     def delete(self, id: int) -> bool:
@@ -116,12 +211,12 @@ class BaseRepository(Generic[ModelType]):
             if instance:
                 self.session.delete(instance)
                 self.session.commit()
-                logger.info(f"Deleted {self.model.__name__} with id={id}")
+                logger.info("Deleted %s with id=%s", self.model.__name__, id)
                 return True
             return False
         except Exception as e:
             self.session.rollback()
-            logger.error(f"Error deleting {self.model.__name__}: {str(e)}")
+            logger.error("Error deleting %s: %s", self.model.__name__, e)
             raise
 
     def count(self) -> int:
@@ -2,7 +2,8 @@
 Chat repository for chat history operations.
 """
 
-from typing import List
+from datetime import datetime
+from typing import List, Optional, Tuple
 
 from sqlalchemy import desc
 from sqlalchemy.orm import Session
@@ -32,38 +33,54 @@ class ChatRepository(BaseRepository[ChatHistory]):
         Returns:
             Created ChatHistory instance
         """
-        try:
-            chat = ChatHistory(user_id=user_id, message=message, response=response)
-            self.session.add(chat)
-            self.session.commit()
-            self.session.refresh(chat)
+        chat = self.create(user_id=user_id, message=message, response=response)
+        logger.info("Added chat message for user_id=%s", user_id)
+        return chat
 
-            logger.info(f"Added chat message for user_id={user_id}")
-            return chat
+    def bulk_add_messages(
+        self, user_id: int, exchanges: List[Tuple[str, str]]
+    ) -> List[ChatHistory]:
+        """
+        Add many chat messages in one INSERT and one commit.
 
-        except Exception as e:
-            self.session.rollback()
-            logger.error(f"Error adding chat message: {str(e)}")
-            raise
+        Args:
+            user_id: User ID
+            exchanges: (message, response) pairs
 
-    def get_user_history(self, user_id: int, limit: int = 50) -> List[ChatHistory]:
+        Returns:
+            Created ChatHistory instances, in the same order as exchanges
         """
-        Get chat history for a user.
+        return self.bulk_create(
+            [
+                {"user_id": user_id, "message": message, "response": response}
+                for message, response in exchanges
+            ]
+        )
+
+    def get_user_history(
+        self,
+        user_id: int,
+        limit: int = 50,
+        before_id: Optional[int] = None,
+        rows: bool = False,
+    ) -> List[ChatHistory]:
+        """
+        Get chat history for a user, newest first, one keyset page at a time.
 
         Args:
             user_id: User ID
             limit: Maximum number of messages to retrieve
+            before_id: Only return messages older than this id; pass the last
+                id of the previous page to fetch the next one
+            rows: Return read-only column rows instead of model instances
 
         Returns:
-            List of ChatHistory instances, ordered by timestamp descending
+            List of ChatHistory instances, ordered by id descending
         """
-        return (
-            self.session.query(ChatHistory)
-            .filter(ChatHistory.user_id == user_id)
-            .order_by(desc(ChatHistory.timestamp))
-            .limit(limit)
-            .all()
-        )
+        query = self._query(rows).filter(ChatHistory.user_id == user_id)
+        if before_id is not None:
+            query = query.filter(ChatHistory.id < before_id)
+        return query.order_by(desc(ChatHistory.id)).limit(limit).all()
 
     def delete_user_history(self, user_id: int) -> int:
         """
@@ -79,27 +96,59 @@ class ChatRepository(BaseRepository[ChatHistory]):
             count = self.session.query(ChatHistory).filter(ChatHistory.user_id == user_id).delete()
             self.session.commit()
 
-            logger.info(f"Deleted {count} chat messages for user_id={user_id}")
+            logger.info("Deleted %s chat messages for user_id=%s", count, user_id)
+            return count
+
+        except Exception as e:
+            self.session.rollback()
+            logger.error("Error deleting chat history: %s", e)
+            raise
+
+    def delete_older_than(self, cutoff: datetime) -> int:
+        """
+        Delete chat messages recorded before a cutoff, for every user.
+
+        The timestamp index turns this into a range delete over the oldest
+        rows, so retention keeps the table and its indexes at a steady size.
+
+        Args:
+            cutoff: Messages with an earlier timestamp are deleted
+
+        Returns:
+            Number of deleted records
+        """
+        try:
+            count = (
+                self.session.query(ChatHistory)
+                .filter(ChatHistory.timestamp < cutoff)
+                .delete(synchronize_session=False)
+            )
+            self.session.commit()
+
+            logger.info("Deleted %s chat messages older than %s", count, cutoff)
             return count
 
         except Exception as e:
             self.session.rollback()
-            logger.error(f"Error deleting chat history: {str(e)}")
+            logger.error("Error deleting expired chat history: %s", e)
             raise
 
-    def get_recent_messages(self, user_id: int, count: int = 10) -> List[ChatHistory]:
+    def get_recent_messages(
+        self, user_id: int, count: int = 10, rows: bool = False
+    ) -> List[ChatHistory]:
         """
         Get most recent messages for a user.
 
         Args:
             user_id: User ID
             count: Number of recent messages
+            rows: Return read-only column rows instead of model instances
 
         Returns:
             List of recent ChatHistory instances
         """
         return (
-            self.session.query(ChatHistory)
+            self._query(rows)
             .filter(ChatHistory.user_id == user_id)
             .order_by(desc(ChatHistory.timestamp))
             .limit(count)
@@ -2,9 +2,10 @@
 Health repository for health metric operations.
 """
 
-from typing import List, Optional
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
 
-from sqlalchemy import desc
+from sqlalchemy import Date, Row, desc, func, select, type_coerce
 from sqlalchemy.orm import Session
 
 from backend.models.health_metric import HealthMetric
@@ -36,24 +37,33 @@ class HealthRepository(BaseRepository[HealthMetric]):
         Returns:
             Created HealthMetric instance
         """
-        try:
-            metric = HealthMetric(
-                user_id=user_id, metric_type=metric_type, value=value, unit=unit, notes=notes
-            )
-            self.session.add(metric)
-            self.session.commit()
-            self.session.refresh(metric)
+        metric = self.create(
+            user_id=user_id, metric_type=metric_type, value=value, unit=unit, notes=notes
+        )
+        logger.info("Added %s metric for user_id=%s", metric_type, user_id)
+        return metric
 
-            logger.info(f"Added {metric_type} metric for user_id={user_id}")
-            return metric
+    def bulk_add_metrics(self, user_id: int, items: List[Dict]) -> List[HealthMetric]:
+        """
+        Add many health metrics in one INSERT and one commit (wearable sync / imports)
 
-        except Exception as e:
-            self.session.rollback()
-            logger.error(f"Error adding health metric: {str(e)}")
-            raise
+        Args:
+            user_id: User ID
+            items: Metric fields (metric_type, value, unit, notes), one dict per metric
+
+        Returns:
+            Created HealthMetric instances, in the same order as items
+        """
+        # A multi-row INSERT ... RETURNING hands back the generated ids;
+        # COPY would only pay off for far larger loads and cannot
+        return self.bulk_create([{**item, "user_id": user_id} for item in items])
 
     def get_user_metrics(
-        self, user_id: int, metric_type: Optional[str] = None, limit: int = 100
+        self,
+        user_id: int,
+        metric_type: Optional[str] = None,
+        limit: int = 100,
+        rows: bool = False,
     ) -> List[HealthMetric]:
         """
         Get health metrics for a user.
@@ -62,17 +72,59 @@ class HealthRepository(BaseRepository[HealthMetric]):
             user_id: User ID
             metric_type: Optional filter by metric type
             limit: Maximum number of records
+            rows: Return read-only column rows instead of model instances
 
         Returns:
             List of HealthMetric instances, ordered by recorded_at descending
         """
-        query = self.session.query(HealthMetric).filter(HealthMetric.user_id == user_id)
+        query = self._query(rows).filter(HealthMetric.user_id == user_id)
 
         if metric_type:
             query = query.filter(HealthMetric.metric_type == metric_type)
 
         return query.order_by(desc(HealthMetric.recorded_at)).limit(limit).all()
 
+    def get_daily_summary(
+        self,
+        user_id: int,
+        metric_type: str,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> List[Row]:
+        """
+        Get one metric type rolled up per calendar day, for charting long ranges.
+
+        The database groups the rows, so a chart gets one row per day however
+        many measurements were recorded. The (user_id, metric_type,
+        recorded_at) index covers the filter and the range.
+
+        Args:
+            user_id: User ID
+            metric_type: Type of metric
+            since: Optional inclusive lower bound on recorded_at
+            until: Optional exclusive upper bound on recorded_at
+
+        Returns:
+            Rows of (day, average, minimum, maximum, count), oldest day first
+        """
+        # date() works on both SQLite and PostgreSQL; the Date coercion makes
+        # SQLite's text result come back as a date too
+        day = type_coerce(func.date(HealthMetric.recorded_at), Date).label("day")
+        query = self.session.query(
+            day,
+            func.avg(HealthMetric.value).label("average"),
+            func.min(HealthMetric.value).label("minimum"),
+            func.max(HealthMetric.value).label("maximum"),
+            func.count(HealthMetric.id).label("count"),
+        ).filter(HealthMetric.user_id == user_id, HealthMetric.metric_type == metric_type)
+
+        if since is not None:
+            query = query.filter(HealthMetric.recorded_at >= since)
+        if until is not None:
+            query = query.filter(HealthMetric.recorded_at < until)
+
+        return query.group_by(day).order_by(day).all()
+
     def get_latest_metric(self, user_id: int, metric_type: str) -> Optional[HealthMetric]:
         """
         Get the most recent metric of a specific type.
@@ -91,23 +143,60 @@ class HealthRepository(BaseRepository[HealthMetric]):
             .first()
         )
 
+    def get_metric_version(self, user_id: int, metric_type: str) -> Tuple[Optional[int], int]:
+        """
+        Get a cheap version stamp for one metric type's data.
+
+        Any insert raises the max id and any delete lowers the count, so the
+        pair changes whenever the series does.
+
+        Args:
+            user_id: User ID
+            metric_type: Type of metric
+
+        Returns:
+            Tuple of (newest metric id or None, number of metrics)
+        """
+        newest, count = (
+            self.session.query(func.max(HealthMetric.id), func.count(HealthMetric.id))
+            .filter(HealthMetric.user_id == user_id, HealthMetric.metric_type == metric_type)
+            .one()
+        )
+        return newest, count
+
     def get_metric_types(self, user_id: int) -> List[str]:
         """
         Get all unique metric types for a user.
 
+        A user has a handful of types but may have thousands of rows, so
+        instead of a DISTINCT over every row this walks the
+        (user_id, metric_type, ...) index as a loose index scan: each step
+        of the recursive CTE seeks to the next type greater than the last.
+
         Args:
             user_id: User ID
 
         Returns:
-            List of metric type names
+            List of metric type names, in alphabetical order
         """
-        results = (
-            self.session.query(HealthMetric.metric_type)
-            .filter(HealthMetric.user_id == user_id)
-            .distinct()
-            .all()
+        metric_type = HealthMetric.metric_type
+        types = (
+            select(func.min(metric_type).label("metric_type"))
+            .where(HealthMetric.user_id == user_id)
+            .cte("types", recursive=True)
+        )
+        next_type = (
+            select(func.min(metric_type))
+            .where(HealthMetric.user_id == user_id, metric_type > types.c.metric_type)
+            .scalar_subquery()
+        )
+        types = types.union_all(select(next_type).where(types.c.metric_type.is_not(None)))
+
+        return list(
+            self.session.scalars(
+                select(types.c.metric_type).where(types.c.metric_type.is_not(None))
+            )
         )
-        return [r[0] for r in results]
 
     def delete_metric(self, metric_id: int, user_id: int) -> bool:
         """
@@ -121,21 +210,19 @@ class HealthRepository(BaseRepository[HealthMetric]):
             True if deleted, False if not found or not owned by user
         """
         try:
-            metric = (
+            # One DELETE; the affected row count doubles as the existence check
+            deleted = (
                 self.session.query(HealthMetric)
                 .filter(HealthMetric.id == metric_id, HealthMetric.user_id == user_id)
-                .first()
+                .delete()
             )
+            self.session.commit()
 
-            if metric:
-                self.session.delete(metric)
-                self.session.commit()
-                logger.info(f"Deleted health metric id={metric_id}")
-                return True
-
-            return False
+            if deleted:
+                logger.info("Deleted health metric id=%s", metric_id)
+            return bool(deleted)
 
         except Exception as e:
             self.session.rollback()
-            logger.error(f"Error deleting health metric: {str(e)}")
+            logger.error("Error deleting health metric: %s", e)
             raise
@@ -3,9 +3,10 @@ Medical History Repository - Manages medical conditions data
 """
 
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from sqlalchemy import and_, desc
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 
 from backend.models.medical_condition import MedicalCondition
@@ -20,38 +21,43 @@ class MedicalHistoryRepository(BaseRepository[MedicalCondition]):
 
     def __init__(self, db: Session):
         super().__init__(MedicalCondition, db)
-        self.session = db
 
-    def get_by_user(self, user_id: int, status: Optional[str] = None) -> List[MedicalCondition]:
+    def get_by_user(
+        self, user_id: int, status: Optional[str] = None, rows: bool = False
+    ) -> List[MedicalCondition]:
         """
         Get all medical conditions for a user
 
         Args:
             user_id: User ID
             status: Optional status filter (active, resolved, chronic)
+            rows: Return read-only column rows instead of model instances
 
         Returns:
             List of medical conditions
         """
         try:
-            query = self.db.query(MedicalCondition).filter(MedicalCondition.user_id == user_id)
+            query = self._query(rows).filter(MedicalCondition.user_id == user_id)
 
             if status:
                 query = query.filter(MedicalCondition.status == status)
 
             conditions = query.order_by(desc(MedicalCondition.created_at)).all()
-            logger.info(f"Retrieved {len(conditions)} medical conditions for user {user_id}")
+            logger.debug("Retrieved %s medical conditions for user %s", len(conditions), user_id)
             return conditions
 
+        except SQLAlchemyError:
+            # An unreachable database must not look like an empty history
+            raise
         except Exception as e:
-            logger.error(f"Error retrieving medical conditions for user {user_id}: {e}")
+            logger.error("Error retrieving medical conditions for user %s: %s", user_id, e)
             return []
 
-    def get_active_conditions(self, user_id: int) -> List[MedicalCondition]:
-        """Get only active/chronic conditions"""
+    def get_active_conditions(self, user_id: int, rows: bool = False) -> List[MedicalCondition]:
+        """Get only active/chronic conditions (as read-only column rows if rows is set)"""
         try:
             conditions = (
-                self.db.query(MedicalCondition)
+                self._query(rows)
                 .filter(
                     and_(
                         MedicalCondition.user_id == user_id,
@@ -62,8 +68,11 @@ class MedicalHistoryRepository(BaseRepository[MedicalCondition]):
                 .all()
             )
             return conditions
+        except SQLAlchemyError:
+            # An unreachable database must not look like an empty history
+            raise
         except Exception as e:
-            logger.error(f"Error retrieving active conditions for user {user_id}: {e}")
+            logger.error("Error retrieving active conditions for user %s: %s", user_id, e)
             return []
 
     def add_condition(
@@ -77,7 +86,7 @@ class MedicalHistoryRepository(BaseRepository[MedicalCondition]):
     ) -> Optional[MedicalCondition]:
         """Add a new medical condition"""
         try:
-            condition = MedicalCondition(
+            return self.create(
                 user_id=user_id,
                 condition_name=condition_name,
                 status=status,
@@ -85,11 +94,29 @@ class MedicalHistoryRepository(BaseRepository[MedicalCondition]):
                 diagnosed_date=diagnosed_date,
                 notes=notes,
             )
-            return self.create(condition)
         except Exception as e:
-            logger.error(f"Error adding medical condition: {e}")
+            logger.error("Error adding medical condition: %s", e)
             return None
 
+    def bulk_add_conditions(
+        self, user_id: int, items: List[Dict], best_effort: bool = False
+    ) -> Tuple[List[MedicalCondition], List[int]]:
+        """
+        Add many medical conditions in one INSERT
+
+        Args:
+            user_id: User ID
+            items: Condition fields, one dict per condition
+            best_effort: Skip rows the database rejects instead of failing the batch
+
+        Returns:
+            Tuple of (created conditions, indexes of rows that failed)
+        """
+        rows = [{**item, "user_id": user_id} for item in items]
+        if best_effort:
+            return self.bulk_create_best_effort(rows)
+        return self.bulk_create(rows), []
+
     def update_status(self, condition_id: int, status: str) -> Optional[MedicalCondition]:
         """Update condition status"""
         try:
@@ -97,11 +124,11 @@ class MedicalHistoryRepository(BaseRepository[MedicalCondition]):
             if condition:
                 condition.status = status
                 condition.updated_at = datetime.utcnow()
-                self.db.commit()
-                logger.info(f"Updated condition {condition_id} status to {status}")
+                self.session.commit()
+                logger.info("Updated condition %s status to %s", condition_id, status)
                 return condition
             return None
         except Exception as e:
-            logger.error(f"Error updating condition status: {e}")
-            self.db.rollback()
+            logger.error("Error updating condition status: %s", e)
+            self.session.rollback()
             return None
@@ -2,10 +2,11 @@
 Medication Repository - Manages medication data
 """
 
-from datetime import datetime
-from typing import List, Optional
+from datetime import date, datetime
+from typing import Dict, List, Optional, Tuple
 
 from sqlalchemy import and_, desc
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 
 from backend.models.medication import Medication
@@ -20,36 +21,40 @@ class MedicationRepository(BaseRepository[Medication]):
 
     def __init__(self, db: Session):
         super().__init__(Medication, db)
-        self.session = db
 
-    def get_by_user(self, user_id: int, status: Optional[str] = None) -> List[Medication]:
-        """Get all medications for a user"""
+    def get_by_user(
+        self, user_id: int, status: Optional[str] = None, rows: bool = False
+    ) -> List[Medication]:
+        """Get all medications for a user (as read-only column rows if rows is set)"""
         try:
-            query = self.db.query(Medication).filter(Medication.user_id == user_id)
+            query = self._query(rows).filter(Medication.user_id == user_id)
 
             if status:
                 query = query.filter(Medication.status == status)
 
             medications = query.order_by(desc(Medication.created_at)).all()
-            logger.info(f"Retrieved {len(medications)} medications for user {user_id}")
+            logger.debug("Retrieved %s medications for user %s", len(medications), user_id)
             return medications
 
+        except SQLAlchemyError:
+            # An unreachable database must not look like an empty history
+            raise
         except Exception as e:
-            logger.error(f"Error retrieving medications for user {user_id}: {e}")
+            logger.error("Error retrieving medications for user %s: %s", user_id, e)
             return []
 
-    def get_active_medications(self, user_id: int) -> List[Medication]:
-        """Get only active medications"""
+    def get_active_medications(self, user_id: int, rows: bool = False) -> List[Medication]:
+        """Get only active medications (as read-only column rows if rows is set)"""
         try:
             medications = (
-                self.db.query(Medication)
+                self._query(rows)
                 .filter(and_(Medication.user_id == user_id, Medication.status == "active"))
                 .order_by(desc(Medication.start_date))
                 .all()
             )
             return medications
         except Exception as e:
-            logger.error(f"Error retrieving active medications for user {user_id}: {e}")
+            logger.error("Error retrieving active medications for user %s: %s", user_id, e)
             return []
 
     def add_medication(
@@ -65,7 +70,7 @@ class MedicationRepository(BaseRepository[Medication]):
     ) -> Optional[Medication]:
         """Add a new medication"""
         try:
-            medication = Medication(
+            return self.create(
                 user_id=user_id,
                 medication_name=medication_name,
                 dosage=dosage,
@@ -76,26 +81,44 @@ class MedicationRepository(BaseRepository[Medication]):
                 reason=reason,
                 prescribing_doctor=prescribing_doctor,
             )
-            return self.create(medication)
         except Exception as e:
-            logger.error(f"Error adding medication: {e}")
+            logger.error("Error adding medication: %s", e)
             return None
 
+    def bulk_add_medications(
+        self, user_id: int, items: List[Dict], best_effort: bool = False
+    ) -> Tuple[List[Medication], List[int]]:
+        """
+        Add many active medications in one INSERT
+
+        Args:
+            user_id: User ID
+            items: Medication fields, one dict per medication
+            best_effort: Skip rows the database rejects instead of failing the batch
+
+        Returns:
+            Tuple of (created medications, indexes of rows that failed)
+        """
+        rows = [{**item, "user_id": user_id, "status": "active"} for item in items]
+        if best_effort:
+            return self.bulk_create_best_effort(rows)
+        return self.bulk_create(rows), []
+
     def discontinue_medication(
-        self, medication_id: int, end_date: Optional[datetime] = None
+        self, medication_id: int, user_id: int, end_date: Optional[date] = None
     ) -> Optional[Medication]:
-        """Mark medication as discontinued"""
+        """Mark one of the user's medications as discontinued"""
         try:
             medication = self.get_by_id(medication_id)
-            if medication:
+            if medication and medication.user_id == user_id:
                 medication.status = "discontinued"
-                medication.end_date = end_date or datetime.utcnow()
+                medication.end_date = end_date or datetime.utcnow().date()
                 medication.updated_at = datetime.utcnow()
-                self.db.commit()
-                logger.info(f"Discontinued medication {medication_id}")
+                self.session.commit()
+                logger.info("Discontinued medication %s", medication_id)
                 return medication
             return None
         except Exception as e:
-            logger.error(f"Error discontinuing medication: {e}")
-            self.db.rollback()
+            logger.error("Error discontinuing medication: %s", e)
+            self.session.rollback()
             return None
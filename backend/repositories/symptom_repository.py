@@ -3,9 +3,10 @@ Symptom Repository - Manages symptom log data
 """
 
 from datetime import datetime, timedelta
-from typing import List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 
-from sqlalchemy import desc
+from sqlalchemy import Row, desc, select, text
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 
 from backend.models.symptom_log import SymptomLog
@@ -20,13 +21,14 @@ class SymptomRepository(BaseRepository[SymptomLog]):
 
     def __init__(self, db: Session):
         super().__init__(SymptomLog, db)
-        self.session = db
 
-    def get_by_user(self, user_id: int, limit: Optional[int] = None) -> List[SymptomLog]:
-        """Get symptom logs for a user"""
+    def get_by_user(
+        self, user_id: int, limit: Optional[int] = None, rows: bool = False
+    ) -> List[SymptomLog]:
+        """Get symptom logs for a user (as read-only column rows if rows is set)"""
         try:
             query = (
-                self.db.query(SymptomLog)
+                self._query(rows)
                 .filter(SymptomLog.user_id == user_id)
                 .order_by(desc(SymptomLog.logged_at))
             )
@@ -35,28 +37,59 @@ class SymptomRepository(BaseRepository[SymptomLog]):
                 query = query.limit(limit)
 
             symptoms = query.all()
-            logger.info(f"Retrieved {len(symptoms)} symptom logs for user {user_id}")
+            logger.debug("Retrieved %s symptom logs for user %s", len(symptoms), user_id)
             return symptoms
 
+        except SQLAlchemyError:
+            # An unreachable database must not look like an empty history
+            raise
         except Exception as e:
-            logger.error(f"Error retrieving symptom logs for user {user_id}: {e}")
+            logger.error("Error retrieving symptom logs for user %s: %s", user_id, e)
             return []
 
-    def get_recent_symptoms(self, user_id: int, days: int = 30) -> List[SymptomLog]:
-        """Get symptoms from last N days"""
+    def get_recent_symptoms(
+        self, user_id: int, days: int = 30, rows: bool = False
+    ) -> List[SymptomLog]:
+        """Get symptoms from last N days (as read-only column rows if rows is set)"""
         try:
             cutoff_date = datetime.utcnow() - timedelta(days=days)
             symptoms = (
-                self.db.query(SymptomLog)
+                self._query(rows)
                 .filter(SymptomLog.user_id == user_id, SymptomLog.logged_at >= cutoff_date)
                 .order_by(desc(SymptomLog.logged_at))
                 .all()
             )
             return symptoms
         except Exception as e:
-            logger.error(f"Error retrieving recent symptoms for user {user_id}: {e}")
+            logger.error("Error retrieving recent symptoms for user %s: %s", user_id, e)
             return []
 
+    def iter_recent_symptoms(
+        self, user_id: int, days: int = 30, batch_size: int = 500
+    ) -> Iterator[List[Row]]:
+        """
+        Stream symptoms from the last N days in batches, newest first
+
+        Rows come from a server-side cursor batch_size at a time, so memory
+        stays flat however long the window is.
+
+        Args:
+            user_id: User ID
+            days: Number of days to look back
+            batch_size: Rows fetched per batch
+
+        Yields:
+            Lists of read-only column rows
+        """
+        cutoff_date = datetime.utcnow() - timedelta(days=days)
+        result = self.session.execute(
+            select(*SymptomLog.__table__.columns)
+            .where(SymptomLog.user_id == user_id, SymptomLog.logged_at >= cutoff_date)
+            .order_by(desc(SymptomLog.logged_at))
+            .execution_options(yield_per=batch_size)
+        )
+        yield from result.partitions()
+
     def log_symptom(
         self,
         user_id: int,
@@ -76,7 +109,7 @@ class SymptomRepository(BaseRepository[SymptomLog]):
     ) -> Optional[SymptomLog]:
         """Log a new symptom"""
         try:
-            symptom = SymptomLog(
+            return self.create(
                 user_id=user_id,
                 symptom_description=symptom_description,
                 body_part=body_part,
@@ -92,17 +125,60 @@ class SymptomRepository(BaseRepository[SymptomLog]):
                 impact_on_life=impact_on_life,
                 notes=notes,
             )
-            return self.create(symptom)
         except Exception as e:
-            logger.error(f"Error logging symptom: {e}")
+            logger.error("Error logging symptom: %s", e)
             return None
 
+    def bulk_log_symptoms(
+        self, user_id: int, items: List[Dict], best_effort: bool = False
+    ) -> Tuple[List[SymptomLog], List[int]]:
+        """
+        Log many symptoms in one INSERT (offline sync / imports)
+
+        On PostgreSQL the transaction skips waiting for the WAL flush; a crash
+        right after commit can lose the batch, which the client simply resends.
+
+        Args:
+            user_id: User ID
+            items: Symptom fields, one dict per symptom
+            best_effort: Skip rows the database rejects instead of failing the batch
+
+        Returns:
+            Tuple of (logged symptoms, indexes of rows that failed)
+        """
+        if self.session.get_bind().dialect.name == "postgresql":
+            self.session.execute(text("SET LOCAL synchronous_commit = off"))
+
+        # A batch is capped at MAX_BULK_ITEMS, which fits one multi-row
+        # INSERT ... RETURNING. COPY would only pay off for far larger loads
+        # and cannot hand back the generated ids the endpoint returns
+        rows = [{**item, "user_id": user_id} for item in items]
+        if best_effort:
+            return self.bulk_create_best_effort(rows)
+        return self.bulk_create(rows), []
+
+    def delete_older_than(self, cutoff: datetime) -> int:
+        """Delete symptom logs logged before a cutoff, for every user (retention)"""
+        try:
+            count = (
+                self.session.query(SymptomLog)
+                .filter(SymptomLog.logged_at < cutoff)
+                .delete(synchronize_session=False)
+            )
+            self.session.commit()
+            logger.info("Deleted %s symptom logs older than %s", count, cutoff)
+            return count
+        except Exception as e:
+            self.session.rollback()
+            logger.error("Error deleting expired symptom logs: %s", e)
+            raise
+
     def get_symptom_patterns(
         self, user_id: int, body_part: Optional[str] = None
     ) -> List[SymptomLog]:
         """Get symptom patterns for analysis"""
         try:
-            query = self.db.query(SymptomLog).filter(SymptomLog.user_id == user_id)
+            query = self._query().filter(SymptomLog.user_id == user_id)
 
             if body_part:
                 query = query.filter(SymptomLog.body_part.ilike(f"%{body_part}%"))
@@ -110,5 +186,5 @@ class SymptomRepository(BaseRepository[SymptomLog]):
             symptoms = query.order_by(desc(SymptomLog.logged_at)).limit(50).all()
             return symptoms
         except Exception as e:
-            logger.error(f"Error retrieving symptom patterns: {e}")
+            logger.error("Error retrieving symptom patterns: %s", e)
             return []
@@ -35,52 +35,46 @@ class TreatmentRepository(BaseRepository[TreatmentPlan]):
         Returns:
             Created TreatmentPlan instance
         """
-        try:
-            plan = TreatmentPlan(
-                user_id=user_id, title=title, condition=condition, plan_details=plan_details
-            )
-            self.session.add(plan)
-            self.session.commit()
-            self.session.refresh(plan)
-
-            logger.info(f"Created treatment plan for user_id={user_id}, condition={condition}")
-            return plan
-
-        except Exception as e:
-            self.session.rollback()
-            logger.error(f"Error creating treatment plan: {str(e)}")
-            raise
+        plan = self.create(
+            user_id=user_id, title=title, condition=condition, plan_details=plan_details
+        )
+        logger.info("Created treatment plan for user_id=%s, condition=%s", user_id, condition)
+        return plan
 
-    def get_user_plans(self, user_id: int) -> List[TreatmentPlan]:
+    def get_user_plans(self, user_id: int, rows: bool = False) -> List[TreatmentPlan]:
         """
         Get all treatment plans for a user.
 
         Args:
             user_id: User ID
+            rows: Return read-only column rows instead of model instances
 
         Returns:
             List of TreatmentPlan instances, ordered by created_at descending
         """
         return (
-            self.session.query(TreatmentPlan)
+            self._query(rows)
             .filter(TreatmentPlan.user_id == user_id)
             .order_by(desc(TreatmentPlan.created_at))
             .all()
         )
 
-    def get_plans_by_condition(self, user_id: int, condition: str) -> List[TreatmentPlan]:
+    def get_plans_by_condition(
+        self, user_id: int, condition: str, rows: bool = False
+    ) -> List[TreatmentPlan]:
         """
         Get treatment plans for a specific condition.
 
         Args:
             user_id: User ID
             condition: Medical condition
+            rows: Return read-only column rows instead of model instances
 
         Returns:
             List of TreatmentPlan instances
         """
         return (
-            self.session.query(TreatmentPlan)
+            self._query(rows)
             .filter(
                 TreatmentPlan.user_id == user_id, TreatmentPlan.condition.ilike(f"%{condition}%")
             )
@@ -100,21 +94,19 @@ class TreatmentRepository(BaseRepository[TreatmentPlan]):
             True if deleted, False if not found or not owned by user
         """
         try:
-            plan = (
+            # One DELETE; the affected row count doubles as the existence check
+            deleted = (
                 self.session.query(TreatmentPlan)
                 .filter(TreatmentPlan.id == plan_id, TreatmentPlan.user_id == user_id)
-                .first()
+                .delete()
             )
+            self.session.commit()
 
-            if plan:
-                self.session.delete(plan)
-                self.session.commit()
-                logger.info(f"Deleted treatment plan id={plan_id}")
-                return True
-
-            return False
+            if deleted:
+                logger.info("Deleted treatment plan id=%s", plan_id)
+            return bool(deleted)
 
         except Exception as e:
             self.session.rollback()
-            logger.error(f"Error deleting treatment plan: {str(e)}")
+            logger.error("Error deleting treatment plan: %s", e)
             raise
@@ -64,12 +64,12 @@ class UserRepository(BaseRepository[User]):
             self.session.commit()
             self.session.refresh(user)
 
-            logger.info(f"Created user: {username}")
+            logger.info("Created user: %s", username)
             return user
 
         except Exception as e:
             self.session.rollback()
-            logger.error(f"Error creating user {username}: {str(e)}")
+            logger.error("Error creating user %s: %s", username, e)
             raise
 
     def authenticate(self, username: str, password: str) -> Optional[User]:
@@ -85,12 +85,32 @@ class UserRepository(BaseRepository[User]):
         """
         user = self.get_by_username(username)
         if user and user.check_password(password):
-            logger.info(f"User authenticated: {username}")
+            if user.password_needs_rehash():
+                self._upgrade_password_hash(user, password)
+            logger.info("User authenticated: %s", username)
             return user
 
-        logger.warning(f"Authentication failed for username: {username}")
+        logger.warning("Authentication failed for username: %s", username)
         return None
 
+    def _upgrade_password_hash(self, user: User, password: str) -> None:
+        """
+        Rehash a verified password with the current settings.
+
+        A failed upgrade is logged and leaves the old hash, which still verifies.
+
+        Args:
+            user: Authenticated user
+            password: Plain text password that just matched
+        """
+        try:
+            user.set_password(password)
+            self.session.commit()
+            logger.info("Upgraded password hash for user: %s", user.username)
+        except Exception as e:
+            self.session.rollback()
+            logger.error("Error upgrading password hash for %s: %s", user.username, e)
+
     def username_exists(self, username: str) -> bool:
         """
         Check if username exists.
@@ -2,11 +2,13 @@
 Chat service for managing AI conversations.
 """
 
-from typing import Dict, List
+import asyncio
+from typing import AsyncIterator, Dict, List, Optional
 
 from sqlalchemy.orm import Session
 
 from ai_client import get_ai_client
+from backend.ai.safety_checker import EMERGENCY_RESPONSE, MedicalSafetyChecker
 from backend.repositories.chat_repository import ChatRepository
 from backend.utils.logger import get_logger
 from validation import InputValidator
@@ -27,8 +29,27 @@ class ChatService:
         self.session = session
         self.chat_repo = ChatRepository(session)
         self.ai_client = get_ai_client()
+        self.safety_checker = MedicalSafetyChecker()
 
-    def send_message(self, user_id: int, message: str) -> Dict:
+    def _emergency_response(self, user_id: int, text: str) -> Optional[str]:
+        """
+        Screen user input for emergency symptoms before any AI call.
+
+        Args:
+            user_id: User ID
+            text: User's message or symptom description
+
+        Returns:
+            The canned emergency reply if an emergency keyword matched, else None
+        """
+        keyword = self.safety_checker.find_emergency_keyword(text)
+        if keyword is None:
+            return None
+
+        logger.warning(f"Emergency response for user_id={user_id}, matched keyword: {keyword}")
+        return EMERGENCY_RESPONSE
+
+    async def send_message(self, user_id: int, message: str) -> Dict:
         """
         Send a message and get AI response.
 
@@ -47,15 +68,16 @@ class ChatService:
             # Validate message
             message = InputValidator.validate_message(message)
 
-            # Get AI response
-            if self.ai_client:
-                response = self.ai_client.chat_with_patient(message)
-            else:
+            # Emergencies get the canned reply without an AI round-trip
+            response = self._emergency_response(user_id, message)
+            if response is None and self.ai_client:
+                response = await self.ai_client.chat_with_patient(message)
+            elif response is None:
                 response = "I'm currently unavailable. Please try again later."
                 logger.warning("AI client not available")
 
-            # Save to database
-            chat = self.chat_repo.add_message(user_id, message, response)
+            # Save to database; the commit blocks, so it runs off the event loop
+            chat = await asyncio.to_thread(self.chat_repo.add_message, user_id, message, response)
 
             logger.info(f"Message processed for user_id={user_id}")
 
@@ -70,18 +92,125 @@ class ChatService:
             logger.error(f"Error processing message: {str(e)}")
             raise
 
-    def get_chat_history(self, user_id: int, limit: int = 50) -> List[Dict]:
+    def stream_message(self, user_id: int, message: str) -> AsyncIterator[Dict]:
+        """
+        Send a message and stream the AI response.
+
+        The message is validated before streaming starts so that invalid input
+        still fails as a normal error response.
+
+        Args:
+            user_id: User ID
+            message: User's message
+
+        Returns:
+            Async iterator of {"delta": text} events, followed by a final event
+            with the saved chat's id, message, response and timestamp
+
+        Raises:
+            ValidationError: If message validation fails
+        """
+        message = InputValidator.validate_message(message)
+        return self._stream_and_save(user_id, message)
+
+    async def _stream_and_save(self, user_id: int, message: str) -> AsyncIterator[Dict]:
+        """Stream AI response deltas, then save the full exchange"""
+        parts = []
+        emergency = self._emergency_response(user_id, message)
+
+        if emergency is not None:
+            parts.append(emergency)
+            yield {"delta": emergency}
+        elif self.ai_client:
+            async for delta in self.ai_client.stream_chat_with_patient(message):
+                parts.append(delta)
+                yield {"delta": delta}
+        else:
+            unavailable = "I'm currently unavailable. Please try again later."
+            logger.warning("AI client not available")
+            parts.append(unavailable)
+            yield {"delta": unavailable}
+
+        chat = await asyncio.to_thread(self.chat_repo.add_message, user_id, message, "".join(parts))
+
+        logger.info(f"Streamed message processed for user_id={user_id}")
+
+        yield {
+            "done": True,
+            "id": chat.id,
+            "message": chat.message,
+            "response": chat.response,
+            "timestamp": chat.timestamp,
+        }
+
+    async def send_messages(self, user_id: int, messages: List[str]) -> List[Dict]:
+        """
+        Send several messages and get AI responses concurrently.
+
+        Args:
+            user_id: User ID
+            messages: User's messages
+
+        Returns:
+            List of dictionaries with message and response, in input order
+
+        Raises:
+            ValidationError: If any message fails validation
+        """
+        try:
+            messages = [InputValidator.validate_message(message) for message in messages]
+
+            # Emergencies are answered up front; only the rest go to the AI model
+            responses = [self._emergency_response(user_id, message) for message in messages]
+            pending = [i for i, response in enumerate(responses) if response is None]
+
+            if pending and self.ai_client:
+                answers = await self.ai_client.batch_chat_with_patient(
+                    [messages[i] for i in pending]
+                )
+                for i, answer in zip(pending, answers):
+                    responses[i] = answer
+            elif pending:
+                for i in pending:
+                    responses[i] = "I'm currently unavailable. Please try again later."
+                logger.warning("AI client not available")
+
+            chats = await asyncio.to_thread(
+                self.chat_repo.bulk_add_messages, user_id, list(zip(messages, responses))
+            )
+
+            logger.info(f"Batch of {len(chats)} messages processed for user_id={user_id}")
+
+            return [
+                {
+                    "id": chat.id,
+                    "message": chat.message,
+                    "response": chat.response,
+                    "timestamp": chat.timestamp,
+                }
+                for chat in chats
+            ]
+
+        except Exception as e:
+            logger.error(f"Error processing message batch: {str(e)}")
+            raise
+
+    def get_chat_history(
+        self, user_id: int, limit: int = 50, before_id: Optional[int] = None
+    ) -> List[Dict]:
         """
         Get chat history for a user.
 
         Args:
             user_id: User ID
             limit: Maximum number of messages
+            before_id: Only return messages older than this id (the first id of
+                the previous page, since pages are returned oldest first)
 
         Returns:
             List of chat messages
         """
-        history = self.chat_repo.get_user_history(user_id, limit)
+        history = self.chat_repo.get_user_history(user_id, limit, before_id, rows=True)
 
         return [
             {
@@ -93,7 +222,7 @@ class ChatService:
             for chat in reversed(history)  # Reverse to show oldest first
         ]
 
-    def analyze_symptoms(self, user_id: int, symptoms: str) -> Dict:
+    async def analyze_symptoms(self, user_id: int, symptoms: str) -> Dict:
         """
         Analyze symptoms using AI.
 
@@ -108,15 +237,18 @@ class ChatService:
             # Validate symptoms
             symptoms = InputValidator.validate_symptoms(symptoms)
 
-            # Get AI analysis
-            if self.ai_client:
-                analysis = self.ai_client.analyze_symptoms(symptoms)
-            else:
+            # Get AI analysis, unless the symptoms are an emergency
+            analysis = self._emergency_response(user_id, symptoms)
+            if analysis is None and self.ai_client:
+                analysis = await self.ai_client.analyze_symptoms(symptoms)
+            elif analysis is None:
                 analysis = "AI service is currently unavailable."
                 logger.warning("AI client not available for symptom analysis")
 
             # Save to chat history
-            chat = self.chat_repo.add_message(user_id, f"Symptom Check: {symptoms}", analysis)
+            chat = await asyncio.to_thread(
+                self.chat_repo.add_message, user_id, f"Symptom Check: {symptoms}", analysis
+            )
 
             logger.info(f"Symptoms analyzed for user_id={user_id}")
 
@@ -131,7 +263,9 @@ class ChatService:
             logger.error(f"Error analyzing symptoms: {str(e)}")
             raise
 
-    def generate_treatment_plan(self, user_id: int, condition: str, patient_info: Dict) -> str:
+    async def generate_treatment_plan(
+        self, user_id: int, condition: str, patient_info: Dict
+    ) -> str:
         """
         Generate treatment plan using AI.
 
@@ -149,7 +283,7 @@ class ChatService:
 
             # Get AI treatment plan
             if self.ai_client:
-                plan = self.ai_client.generate_treatment_plan(condition, patient_info)
+                plan = await self.ai_client.generate_treatment_plan(condition, patient_info)
             else:
                 plan = "AI service is currently unavailable."
                 logger.warning("AI client not available for treatment plan")
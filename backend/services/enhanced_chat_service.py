@@ -2,13 +2,19 @@
 Enhanced Chat Service - Intelligent, context-aware medical AI chat
 """
 
-from typing import Dict, List, Optional
+import asyncio
+from typing import Dict
 
 from sqlalchemy.orm import Session
 
 from ai_client import get_ai_client
 from backend.ai.prompt_builder import MedicalPromptBuilder
-from backend.ai.safety_checker import MedicalSafetyChecker, SafetyWarningGenerator
+from backend.ai.safety_checker import (
+    EMERGENCY_RESPONSE,
+    MedicalSafetyChecker,
+    SafetyWarningGenerator,
+)
+from backend.ai.types import PatientContext
 from backend.repositories.chat_repository import ChatRepository
 from backend.services.medical_context_service import MedicalContextService
 from backend.utils.logger import get_logger
@@ -19,6 +25,9 @@ logger = get_logger(__name__)
 class EnhancedChatService:
     """
     Context-aware chat service with advanced medical AI
+
+    The database work (context reads and saving the exchange) is synchronous,
+    so the async methods run it in a worker thread instead of the event loop.
     """
 
     def __init__(self, db: Session):
@@ -30,7 +39,7 @@ class EnhancedChatService:
         self.chat_repo = ChatRepository(db)
         self.ai_client = get_ai_client()
 
-    def send_contextual_message(self, user_id: int, message: str) -> Dict[str, any]:
+    async def send_contextual_message(self, user_id: int, message: str) -> Dict[str, any]:
         """
         Send message with full patient context for intelligent response
 
@@ -48,20 +57,31 @@ class EnhancedChatService:
             }
         """
         try:
-            # 1. Check for emergency symptoms in user message
-            has_emergency = self.safety_checker.detect_emergency_symptoms(message)
-            if has_emergency:
-                return self._handle_emergency_response(user_id, message)
+            # 1. Check for emergency symptoms in user message, before any AI call
+            emergency_keyword = self.safety_checker.find_emergency_keyword(message)
+            if emergency_keyword:
+                return {
+                    "message": message,
+                    "response": await asyncio.to_thread(
+                        self._handle_emergency_response, user_id, message, emergency_keyword
+                    ),
+                    "safety_flags": ["EMERGENCY_DETECTED"],
+                    "has_emergency": True,
+                    "context_used": False,
+                    "severity": "high",
+                }
 
             # 2. Get complete patient context
-            patient_context = self.context_service.get_patient_context(user_id)
+            patient_context = await asyncio.to_thread(
+                self.context_service.get_patient_context, user_id
+            )
             logger.info(f"Retrieved context for user {user_id}")
 
             # 3. Build context-aware system prompt
             system_prompt = self.prompt_builder.build_system_prompt(patient_context)
 
             # 4. Get AI response with context
-            ai_response = self.ai_client.chat_completion(
+            ai_response = await self.ai_client.chat_completion(
                 system_prompt=system_prompt,
                 user_message=message,
                 max_tokens=1500,  # Allow comprehensive responses
@@ -78,7 +98,7 @@ class EnhancedChatService:
             final_response = self.warning_generator.add_general_disclaimer(final_response)
 
             # 8. Save conversation with context
-            self.chat_repo.add_message(user_id=user_id, message=message, response=final_response)
+            await asyncio.to_thread(self.chat_repo.add_message, user_id, message, final_response)
 
             logger.info(f"Sent contextual message for user {user_id}")
 
@@ -99,9 +119,10 @@ class EnhancedChatService:
                 "safety_flags": ["Error occurred"],
                 "has_emergency": False,
                 "context_used": False,
+                "severity": "low",
             }
 
-    def analyze_symptoms_with_context(self, user_id: int, symptoms: str) -> Dict[str, any]:
+    async def analyze_symptoms_with_context(self, user_id: int, symptoms: str) -> Dict[str, any]:
         """
         Comprehensive symptom analysis with patient history
 
@@ -113,21 +134,31 @@ class EnhancedChatService:
             Detailed symptom analysis with recommendations
         """
         try:
-            # Check for emergency symptoms
-            if self.safety_checker.detect_emergency_symptoms(symptoms):
-                return self._handle_emergency_response(user_id, symptoms)
+            # Check for emergency symptoms, before any AI call
+            emergency_keyword = self.safety_checker.find_emergency_keyword(symptoms)
+            if emergency_keyword:
+                return {
+                    "symptoms": symptoms,
+                    "analysis": await asyncio.to_thread(
+                        self._handle_emergency_response, user_id, symptoms, emergency_keyword
+                    ),
+                    "safety_flags": ["EMERGENCY_DETECTED"],
+                    "has_emergency": True,
+                }
 
             # Get patient context
-            patient_context = self.context_service.get_patient_context(user_id)
+            patient_context = await asyncio.to_thread(
+                self.context_service.get_patient_context, user_id
+            )
 
-            # Build symptom analysis prompt
-            analysis_prompt = self.prompt_builder.build_symptom_analysis_prompt(
+            # Build symptom analysis prompt; its static instructions join the system blocks
+            instructions, analysis_prompt = self.prompt_builder.build_symptom_analysis_prompt(
                 symptoms, patient_context
             )
 
             # Get comprehensive analysis
-            system_prompt = self.prompt_builder.build_system_prompt(patient_context)
-            ai_analysis = self.ai_client.chat_completion(
+            system_prompt = self.prompt_builder.build_system_prompt(patient_context, instructions)
+            ai_analysis = await self.ai_client.chat_completion(
                 system_prompt=system_prompt,
                 user_message=analysis_prompt,
                 max_tokens=2000,  # Longer for detailed analysis
@@ -142,10 +173,11 @@ class EnhancedChatService:
             final_analysis = self.warning_generator.add_general_disclaimer(final_analysis)
 
             # Save to chat history
-            self.chat_repo.add_message(
-                user_id=user_id,
-                message=f"Symptom Analysis: {symptoms}",
-                response=final_analysis,
+            await asyncio.to_thread(
+                self.chat_repo.add_message,
+                user_id,
+                f"Symptom Analysis: {symptoms}",
+                final_analysis,
             )
 
             return {
@@ -164,7 +196,9 @@ class EnhancedChatService:
                 "has_emergency": False,
             }
 
-    def generate_treatment_plan_with_context(self, user_id: int, condition: str) -> Dict[str, any]:
+    async def generate_treatment_plan_with_context(
+        self, user_id: int, condition: str
+    ) -> Dict[str, any]:
         """
         Generate personalized treatment plan with patient context
 
@@ -177,16 +211,18 @@ class EnhancedChatService:
         """
         try:
             # Get patient context
-            patient_context = self.context_service.get_patient_context(user_id)
+            patient_context = await asyncio.to_thread(
+                self.context_service.get_patient_context, user_id
+            )
 
-            # Build treatment plan prompt
-            plan_prompt = self.prompt_builder.build_treatment_plan_prompt(
+            # Build treatment plan prompt; its static instructions join the system blocks
+            instructions, plan_prompt = self.prompt_builder.build_treatment_plan_prompt(
                 condition, patient_context
             )
 
             # Get comprehensive plan
-            system_prompt = self.prompt_builder.build_system_prompt(patient_context)
-            ai_plan = self.ai_client.chat_completion(
+            system_prompt = self.prompt_builder.build_system_prompt(patient_context, instructions)
+            ai_plan = await self.ai_client.chat_completion(
                 system_prompt=system_prompt,
                 user_message=plan_prompt,
                 max_tokens=2500,  # Very comprehensive
@@ -204,10 +240,11 @@ class EnhancedChatService:
             final_plan = self.warning_generator.add_general_disclaimer(final_plan)
 
             # Save to chat history
-            self.chat_repo.add_message(
-                user_id=user_id,
-                message=f"Treatment Plan Request: {condition}",
-                response=final_plan,
+            await asyncio.to_thread(
+                self.chat_repo.add_message,
+                user_id,
+                f"Treatment Plan Request: {condition}",
+                final_plan,
             )
 
             return {
@@ -226,42 +263,27 @@ class EnhancedChatService:
                 "personalized": False,
             }
 
-    def _handle_emergency_response(self, user_id: int, message: str) -> Dict:
-        """Handle emergency symptom detection"""
-        emergency_response = """
-🚨 **EMERGENCY - SEEK IMMEDIATE MEDICAL ATTENTION** 🚨
-
-Your symptoms may indicate a medical emergency. Please:
-
-1. **Call emergency services (911) immediately** or go to the nearest emergency room
-2. Do NOT wait or try to treat this at home
-3. If alone, call someone to be with you or unlock your door for emergency responders
-
-**While waiting for help:**
-- Stay calm
-- Sit or lie down in a comfortable position
-- Do not eat or drink anything
-- Have your medication list ready if possible
+    def _handle_emergency_response(self, user_id: int, message: str, keyword: str) -> str:
+        """
+        Record an emergency short-circuit and return the canned emergency response
 
-**This is NOT the time for online medical advice. Get professional help NOW.**
+        Args:
+            user_id: User ID
+            message: User's message
+            keyword: Emergency keyword that matched
 
----
-*If this is not an emergency, please rephrase your question and I'll be happy to help.*
+        Returns:
+            Emergency response text
         """
+        logger.warning(f"Emergency response for user {user_id}, matched keyword: {keyword}")
 
         # Save emergency detection
-        self.chat_repo.add_message(user_id=user_id, message=message, response=emergency_response)
+        self.chat_repo.add_message(user_id=user_id, message=message, response=EMERGENCY_RESPONSE)
 
-        return {
-            "message": message,
-            "response": emergency_response,
-            "safety_flags": ["EMERGENCY_DETECTED"],
-            "has_emergency": True,
-            "context_used": False,
-        }
+        return EMERGENCY_RESPONSE
 
     def _add_safety_warnings(
-        self, response: str, safety_result: Dict, patient_context: Dict
+        self, response: str, safety_result: Dict, patient_context: PatientContext
     ) -> str:
         """Add appropriate safety warnings to response"""
         warnings_added = response
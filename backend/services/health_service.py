@@ -2,8 +2,10 @@
 Health service for managing health metrics.
 """
 
-from typing import Dict, List, Optional
+from datetime import date, datetime, time, timedelta
+from typing import Dict, List, Optional, Tuple
 
+import numpy as np
 from sqlalchemy.orm import Session
 
 from backend.repositories.health_repository import HealthRepository
@@ -73,6 +75,58 @@ class HealthService:
             logger.error(f"Error recording metric: {str(e)}")
             raise
 
+    def record_metrics(self, user_id: int, items: List[Dict]) -> List[Dict]:
+        """
+        Record many health metrics in one batch.
+
+        Every item is validated before anything is saved, so the batch is
+        stored whole or not at all.
+
+        Args:
+            user_id: User ID
+            items: Dicts with metric_type, value, unit and optional notes
+
+        Returns:
+            List of dictionaries with metric information, in input order
+
+        Raises:
+            ValidationError: If any item fails validation
+        """
+        try:
+            rows = []
+            for item in items:
+                notes = item.get("notes")
+                rows.append(
+                    {
+                        "metric_type": item["metric_type"],
+                        "value": InputValidator.validate_metric_value(
+                            item["value"], item["metric_type"]
+                        ),
+                        "unit": item["unit"],
+                        "notes": InputValidator.validate_notes(notes) if notes else notes,
+                    }
+                )
+
+            metrics = self.health_repo.bulk_add_metrics(user_id, rows)
+
+            logger.info(f"Recorded {len(metrics)} metrics for user_id={user_id}")
+
+            return [
+                {
+                    "id": metric.id,
+                    "metric_type": metric.metric_type,
+                    "value": metric.value,
+                    "unit": metric.unit,
+                    "notes": metric.notes,
+                    "recorded_at": metric.recorded_at,
+                }
+                for metric in metrics
+            ]
+
+        except Exception as e:
+            logger.error(f"Error recording metrics: {str(e)}")
+            raise
+
     def get_metrics(
         self, user_id: int, metric_type: Optional[str] = None, limit: int = 100
     ) -> List[Dict]:
@@ -87,7 +141,7 @@ class HealthService:
         Returns:
             List of metrics
         """
-        metrics = self.health_repo.get_user_metrics(user_id, metric_type, limit)
+        metrics = self.health_repo.get_user_metrics(user_id, metric_type, limit, rows=True)
 
         return [
             {
@@ -112,21 +166,106 @@ class HealthService:
         Returns:
             Dictionary with statistics or None if no data
         """
-        metrics = self.health_repo.get_user_metrics(user_id, metric_type)
+        series = self.get_metric_series(user_id, metric_type)
 
-        if not metrics:
+        if series is None:
             return None
 
-        values = [m.value for m in metrics]
+        return self.series_statistics(metric_type, series)
 
+    @staticmethod
+    def series_statistics(metric_type: str, series: Dict[str, np.ndarray]) -> Dict:
+        """
+        Summary statistics for a series from get_metric_series.
+
+        Args:
+            metric_type: Type of metric
+            series: Column arrays, oldest first
+
+        Returns:
+            Dictionary with statistics
+        """
+        values = series["value"]
         return {
             "metric_type": metric_type,
-            "count": len(values),
-            "latest": values[0],  # First is most recent
-            "average": sum(values) / len(values),
-            "minimum": min(values),
-            "maximum": max(values),
-            "unit": metrics[0].unit,
+            "count": int(values.size),
+            "latest": float(values[-1]),  # Series is oldest first
+            "average": float(values.mean()),
+            "minimum": float(values.min()),
+            "maximum": float(values.max()),
+            "unit": series["unit"][-1],
+        }
+
+    def get_daily_summary(
+        self,
+        user_id: int,
+        metric_type: str,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+    ) -> List[Dict]:
+        """
+        Get daily average, minimum, maximum and count for one metric type.
+
+        Args:
+            user_id: User ID
+            metric_type: Type of metric
+            start: Optional first day to include
+            end: Optional last day to include
+
+        Returns:
+            List of per-day summaries, oldest first
+        """
+        since = datetime.combine(start, time.min) if start else None
+        until = datetime.combine(end + timedelta(days=1), time.min) if end else None
+        rows = self.health_repo.get_daily_summary(user_id, metric_type, since, until)
+
+        return [
+            {
+                "day": row.day,
+                "average": float(row.average),
+                "minimum": float(row.minimum),
+                "maximum": float(row.maximum),
+                "count": row.count,
+            }
+            for row in rows
+        ]
+
+    def get_metric_series(
+        self, user_id: int, metric_type: str, limit: int = 100, value_dtype=np.float64
+    ) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Get one metric type as column arrays, oldest first, for charting.
+
+        Columns are read as plain rows and transposed once into arrays, so
+        building a DataFrame or computing statistics never touches a Python
+        object per measurement.
+
+        Args:
+            user_id: User ID
+            metric_type: Type of metric
+            limit: Maximum number of most recent records
+            value_dtype: dtype of the value array; charts can use np.float32, while
+                statistics returned by the API keep full float64 precision
+
+        Returns:
+            Dictionary of recorded_at, value, notes and unit arrays, or None if no data
+        """
+        rows = self.health_repo.get_user_metrics(user_id, metric_type, limit, rows=True)
+
+        if not rows:
+            return None
+
+        # Rows come back newest first; transpose them into columns in one pass
+        rows.reverse()
+        columns = dict(zip(rows[0]._fields, zip(*rows)))
+
+        notes = np.array(columns["notes"], dtype=object)
+        notes[np.equal(notes, None)] = ""
+        return {
+            "recorded_at": np.array(columns["recorded_at"], dtype="datetime64[ns]"),
+            "value": np.array(columns["value"], dtype=value_dtype),
+            "notes": notes,
+            "unit": np.array(columns["unit"], dtype=object),
         }
 
     def get_latest_metric(self, user_id: int, metric_type: str) -> Optional[Dict]:
@@ -154,6 +293,19 @@ class HealthService:
             "recorded_at": metric.recorded_at,
         }
 
+    def get_metric_version(self, user_id: int, metric_type: str) -> Tuple[Optional[int], int]:
+        """
+        Get a version stamp that changes whenever a metric series changes.
+
+        Args:
+            user_id: User ID
+            metric_type: Type of metric
+
+        Returns:
+            Tuple of (newest metric id or None, number of metrics)
+        """
+        return self.health_repo.get_metric_version(user_id, metric_type)
+
     def get_metric_types(self, user_id: int) -> List[str]:
         """
         Get all metric types for a user.
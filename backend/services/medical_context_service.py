@@ -6,6 +6,13 @@ from typing import Dict, List, Optional
 
 from sqlalchemy.orm import Session
 
+from backend.ai.prompt_templates import (
+    FIRST_CONVERSATION,
+    NO_ALLERGIES,
+    NO_MEDICATIONS,
+    NO_RECENT_SYMPTOMS,
+)
+from backend.ai.types import PatientContext
 from backend.models.user import User
 from backend.repositories.allergy_repository import AllergyRepository
 from backend.repositories.chat_repository import ChatRepository
@@ -30,7 +37,7 @@ class MedicalContextService:
         self.symptom_repo = SymptomRepository(db)
         self.chat_repo = ChatRepository(db)
 
-    def get_patient_context(self, user_id: int) -> Dict:
+    def get_patient_context(self, user_id: int) -> PatientContext:
         """
         Compile complete patient context for AI
 
@@ -38,36 +45,32 @@ class MedicalContextService:
             user_id: User ID
 
         Returns:
-            Dictionary with complete patient context:
-            {
-                'age': int,
-                'gender': str,
-                'medical_history': [list of conditions],
-                'current_medications': [list of medications],
-                'allergies': [list of allergies],
-                'recent_symptoms': [list of symptoms],
-                'conversation_context': [recent conversations]
-            }
+            PatientContext with age, gender, medical history, current
+            medications, allergies, recent symptoms and recent conversations
         """
         try:
-            # Get user basic info
-            user = self.db.query(User).filter(User.id == user_id).first()
+            # Get user basic info; only the profile columns, no User instance
+            user = (
+                self.db.query(User.age, User.gender, User.full_name)
+                .filter(User.id == user_id)
+                .first()
+            )
             if not user:
                 logger.error(f"User {user_id} not found")
                 return self._empty_context()
 
             # Gather all medical data
-            context = {
-                "user_id": user_id,
-                "age": user.age,
-                "gender": user.gender,
-                "full_name": user.full_name,
-                "medical_history": self._get_medical_history_list(user_id),
-                "current_medications": self._get_current_medications_list(user_id),
-                "allergies": self._get_allergies_list(user_id),
-                "recent_symptoms": self._get_recent_symptoms_list(user_id),
-                "conversation_context": self._get_conversation_context_list(user_id),
-            }
+            context = PatientContext(
+                user_id=user_id,
+                age=user.age,
+                gender=user.gender,
+                full_name=user.full_name,
+                medical_history=tuple(self._get_medical_history_list(user_id)),
+                current_medications=tuple(self._get_current_medications_list(user_id)),
+                allergies=tuple(self._get_allergies_list(user_id)),
+                recent_symptoms=tuple(self._get_recent_symptoms_list(user_id)),
+                conversation_context=tuple(self._get_conversation_context_list(user_id)),
+            )
 
             logger.info(f"Compiled complete context for user {user_id}")
             return context
@@ -83,7 +86,7 @@ class MedicalContextService:
         Returns:
             Formatted string of medical conditions
         """
-        conditions = self.medical_history_repo.get_active_conditions(user_id)
+        conditions = self.medical_history_repo.get_active_conditions(user_id, rows=True)
 
         if not conditions:
             return "No significant active medical conditions reported"
@@ -103,10 +106,10 @@ class MedicalContextService:
         Returns:
             Formatted string of active medications
         """
-        medications = self.medication_repo.get_active_medications(user_id)
+        medications = self.medication_repo.get_active_medications(user_id, rows=True)
 
         if not medications:
-            return "No current medications reported"
+            return NO_MEDICATIONS
 
         summary_lines = []
         for med in medications:
@@ -123,10 +126,10 @@ class MedicalContextService:
         Returns:
             Formatted string of allergies
         """
-        allergies = self.allergy_repo.get_by_user(user_id)
+        allergies = self.allergy_repo.get_by_user(user_id, rows=True)
 
         if not allergies:
-            return "No known allergies"
+            return NO_ALLERGIES
 
         summary_lines = []
         for allergy in allergies:
@@ -147,10 +150,10 @@ class MedicalContextService:
         Returns:
             Formatted string of recent symptoms
         """
-        symptoms = self.symptom_repo.get_recent_symptoms(user_id, days)
+        symptoms = self.symptom_repo.get_recent_symptoms(user_id, days, rows=True)
 
         if not symptoms:
-            return "No recent symptoms logged"
+            return NO_RECENT_SYMPTOMS
 
         summary_lines = []
         for symptom in symptoms[:5]:  # Last 5 symptoms
@@ -172,10 +175,10 @@ class MedicalContextService:
         Returns:
             Formatted conversation history
         """
-        conversations = self.chat_repo.get_user_history(user_id, limit=limit)
+        conversations = self.chat_repo.get_user_history(user_id, limit=limit, rows=True)
 
         if not conversations:
-            return "First conversation with patient"
+            return FIRST_CONVERSATION
 
         summary_lines = []
         for conv in conversations:
@@ -187,12 +190,12 @@ class MedicalContextService:
 
     def has_critical_allergies(self, user_id: int) -> bool:
         """Check if patient has severe/life-threatening allergies"""
-        severe_allergies = self.allergy_repo.get_severe_allergies(user_id)
+        severe_allergies = self.allergy_repo.get_severe_allergies(user_id, rows=True)
         return len(severe_allergies) > 0
 
     def get_allergy_warnings(self, user_id: int) -> List[str]:
         """Get list of critical allergy warnings"""
-        severe_allergies = self.allergy_repo.get_severe_allergies(user_id)
+        severe_allergies = self.allergy_repo.get_severe_allergies(user_id, rows=True)
         warnings = []
         for allergy in severe_allergies:
             warnings.append(f"⚠️ SEVERE ALLERGY: {allergy.allergen} - {allergy.reaction}")
@@ -200,7 +203,7 @@ class MedicalContextService:
 
     def _get_medical_history_list(self, user_id: int) -> List[Dict]:
         """Get medical history as list of dicts"""
-        conditions = self.medical_history_repo.get_active_conditions(user_id)
+        conditions = self.medical_history_repo.get_active_conditions(user_id, rows=True)
         return [
             {
                 "condition_name": c.condition_name,
@@ -213,7 +216,7 @@ class MedicalContextService:
 
     def _get_current_medications_list(self, user_id: int) -> List[Dict]:
         """Get current medications as list of dicts"""
-        medications = self.medication_repo.get_active_medications(user_id)
+        medications = self.medication_repo.get_active_medications(user_id, rows=True)
         return [
             {
                 "medication_name": m.medication_name,
@@ -226,7 +229,7 @@ class MedicalContextService:
 
     def _get_allergies_list(self, user_id: int) -> List[Dict]:
         """Get allergies as list of dicts"""
-        allergies = self.allergy_repo.get_by_user(user_id)
+        allergies = self.allergy_repo.get_by_user(user_id, rows=True)
         return [
             {
                 "allergen": a.allergen,
@@ -239,7 +242,7 @@ class MedicalContextService:
 
     def _get_recent_symptoms_list(self, user_id: int) -> List[Dict]:
         """Get recent symptoms as list of dicts"""
-        symptoms = self.symptom_repo.get_recent_symptoms(user_id, days=30)
+        symptoms = self.symptom_repo.get_recent_symptoms(user_id, days=30, rows=True)
         return [
             {
                 "symptom_description": s.symptom_description,
@@ -252,7 +255,7 @@ class MedicalContextService:
 
     def _get_conversation_context_list(self, user_id: int) -> List[Dict]:
         """Get conversation context as list of dicts"""
-        conversations = self.chat_repo.get_user_history(user_id, limit=5)
+        conversations = self.chat_repo.get_user_history(user_id, limit=5, rows=True)
         return [
             {
                 "message": c.message,
@@ -262,16 +265,6 @@ class MedicalContextService:
             for c in conversations
         ]
 
-    def _empty_context(self) -> Dict:
+    def _empty_context(self) -> PatientContext:
         """Return empty context structure"""
-        return {
-            "user_id": None,
-            "age": None,
-            "gender": None,
-            "full_name": None,
-            "medical_history": [],
-            "current_medications": [],
-            "allergies": [],
-            "recent_symptoms": [],
-            "conversation_context": [],
-        }
+        return PatientContext()
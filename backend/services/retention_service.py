@@ -0,0 +1,57 @@
+"""
+Retention service for purging expired chat history and symptom logs.
+"""
+
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from backend.repositories.chat_repository import ChatRepository
+from backend.repositories.symptom_repository import SymptomRepository
+from backend.utils.logger import get_logger
+from config import config
+
+logger = get_logger(__name__)
+
+
+class RetentionService:
+    """Service applying the configured retention window to time-series tables"""
+
+    def __init__(self, session: Session):
+        """
+        Initialize retention service.
+
+        Args:
+            session: Database session
+        """
+        self.session = session
+        self.chat_repo = ChatRepository(session)
+        self.symptom_repo = SymptomRepository(session)
+
+    def purge_expired(self, now: Optional[datetime] = None) -> Dict[str, int]:
+        """
+        Delete records older than their table's retention window.
+
+        Tables whose retention is 0 days are left untouched.
+
+        Args:
+            now: Reference time, defaults to the current UTC time
+
+        Returns:
+            Dictionary of deleted record counts by table
+        """
+        now = now or datetime.utcnow()
+        deleted = {}
+
+        if config.CHAT_HISTORY_RETENTION_DAYS > 0:
+            cutoff = now - timedelta(days=config.CHAT_HISTORY_RETENTION_DAYS)
+            deleted["chat_history"] = self.chat_repo.delete_older_than(cutoff)
+
+        if config.SYMPTOM_LOG_RETENTION_DAYS > 0:
+            cutoff = now - timedelta(days=config.SYMPTOM_LOG_RETENTION_DAYS)
+            deleted["symptom_logs"] = self.symptom_repo.delete_older_than(cutoff)
+
+        if deleted:
+            logger.info("Purged expired records: %s", deleted)
+        return deleted
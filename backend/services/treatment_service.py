@@ -51,7 +51,7 @@ class TreatmentService:
                 user_id=user_id, title=title, condition=condition, plan_details=plan_details
             )
 
-            logger.info(f"Created treatment plan for user_id={user_id}")
+            logger.info("Created treatment plan for user_id=%s", user_id)
 
             return {
                 "id": plan.id,
@@ -62,7 +62,7 @@ class TreatmentService:
             }
 
         except Exception as e:
-            logger.error(f"Error creating treatment plan: {str(e)}")
+            logger.error("Error creating treatment plan: %s", e)
             raise
 
     def get_user_plans(self, user_id: int) -> List[Dict]:
@@ -75,7 +75,7 @@ class TreatmentService:
         Returns:
             List of treatment plans
         """
-        plans = self.treatment_repo.get_user_plans(user_id)
+        plans = self.treatment_repo.get_user_plans(user_id, rows=True)
 
         return [
             {
@@ -124,7 +124,7 @@ class TreatmentService:
         Returns:
             List of treatment plans
         """
-        plans = self.treatment_repo.get_plans_by_condition(user_id, condition)
+        plans = self.treatment_repo.get_plans_by_condition(user_id, condition, rows=True)
 
         return [
             {
@@ -151,6 +151,6 @@ class TreatmentService:
         deleted = self.treatment_repo.delete_plan(plan_id, user_id)
 
         if deleted:
-            logger.info(f"Deleted treatment plan id={plan_id} for user_id={user_id}")
+            logger.info("Deleted treatment plan id=%s for user_id=%s", plan_id, user_id)
 
         return deleted
@@ -0,0 +1,84 @@
+"""
+Helpers for calling async code from synchronous contexts (Streamlit).
+"""
+
+import asyncio
+import threading
+from typing import Any, AsyncIterator, Awaitable, Iterator, Optional, TypeVar
+
+T = TypeVar("T")
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def _get_background_loop() -> asyncio.AbstractEventLoop:
+    """
+    Get the process-wide background event loop, starting it on first use.
+
+    A single long-lived loop keeps the shared AsyncOpenAI connection pool bound
+    to one loop instead of a new one per Streamlit rerun.
+
+    Returns:
+        Running event loop on a daemon thread
+    """
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            thread = threading.Thread(
+                target=_loop.run_forever, name="healthai-async-loop", daemon=True
+            )
+            thread.start()
+    return _loop
+
+
+def run_sync(awaitable: Awaitable[Any]) -> Any:
+    """
+    Run an awaitable to completion from synchronous code.
+
+    Args:
+        awaitable: Coroutine to execute
+
+    Returns:
+        Result of the awaitable
+    """
+    future = asyncio.run_coroutine_threadsafe(awaitable, _get_background_loop())
+    return future.result()
+
+
+_END = object()
+
+
+async def _next_item(iterator: AsyncIterator[Any]) -> Any:
+    """Await one item from an async iterator, or _END once it is exhausted"""
+    try:
+        return await iterator.__anext__()
+    except StopAsyncIteration:
+        return _END
+
+
+def iter_sync(iterator: AsyncIterator[T]) -> Iterator[T]:
+    """
+    Iterate an async iterator from synchronous code, one item at a time.
+
+    Each item is handed over as soon as it is produced, so a Streamlit page can
+    render a streamed response while the rest is still being generated.
+
+    Args:
+        iterator: Async iterator to consume, e.g. a streamed AI response
+
+    Yields:
+        Items of the async iterator
+    """
+    loop = _get_background_loop()
+    try:
+        while True:
+            item = asyncio.run_coroutine_threadsafe(_next_item(iterator), loop).result()
+            if item is _END:
+                return
+            yield item
+    finally:
+        aclose = getattr(iterator, "aclose", None)
+        if aclose is not None:
+            asyncio.run_coroutine_threadsafe(aclose(), loop).result()
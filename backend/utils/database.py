@@ -26,19 +26,23 @@ class DatabaseManager:
         self.database_url = database_url or config.DATABASE_URL
 
         # Configure engine based on database type
-        if "sqlite" in self.database_url:
-            # SQLite-specific configuration
+        if "sqlite" in self.database_url and self._is_in_memory(self.database_url):
+            # An in-memory database lives in one connection, so every session shares it
             self.engine = create_engine(
                 self.database_url, connect_args={"check_same_thread": False}, poolclass=StaticPool
             )
         else:
-            # PostgreSQL/MySQL configuration with connection pooling
+            # File SQLite and PostgreSQL/MySQL get a real pool, so concurrent
+            # requests on the threadpool don't share a single connection
+            connect_args = {"check_same_thread": False} if "sqlite" in self.database_url else {}
             self.engine = create_engine(
                 self.database_url,
-                pool_size=10,
-                max_overflow=20,
+                connect_args=connect_args,
+                pool_size=config.DB_POOL_SIZE,
+                max_overflow=config.DB_MAX_OVERFLOW,
+                pool_timeout=config.DB_POOL_TIMEOUT,
                 pool_pre_ping=True,  # Verify connections before using
-                pool_recycle=3600,  # Recycle connections after 1 hour
+                pool_recycle=config.DB_POOL_RECYCLE,  # Recycle stale connections
             )
 
         # Create all tables
@@ -47,6 +51,11 @@ class DatabaseManager:
         # Create session factory
         self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
 
+    @staticmethod
+    def _is_in_memory(database_url: str) -> bool:
+        """Check whether a SQLite URL points at an in-memory database"""
+        return ":memory:" in database_url or database_url.rstrip("/") == "sqlite:"
+
     def get_session(self) -> Session:
         """
         Get a new database session.
@@ -2,9 +2,12 @@
 JWT utility functions for token generation and validation.
 """
 
+import threading
+import time
 from datetime import datetime, timedelta
 from typing import Dict, Optional
 
+from cachetools import TTLCache
 from jose import JWTError, jwt
 
 from backend.utils.logger import get_logger
@@ -12,6 +15,10 @@ from config import config
 
 logger = get_logger(__name__)
 
+# Verified payloads keyed by raw token, so repeat requests skip signature checks
+_verified_tokens: TTLCache = TTLCache(maxsize=config.JWT_CACHE_SIZE, ttl=config.JWT_CACHE_TTL)
+_verified_tokens_lock = threading.Lock()
+
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """
@@ -65,13 +72,23 @@ def verify_token(token: str) -> Optional[Dict]:
     Returns:
         Decoded token payload or None if invalid
     """
+    with _verified_tokens_lock:
+        payload = _verified_tokens.get(token)
+
+    # The token's own expiry still applies to cached payloads
+    if payload is not None and payload.get("exp", 0) > time.time():
+        return dict(payload)
+
     try:
         payload = jwt.decode(token, config.SECRET_KEY, algorithms=[config.JWT_ALGORITHM])
-        return payload
     except JWTError as e:
         logger.warning(f"Token verification failed: {str(e)}")
         return None
 
+    with _verified_tokens_lock:
+        _verified_tokens[token] = payload
+    return dict(payload)
+
 
 def decode_token(token: str) -> Optional[Dict]:
     """
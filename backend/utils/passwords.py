@@ -0,0 +1,67 @@
+"""
+Password hashing with argon2id, verifying legacy bcrypt hashes.
+"""
+
+import bcrypt
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
+
+from config import config
+
+# Shared by every User model, so the API and the Streamlit app hash alike
+_hasher = PasswordHasher(
+    time_cost=config.PASSWORD_TIME_COST,
+    memory_cost=config.PASSWORD_MEMORY_COST,
+    parallelism=config.PASSWORD_PARALLELISM,
+)
+
+# Prefix of hashes written by bcrypt before the switch to argon2id
+_BCRYPT_PREFIX = "$2"
+
+
+def hash_password(password: str) -> str:
+    """
+    Hash a password with argon2id.
+
+    Args:
+        password: Plain text password
+
+    Returns:
+        Encoded hash, including its salt and parameters
+    """
+    return _hasher.hash(password)
+
+
+def verify_password(password_hash: str, password: str) -> bool:
+    """
+    Verify a password against an argon2id or legacy bcrypt hash.
+
+    Args:
+        password_hash: Stored hash
+        password: Plain text password
+
+    Returns:
+        True if the password matches, False otherwise
+    """
+    if password_hash.startswith(_BCRYPT_PREFIX):
+        return bcrypt.checkpw(password.encode("utf-8"), password_hash.encode("utf-8"))
+
+    try:
+        return _hasher.verify(password_hash, password)
+    except (VerificationError, InvalidHashError):
+        return False
+
+
+def needs_rehash(password_hash: str) -> bool:
+    """
+    Check whether a hash should be replaced after a successful login.
+
+    Args:
+        password_hash: Stored hash
+
+    Returns:
+        True for bcrypt hashes and argon2 hashes with outdated parameters
+    """
+    if password_hash.startswith(_BCRYPT_PREFIX):
+        return True
+    return _hasher.check_needs_rehash(password_hash)
@@ -22,14 +22,25 @@ class Config:
 
     # Database Settings
     DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///healthai.db")
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "20"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "40"))
+    DB_POOL_TIMEOUT: int = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "3600"))
 
     # Security Settings
     SECRET_KEY: str = os.getenv("SECRET_KEY", "dev-secret-key-change-in-production")
 
+    # Password Hashing (argon2id; memory cost in KiB)
+    PASSWORD_TIME_COST: int = int(os.getenv("PASSWORD_TIME_COST", "2"))
+    PASSWORD_MEMORY_COST: int = int(os.getenv("PASSWORD_MEMORY_COST", "65536"))
+    PASSWORD_PARALLELISM: int = int(os.getenv("PASSWORD_PARALLELISM", "2"))
+
     # JWT Settings
     JWT_ALGORITHM: str = os.getenv("JWT_ALGORITHM", "HS256")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
     REFRESH_TOKEN_EXPIRE_DAYS: int = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "7"))
+    JWT_CACHE_SIZE: int = int(os.getenv("JWT_CACHE_SIZE", "10000"))
+    JWT_CACHE_TTL: int = int(os.getenv("JWT_CACHE_TTL", "60"))
 
     # OpenRouter API Settings
     OPENROUTER_API_KEY: Optional[str] = os.getenv("OPENROUTER_API_KEY")
@@ -41,8 +52,33 @@ class Config:
     AI_MODEL: str = os.getenv("AI_MODEL", "x-ai/grok-beta")
     AI_MAX_RETRIES: int = int(os.getenv("AI_MAX_RETRIES", "3"))
     AI_RETRY_DELAY: int = int(os.getenv("AI_RETRY_DELAY", "2"))
+    AI_RETRY_MAX_DELAY: int = int(os.getenv("AI_RETRY_MAX_DELAY", "30"))
     AI_TEMPERATURE: float = float(os.getenv("AI_TEMPERATURE", "0.7"))
     AI_MAX_TOKENS: int = int(os.getenv("AI_MAX_TOKENS", "2000"))
+    AI_MAX_CONCURRENCY: int = int(os.getenv("AI_MAX_CONCURRENCY", "5"))
+    AI_GLOBAL_MAX_CONCURRENCY: int = int(os.getenv("AI_GLOBAL_MAX_CONCURRENCY", "20"))
+    AI_TOKENS_PER_MINUTE: int = int(os.getenv("AI_TOKENS_PER_MINUTE", "0"))
+    AI_BULK_BATCH_SIZE: int = int(os.getenv("AI_BULK_BATCH_SIZE", "6"))
+    AI_COALESCE_WINDOW_MS: int = int(os.getenv("AI_COALESCE_WINDOW_MS", "0"))
+    AI_HTTP_MAX_CONNECTIONS: int = int(os.getenv("AI_HTTP_MAX_CONNECTIONS", "100"))
+    AI_HTTP_MAX_KEEPALIVE: int = int(os.getenv("AI_HTTP_MAX_KEEPALIVE", "20"))
+    AI_HTTP2: bool = os.getenv("AI_HTTP2", "True").lower() == "true"
+    AI_HTTP_TIMEOUT: float = float(os.getenv("AI_HTTP_TIMEOUT", "60"))
+    AI_HTTP_CONNECT_TIMEOUT: float = float(os.getenv("AI_HTTP_CONNECT_TIMEOUT", "5"))
+    AI_PROMPT_CACHING: bool = os.getenv("AI_PROMPT_CACHING", "True").lower() == "true"
+
+    # AI Response Cache Settings
+    AI_CACHE_ENABLED: bool = os.getenv("AI_CACHE_ENABLED", "True").lower() == "true"
+    AI_CACHE_TTL: int = int(os.getenv("AI_CACHE_TTL", "1800"))
+    AI_CACHE_MAX_SIZE: int = int(os.getenv("AI_CACHE_MAX_SIZE", "4096"))
+    AI_CACHE_MAX_TEMPERATURE: float = float(os.getenv("AI_CACHE_MAX_TEMPERATURE", "0.3"))
+    AI_SEMANTIC_CACHE_ENABLED: bool = (
+        os.getenv("AI_SEMANTIC_CACHE_ENABLED", "False").lower() == "true"
+    )
+    AI_SEMANTIC_CACHE_MODEL: str = os.getenv(
+        "AI_SEMANTIC_CACHE_MODEL", "sentence-transformers/all-MiniLM-L6-v2"
+    )
+    AI_SEMANTIC_CACHE_THRESHOLD: float = float(os.getenv("AI_SEMANTIC_CACHE_THRESHOLD", "0.85"))
 
     # Logging Settings
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
@@ -54,6 +90,14 @@ class Config:
     API_WORKERS: int = int(os.getenv("API_WORKERS", "4"))
     API_PREFIX: str = "/api/v1"
 
+    # API Read Cache (per-user GET responses; Redis when REDIS_URL is set)
+    API_CACHE_ENABLED: bool = os.getenv("API_CACHE_ENABLED", "True").lower() == "true"
+    API_CACHE_TTL: int = int(os.getenv("API_CACHE_TTL", "10"))
+    API_CACHE_MAX_SIZE: int = int(os.getenv("API_CACHE_MAX_SIZE", "4096"))
+    API_CACHE_STALE_TTL: int = int(os.getenv("API_CACHE_STALE_TTL", "86400"))
+    API_USER_CACHE_TTL: int = int(os.getenv("API_USER_CACHE_TTL", "3600"))
+    REDIS_URL: str = os.getenv("REDIS_URL", "")
+
     # CORS Settings
     ALLOWED_ORIGINS: list = os.getenv(
         "ALLOWED_ORIGINS", "http://localhost:3000,http://localhost:8501"
@@ -62,6 +106,16 @@ class Config:
     # Rate Limiting
     RATE_LIMIT_PER_MINUTE: int = int(os.getenv("RATE_LIMIT_PER_MINUTE", "60"))
 
+    # Data Retention (days; 0 keeps records forever)
+    CHAT_HISTORY_RETENTION_DAYS: int = int(os.getenv("CHAT_HISTORY_RETENTION_DAYS", "0"))
+    SYMPTOM_LOG_RETENTION_DAYS: int = int(os.getenv("SYMPTOM_LOG_RETENTION_DAYS", "0"))
+
+    # Health Check
+    HEALTH_CHECK_CACHE_SECONDS: float = float(os.getenv("HEALTH_CHECK_CACHE_SECONDS", "5"))
+
+    # Streamlit Settings
+    STREAMLIT_GC_GEN0_THRESHOLD: int = int(os.getenv("STREAMLIT_GC_GEN0_THRESHOLD", "50000"))
+
     @classmethod
     def validate(cls) -> None:
         """Validate required configuration"""
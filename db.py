@@ -1,11 +1,25 @@
 import os
+from dataclasses import dataclass
 from datetime import datetime
 
-import bcrypt
-from sqlalchemy import Column, DateTime, Float, ForeignKey, Integer, String, Text, create_engine
+import numpy as np
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Float,
+    ForeignKey,
+    Integer,
+    String,
+    Text,
+    create_engine,
+    func,
+    insert,
+)
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship, sessionmaker
 
+from backend.utils.passwords import hash_password, verify_password
+
 Base = declarative_base()
 
 
@@ -30,12 +44,11 @@ class User(Base):
 
     def set_password(self, password):
         """Hash and set password"""
-        salt = bcrypt.gensalt()
-        self.password_hash = bcrypt.hashpw(password.encode("utf-8"), salt).decode("utf-8")
+        self.password_hash = hash_password(password)
 
     def check_password(self, password):
         """Verify password"""
-        return bcrypt.checkpw(password.encode("utf-8"), self.password_hash.encode("utf-8"))
+        return verify_password(self.password_hash, password)
 
 
 class ChatHistory(Base):
@@ -79,6 +92,15 @@ class HealthMetric(Base):
     user = relationship("User", back_populates="health_metrics")
 
 
+@dataclass(frozen=True)
+class UserBootstrap:
+    """A logged-in user plus the data their first page renders need"""
+
+    user: User
+    chat_history: list
+    treatment_plans: list
+
+
 class DatabaseManager:
     """Manages database connections and operations"""
 
@@ -117,6 +139,34 @@ class DatabaseManager:
         finally:
             session.close()
 
+    def authenticate_and_bootstrap(self, username, password, chat_limit=50):
+        """Authenticate a user and load their first chat page and saved plans
+
+        All three reads share one session, and so one connection checkout and
+        one (autobegun, read-only) transaction, instead of one per page that
+        needs data. Nothing is committed, so the returned user stays loaded.
+
+        Args:
+            username: Login name
+            password: Plain-text password to check
+            chat_limit: Newest chat turns to load, as for get_chat_history
+
+        Returns:
+            UserBootstrap, or None if the credentials are invalid
+        """
+        session = self.get_session()
+        try:
+            user = session.query(User).filter_by(username=username).first()
+            if not user or not user.check_password(password):
+                return None
+            return UserBootstrap(
+                user=user,
+                chat_history=self._chat_history_query(session, user.id, chat_limit).all(),
+                treatment_plans=self._treatment_plans_query(session, user.id).all(),
+            )
+        finally:
+            session.close()
+
     def get_user_by_username(self, username):
         """Get user by username"""
         session = self.get_session()
@@ -139,20 +189,56 @@ class DatabaseManager:
         finally:
             session.close()
 
-    def get_chat_history(self, user_id, limit=50):
-        """Get chat history for a user"""
+    def add_chat_messages(self, user_id, turns):
+        """Add several chat turns to history in one batched INSERT
+
+        Args:
+            user_id: Owner of the messages
+            turns: (message, response, timestamp) tuples, oldest first
+        """
+        if not turns:
+            return
         session = self.get_session()
         try:
-            return (
-                session.query(ChatHistory)
-                .filter_by(user_id=user_id)
-                .order_by(ChatHistory.timestamp.desc())
-                .limit(limit)
-                .all()
+            session.execute(
+                insert(ChatHistory),
+                [
+                    {
+                        "user_id": user_id,
+                        "message": message,
+                        "response": response,
+                        "timestamp": timestamp,
+                    }
+                    for message, response, timestamp in turns
+                ],
             )
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            raise e
         finally:
             session.close()
 
+    def get_chat_history(self, user_id, limit=50, before_id=None):
+        """Get chat history for a user, newest first, as read-only column rows
+
+        Pass the id of the last (oldest) message returned as before_id to get
+        the next page; keyset paging stays cheap however long the history is.
+        """
+        session = self.get_session()
+        try:
+            return self._chat_history_query(session, user_id, limit, before_id).all()
+        finally:
+            session.close()
+
+    @staticmethod
+    def _chat_history_query(session, user_id, limit, before_id=None):
+        """Query for one keyset page of chat history rows, newest first"""
+        query = session.query(*ChatHistory.__table__.columns).filter_by(user_id=user_id)
+        if before_id is not None:
+            query = query.filter(ChatHistory.id < before_id)
+        return query.order_by(ChatHistory.id.desc()).limit(limit)
+
     def create_treatment_plan(self, user_id, title, condition, plan_details):
         """Create a new treatment plan"""
         session = self.get_session()
@@ -170,18 +256,22 @@ class DatabaseManager:
             session.close()
 
     def get_treatment_plans(self, user_id):
-        """Get all treatment plans for a user"""
+        """Get all treatment plans for a user, as read-only column rows"""
         session = self.get_session()
         try:
-            return (
-                session.query(TreatmentPlan)
-                .filter_by(user_id=user_id)
-                .order_by(TreatmentPlan.created_at.desc())
-                .all()
-            )
+            return self._treatment_plans_query(session, user_id).all()
         finally:
             session.close()
 
+    @staticmethod
+    def _treatment_plans_query(session, user_id):
+        """Query for a user's treatment plan rows, newest first"""
+        return (
+            session.query(*TreatmentPlan.__table__.columns)
+            .filter_by(user_id=user_id)
+            .order_by(TreatmentPlan.created_at.desc())
+        )
+
     def add_health_metric(self, user_id, metric_type, value, unit, notes=None):
         """Add a health metric"""
         session = self.get_session()
@@ -198,11 +288,58 @@ class DatabaseManager:
         finally:
             session.close()
 
+    def get_health_metric_series(self, user_id, metric_type):
+        """Get one metric type as column arrays, oldest first, or None if there is no data
+
+        Only the charted columns are selected and transposed once into arrays,
+        so the analytics page never builds an object or dict per measurement.
+        """
+        session = self.get_session()
+        try:
+            rows = (
+                session.query(
+                    HealthMetric.recorded_at,
+                    HealthMetric.value,
+                    HealthMetric.notes,
+                    HealthMetric.unit,
+                )
+                .filter_by(user_id=user_id, metric_type=metric_type)
+                .order_by(HealthMetric.recorded_at)
+                .all()
+            )
+        finally:
+            session.close()
+
+        if not rows:
+            return None
+        recorded_at, values, notes, units = zip(*rows)
+        notes = np.array(notes, dtype=object)
+        notes[np.equal(notes, None)] = ""
+        return {
+            "Date": np.array(recorded_at, dtype="datetime64[ns]"),
+            # float32 is ample for charting vitals and halves the array size
+            "Value": np.array(values, dtype=np.float32),
+            "Notes": notes,
+            "unit": units[-1],
+        }
+
+    def get_health_metric_version(self, user_id, metric_type):
+        """Get (newest id, count) for one metric type; changes whenever its series does"""
+        session = self.get_session()
+        try:
+            return tuple(
+                session.query(func.max(HealthMetric.id), func.count(HealthMetric.id))
+                .filter_by(user_id=user_id, metric_type=metric_type)
+                .one()
+            )
+        finally:
+            session.close()
+
     def get_health_metrics(self, user_id, metric_type=None):
-        """Get health metrics for a user"""
+        """Get health metrics for a user, as read-only column rows"""
         session = self.get_session()
         try:
-            query = session.query(HealthMetric).filter_by(user_id=user_id)
+            query = session.query(*HealthMetric.__table__.columns).filter_by(user_id=user_id)
             if metric_type:
                 query = query.filter_by(metric_type=metric_type)
             return query.order_by(HealthMetric.recorded_at.desc()).all()
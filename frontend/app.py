@@ -5,10 +5,11 @@ Uses service layer for all business logic and data access.
 
 import os
 import sys
+from copy import copy
 from datetime import datetime
+from types import MappingProxyType
+from typing import Any, Mapping
 
-import pandas as pd
-import plotly.graph_objects as go
 import streamlit as st
 
 # Add parent directory to path for imports
@@ -20,9 +21,12 @@ from backend.services.auth_service import AuthService
 from backend.services.chat_service import ChatService
 from backend.services.health_service import HealthService
 from backend.services.treatment_service import TreatmentService
+from backend.utils.async_utils import iter_sync, run_sync
 from backend.utils.database import get_db_manager
+from backend.utils.gc_tuning import tune_gc
 from backend.utils.logger import get_logger
 from config import config
+from validation import InputValidator
 
 # Initialize logger
 logger = get_logger(__name__)
@@ -37,6 +41,10 @@ st.set_page_config(
 
 
 # Initialize database manager
+# st.cache_resource returns the same object on every rerun without hashing,
+# pickling or copying it. Never pass these singletons as arguments to an
+# @st.cache_data function, whose arguments are hashed on every call; read the
+# module globals inside it instead.
 @st.cache_resource
 def init_services():
     """Initialize database and return service instances"""
@@ -52,19 +60,37 @@ def init_services():
 
 db_manager = init_services()
 
+# After the singletons exist, so they are frozen along with the imports
+tune_gc(config.STREAMLIT_GC_GEN0_THRESHOLD)
+
 # Check API key
 if not config.OPENROUTER_API_KEY:
     st.error("⚠️ OPENROUTER_API_KEY not found. Please add your OpenRouter API key in .env file.")
     st.info("Get your free API key at: https://openrouter.ai/keys")
     st.stop()
 
-# Session state initialization
-if "logged_in" not in st.session_state:
-    st.session_state.logged_in = False
-if "user" not in st.session_state:
-    st.session_state.user = None
-if "chat_messages" not in st.session_state:
-    st.session_state.chat_messages = []
+# Streamlit re-executes this script on every interaction, so lookup tables
+# live in imported modules (built once per process) and are only aliased here
+METRIC_UNITS = InputValidator.METRIC_UNITS
+METRIC_TYPES = InputValidator.METRIC_TYPES
+
+NAV_PAGES = ("💬 Patient Chat", "🔍 Symptom Checker", "📋 Treatment Plans", "📊 Health Analytics")
+SESSION_DEFAULTS: Mapping[str, Any] = MappingProxyType(
+    {
+        "logged_in": False,
+        "user": None,
+        "chat_messages": [],
+        # "start" until the first page is loaded, None once no older turns remain
+        "chat_history_cursor": "start",
+    }
+)
+
+# Session state initialization; mutable defaults are copied per session
+for _key, _default in SESSION_DEFAULTS.items():
+    st.session_state.setdefault(_key, copy(_default))
+
+# Saved chat turns loaded per "Load older messages" page
+CHAT_HISTORY_PAGE_SIZE = 10
 
 
 def show_medical_disclaimer():
@@ -172,27 +198,46 @@ def login_page():
                     session.close()
 
 
+def load_older_chat_history():
+    """Prepend the next page of saved chat turns to the transcript"""
+    cursor = st.session_state.chat_history_cursor
+    try:
+        session = db_manager.get_session()
+        chat_service = ChatService(session)
+        history = chat_service.get_chat_history(
+            st.session_state.user["id"],
+            limit=CHAT_HISTORY_PAGE_SIZE,
+            before_id=None if cursor == "start" else cursor,
+        )
+        session.close()
+    except Exception as e:
+        logger.error(f"Error loading chat history: {str(e)}")
+        st.session_state.chat_history_cursor = None
+        return
+
+    older = []
+    for h in history:
+        older.append({"role": "user", "content": h["message"]})
+        older.append({"role": "assistant", "content": h["response"]})
+    st.session_state.chat_messages = older + st.session_state.chat_messages
+
+    # Pages come back oldest first; a short page means nothing older is left
+    st.session_state.chat_history_cursor = (
+        history[0]["id"] if len(history) == CHAT_HISTORY_PAGE_SIZE else None
+    )
+
+
 def patient_chat_page():
     """AI-powered patient chat interface"""
     st.title("💬 Patient Chat")
     st.markdown("Ask me anything about your health concerns. I'm here to help!")
 
-    # Load chat history
-    if not st.session_state.chat_messages:
-        try:
-            session = db_manager.get_session()
-            chat_service = ChatService(session)
-            history = chat_service.get_chat_history(st.session_state.user["id"], limit=20)
-
-            for h in history:
-                st.session_state.chat_messages.append({"role": "user", "content": h["message"]})
-                st.session_state.chat_messages.append(
-                    {"role": "assistant", "content": h["response"]}
-                )
-
-            session.close()
-        except Exception as e:
-            logger.error(f"Error loading chat history: {str(e)}")
+    # Load the latest chat history, and older pages on demand
+    if st.session_state.chat_history_cursor == "start":
+        load_older_chat_history()
+    if st.session_state.chat_history_cursor is not None:
+        if st.button("Load older messages"):
+            load_older_chat_history()
 
     # Display chat messages
     for message in st.session_state.chat_messages:
@@ -208,26 +253,23 @@ def patient_chat_page():
 
         # Get AI response
         with st.chat_message("assistant"):
-            with st.spinner("Thinking..."):
-                try:
-                    session = db_manager.get_session()
-                    chat_service = ChatService(session)
-                    result = chat_service.send_message(st.session_state.user["id"], prompt)
-                    response = result["response"]
-
-                    st.markdown(response)
-                    st.session_state.chat_messages.append(
-                        {"role": "assistant", "content": response}
-                    )
+            try:
+                session = db_manager.get_session()
+                chat_service = ChatService(session)
+                events = chat_service.stream_message(st.session_state.user["id"], prompt)
+
+                # Tokens are painted as they arrive; the exchange is saved once done
+                response = st.write_stream(
+                    event["delta"] for event in iter_sync(events) if "delta" in event
+                )
+                st.session_state.chat_messages.append({"role": "assistant", "content": response})
 
-                    session.close()
-                except Exception as e:
-                    logger.error(f"Chat error: {str(e)}")
-                    error_msg = "I'm experiencing technical difficulties. Please try again."
-                    st.error(error_msg)
-                    st.session_state.chat_messages.append(
-                        {"role": "assistant", "content": error_msg}
-                    )
+                session.close()
+            except Exception as e:
+                logger.error(f"Chat error: {str(e)}")
+                error_msg = "I'm experiencing technical difficulties. Please try again."
+                st.error(error_msg)
+                st.session_state.chat_messages.append({"role": "assistant", "content": error_msg})
 
 
 def symptom_checker_page():
@@ -253,7 +295,9 @@ def symptom_checker_page():
                 try:
                     session = db_manager.get_session()
                     chat_service = ChatService(session)
-                    result = chat_service.analyze_symptoms(st.session_state.user["id"], symptoms)
+                    result = run_sync(
+                        chat_service.analyze_symptoms(st.session_state.user["id"], symptoms)
+                    )
 
                     st.markdown("### Analysis Results")
                     st.markdown(result["analysis"])
@@ -303,8 +347,10 @@ def treatment_plan_page():
                             "gender": st.session_state.user["gender"],
                         }
 
-                        plan = chat_service.generate_treatment_plan(
-                            st.session_state.user["id"], condition, patient_info
+                        plan = run_sync(
+                            chat_service.generate_treatment_plan(
+                                st.session_state.user["id"], condition, patient_info
+                            )
                         )
 
                         st.session_state.generated_plan = plan
@@ -375,6 +421,76 @@ def treatment_plan_page():
             st.error("Failed to load treatment plans.")
 
 
+@st.cache_data(ttl=600, max_entries=256, show_spinner=False)
+def build_metric_chart(user_id: int, metric_type: str, version: tuple):
+    """
+    Build the trend figure, statistics and table for one metric.
+
+    Cached across reruns; version is the (newest id, count) stamp from
+    HealthService.get_metric_version, so recording or deleting a metric
+    invalidates the cached chart immediately. Arguments are hashed on every
+    call, so only plain keys are passed; db_manager is read from the module
+    global.
+
+    Returns:
+        (figure, statistics, display table), or None if there is no data
+    """
+    # Deferred so pages without charts never pay for importing pandas and Plotly
+    import numpy as np
+    import pandas as pd
+    import plotly.graph_objects as go
+
+    session = db_manager.get_session()
+    try:
+        series = HealthService(session).get_metric_series(
+            user_id, metric_type, value_dtype=np.float32
+        )
+    finally:
+        session.close()
+
+    if series is None:
+        return None
+
+    # Prepare data for visualization, straight from the column arrays
+    df = pd.DataFrame(
+        {
+            "Date": series["recorded_at"],
+            "Value": series["value"],
+            "Notes": series["notes"],
+        },
+        copy=False,
+    )
+
+    # Create interactive plot
+    fig = go.Figure()
+
+    fig.add_trace(
+        go.Scatter(
+            x=df["Date"],
+            y=df["Value"],
+            mode="lines+markers",
+            name=metric_type,
+            line=dict(color="#1f77b4", width=2),
+            marker=dict(size=8),
+            hovertemplate="<b>%{x}</b><br>Value: %{y}<extra></extra>",
+        )
+    )
+
+    fig.update_layout(
+        title=f"{metric_type} Trend",
+        xaxis_title="Date",
+        yaxis_title=f'{metric_type} ({series["unit"][-1]})',
+        hovermode="x unified",
+        height=400,
+    )
+
+    stats = HealthService.series_statistics(metric_type, series)
+
+    display_df = df.copy()
+    display_df["Date"] = display_df["Date"].dt.strftime("%Y-%m-%d %H:%M")
+    return fig, stats, display_df
+
+
 def health_analytics_page():
     """Health analytics dashboard"""
     st.title("📊 Health Analytics")
@@ -387,31 +503,11 @@ def health_analytics_page():
         col1, col2 = st.columns(2)
 
         with col1:
-            metric_type = st.selectbox(
-                "Metric Type",
-                [
-                    "Heart Rate",
-                    "Blood Pressure (Systolic)",
-                    "Blood Pressure (Diastolic)",
-                    "Blood Glucose",
-                    "Weight",
-                    "Temperature",
-                    "Oxygen Saturation",
-                ],
-            )
+            metric_type = st.selectbox("Metric Type", METRIC_TYPES)
 
         with col2:
             # Set appropriate units based on metric type
-            unit_mapping = {
-                "Heart Rate": "bpm",
-                "Blood Pressure (Systolic)": "mmHg",
-                "Blood Pressure (Diastolic)": "mmHg",
-                "Blood Glucose": "mg/dL",
-                "Weight": "kg",
-                "Temperature": "°F",
-                "Oxygen Saturation": "%",
-            }
-            unit = unit_mapping.get(metric_type, "unit")
+            unit = METRIC_UNITS.get(metric_type, "unit")
             st.text_input("Unit", value=unit, disabled=True)
 
         value = st.number_input("Value", min_value=0.0, step=0.1)
@@ -443,85 +539,37 @@ def health_analytics_page():
         st.subheader("Your Health Trends")
 
         # Metric selector for visualization
-        available_metrics = [
-            "Heart Rate",
-            "Blood Pressure (Systolic)",
-            "Blood Pressure (Diastolic)",
-            "Blood Glucose",
-            "Weight",
-            "Temperature",
-            "Oxygen Saturation",
-        ]
-
-        selected_metric = st.selectbox("Select Metric to Visualize", available_metrics)
+        selected_metric = st.selectbox("Select Metric to Visualize", METRIC_TYPES)
 
         try:
+            user_id = st.session_state.user["id"]
             session = db_manager.get_session()
-            health_service = HealthService(session)
-            metrics = health_service.get_metrics(st.session_state.user["id"], selected_metric)
+            version = HealthService(session).get_metric_version(user_id, selected_metric)
             session.close()
+            chart = build_metric_chart(user_id, selected_metric, version)
 
-            if not metrics:
+            if chart is None:
                 st.info(
                     f"No data recorded for {selected_metric} yet. Start tracking by adding metrics above!"
                 )
             else:
-                # Prepare data for visualization
-                df = pd.DataFrame(
-                    [
-                        {
-                            "Date": m["recorded_at"],
-                            "Value": m["value"],
-                            "Notes": m["notes"] if m["notes"] else "",
-                        }
-                        for m in reversed(metrics)
-                    ]
-                )
-
-                # Create interactive plot
-                fig = go.Figure()
-
-                fig.add_trace(
-                    go.Scatter(
-                        x=df["Date"],
-                        y=df["Value"],
-                        mode="lines+markers",
-                        name=selected_metric,
-                        line=dict(color="#1f77b4", width=2),
-                        marker=dict(size=8),
-                        hovertemplate="<b>%{x}</b><br>Value: %{y}<extra></extra>",
-                    )
-                )
-
-                fig.update_layout(
-                    title=f"{selected_metric} Trend",
-                    xaxis_title="Date",
-                    yaxis_title=f'{selected_metric} ({metrics[0]["unit"]})',
-                    hovermode="x unified",
-                    height=400,
-                )
-
+                fig, stats, display_df = chart
                 st.plotly_chart(fig, use_container_width=True)
 
                 # Show statistics
-                stats = health_service.get_statistics(st.session_state.user["id"], selected_metric)
-
-                if stats:
-                    col1, col2, col3, col4 = st.columns(4)
+                col1, col2, col3, col4 = st.columns(4)
 
-                    with col1:
-                        st.metric("Latest", f"{stats['latest']:.1f} {stats['unit']}")
-                    with col2:
-                        st.metric("Average", f"{stats['average']:.1f} {stats['unit']}")
-                    with col3:
-                        st.metric("Minimum", f"{stats['minimum']:.1f} {stats['unit']}")
-                    with col4:
-                        st.metric("Maximum", f"{stats['maximum']:.1f} {stats['unit']}")
+                with col1:
+                    st.metric("Latest", f"{stats['latest']:.1f} {stats['unit']}")
+                with col2:
+                    st.metric("Average", f"{stats['average']:.1f} {stats['unit']}")
+                with col3:
+                    st.metric("Minimum", f"{stats['minimum']:.1f} {stats['unit']}")
+                with col4:
+                    st.metric("Maximum", f"{stats['maximum']:.1f} {stats['unit']}")
 
                 # Show data table
                 st.markdown("### Recent Measurements")
-                display_df = df.copy()
-                display_df["Date"] = display_df["Date"].dt.strftime("%Y-%m-%d %H:%M")
                 st.dataframe(display_df, use_container_width=True)
 
         except Exception as e:
@@ -543,7 +591,7 @@ def main():
         # Navigation menu
         page = st.sidebar.radio(
             "Navigation",
-            ["💬 Patient Chat", "🔍 Symptom Checker", "📋 Treatment Plans", "📊 Health Analytics"],
+            NAV_PAGES,
             key="navigation",
         )
 
@@ -553,6 +601,7 @@ def main():
             st.session_state.logged_in = False
             st.session_state.user = None
             st.session_state.chat_messages = []
+            st.session_state.chat_history_cursor = "start"
             logger.info(f"User logged out")
             st.rerun()
 
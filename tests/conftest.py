@@ -8,6 +8,7 @@ import sys
 import pytest
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -19,8 +20,11 @@ from backend.utils.database import DatabaseManager
 @pytest.fixture(scope="function")
 def test_db():
     """Create a test database for each test"""
-    # Use in-memory SQLite for tests
-    engine = create_engine("sqlite:///:memory:")
+    # Use in-memory SQLite for tests, shared across threads like DatabaseManager's,
+    # since async services run their database work in worker threads
+    engine = create_engine(
+        "sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
     Base.metadata.create_all(engine)
 
     SessionLocal = sessionmaker(bind=engine)
@@ -0,0 +1,439 @@
+"""
+Tests for AI client.
+"""
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+import httpx
+import numpy as np
+import openai
+import pytest
+
+import ai_client
+from ai_client import HealthAIClient
+from backend.ai.semantic_cache import SemanticCache
+from backend.utils.async_utils import iter_sync, run_sync
+from config import config
+
+
+class FakeCompletions:
+    """Records completion calls and returns a canned response"""
+
+    def __init__(self, content="AI response"):
+        self.content = content
+        self.calls = []
+
+    async def create(self, **kwargs):
+        self.calls.append(kwargs)
+        message = SimpleNamespace(content=self.content)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+@pytest.fixture
+def fake_client(monkeypatch):
+    """HealthAIClient wired to a fake completions endpoint"""
+    monkeypatch.setattr(config, "OPENROUTER_API_KEY", "test-key")
+    ai_client._response_cache.clear()
+
+    client = HealthAIClient()
+    completions = FakeCompletions()
+    client.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    return client, completions
+
+
+class TestHealthAIClient:
+    """Tests for HealthAIClient class"""
+
+    def test_chat_completion_passes_overrides(self, fake_client):
+        """Test chat_completion forwards system prompt and generation settings"""
+        client, completions = fake_client
+
+        response = asyncio.run(
+            client.chat_completion(
+                system_prompt="system", user_message="hello", max_tokens=100, temperature=0.5
+            )
+        )
+
+        assert response == "AI response"
+        call = completions.calls[0]
+        assert call["max_tokens"] == 100
+        assert call["temperature"] == 0.5
+        assert call["messages"][0]["content"][0]["text"] == "system"
+
+    def test_system_blocks_marked_for_prompt_caching(self, fake_client):
+        """Test each system block carries a cache_control breakpoint"""
+        client, completions = fake_client
+
+        asyncio.run(client.chat_completion(["static", "patient"], "hello"))
+
+        content = completions.calls[0]["messages"][0]["content"]
+        assert [block["text"] for block in content] == ["static", "patient"]
+        assert all(block["cache_control"] == {"type": "ephemeral"} for block in content)
+
+    def test_prompt_caching_disabled_sends_plain_text(self, fake_client, monkeypatch):
+        """Test system blocks are joined into plain text when prompt caching is off"""
+        client, completions = fake_client
+        monkeypatch.setattr(config, "AI_PROMPT_CACHING", False)
+
+        asyncio.run(client.chat_completion(["static", "patient"], "hello"))
+
+        assert completions.calls[0]["messages"][0]["content"] == "static\n\npatient"
+
+    def test_low_temperature_responses_are_cached(self, fake_client):
+        """Test repeat prompts at low temperature skip the API"""
+        client, completions = fake_client
+
+        for _ in range(2):
+            asyncio.run(client.chat_completion("system", "hello", temperature=0.0))
+
+        assert len(completions.calls) == 1
+
+    def test_high_temperature_responses_are_not_cached(self, fake_client):
+        """Test repeat prompts at high temperature always call the API"""
+        client, completions = fake_client
+
+        for _ in range(2):
+            asyncio.run(client.chat_completion("system", "hello", temperature=0.9))
+
+        assert len(completions.calls) == 2
+
+    def test_batch_complete_preserves_order(self, fake_client):
+        """Test batch results line up with their prompts"""
+        client, completions = fake_client
+
+        async def echo(**kwargs):
+            completions.calls.append(kwargs)
+            prompt = kwargs["messages"][-1]["content"]
+            await asyncio.sleep(0.01 if prompt == "first" else 0)
+            message = SimpleNamespace(content=f"answer to {prompt}")
+            return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+        completions.create = echo
+        responses = asyncio.run(client.batch_complete([("first", None), ("second", "system")]))
+
+        assert responses == ["answer to first", "answer to second"]
+
+    def test_batch_complete_respects_concurrency_limit(self, fake_client, monkeypatch):
+        """Test no more than AI_MAX_CONCURRENCY requests are in flight"""
+        client, completions = fake_client
+        monkeypatch.setattr(config, "AI_MAX_CONCURRENCY", 2)
+        in_flight = {"current": 0, "peak": 0}
+
+        async def tracked(**kwargs):
+            in_flight["current"] += 1
+            in_flight["peak"] = max(in_flight["peak"], in_flight["current"])
+            await asyncio.sleep(0.01)
+            in_flight["current"] -= 1
+            message = SimpleNamespace(content="ok")
+            return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+        completions.create = tracked
+        asyncio.run(client.batch_complete([(f"prompt {i}", None) for i in range(6)]))
+
+        assert in_flight["peak"] == 2
+
+    def test_global_limit_spans_independent_callers(self, fake_client, monkeypatch):
+        """Test separate chat_completion calls share the process-wide request cap"""
+        client, completions = fake_client
+        monkeypatch.setattr(config, "AI_GLOBAL_MAX_CONCURRENCY", 2)
+        in_flight = {"current": 0, "peak": 0}
+
+        async def tracked(**kwargs):
+            in_flight["current"] += 1
+            in_flight["peak"] = max(in_flight["peak"], in_flight["current"])
+            await asyncio.sleep(0.01)
+            in_flight["current"] -= 1
+            message = SimpleNamespace(content="ok")
+            return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+        completions.create = tracked
+
+        async def many_sessions():
+            calls = [client.chat_completion("system", f"hi {i}", temperature=0.9) for i in range(5)]
+            return await asyncio.gather(*calls)
+
+        assert asyncio.run(many_sessions()) == ["ok"] * 5
+        assert in_flight["peak"] == 2
+
+    def test_clients_share_connection_pool(self, monkeypatch):
+        """Test every HealthAIClient reuses the same underlying AsyncOpenAI client"""
+        monkeypatch.setattr(config, "OPENROUTER_API_KEY", "test-key")
+
+        assert HealthAIClient().client is HealthAIClient().client
+
+    def test_close_ai_client_resets_shared_client(self, monkeypatch):
+        """Test closing the shared client makes the next caller build a fresh one"""
+        monkeypatch.setattr(config, "OPENROUTER_API_KEY", "test-key")
+        first = HealthAIClient().client
+
+        asyncio.run(ai_client.close_ai_client())
+
+        assert first.is_closed()
+        assert HealthAIClient().client is not first
+
+    def test_stream_yields_deltas_and_caches(self, fake_client, monkeypatch):
+        """Test streamed deltas are yielded in order and the full text is cached"""
+        client, completions = fake_client
+        monkeypatch.setattr(config, "AI_TEMPERATURE", 0.0)
+
+        async def stream_create(**kwargs):
+            completions.calls.append(kwargs)
+
+            async def chunks():
+                for text in ["Hel", "lo", None]:
+                    delta = SimpleNamespace(content=text)
+                    yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+            return chunks()
+
+        completions.create = stream_create
+
+        async def collect():
+            return [delta async for delta in client.stream_chat_with_patient("hi")]
+
+        assert asyncio.run(collect()) == ["Hel", "lo"]
+        assert completions.calls[0]["stream"] is True
+        assert asyncio.run(collect()) == ["Hello"]
+        assert len(completions.calls) == 1
+
+    def test_stream_shares_semantic_cache_with_chat(self, fake_client, monkeypatch):
+        """Test a streamed answer is reused for a paraphrase on the non-streaming path"""
+        client, completions = fake_client
+        monkeypatch.setattr(config, "AI_TEMPERATURE", 0.0)
+        monkeypatch.setattr(
+            ai_client, "_semantic_cache", SemanticCache(embedder=lambda text: np.ones(3))
+        )
+
+        async def stream_create(**kwargs):
+            completions.calls.append(kwargs)
+
+            async def chunks():
+                for text in ["Drink ", "water"]:
+                    delta = SimpleNamespace(content=text)
+                    yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+            return chunks()
+
+        completions.create = stream_create
+
+        async def collect():
+            return [delta async for delta in client.stream_chat_with_patient("How to hydrate?")]
+
+        assert asyncio.run(collect()) == ["Drink ", "water"]
+        assert asyncio.run(client.chat_with_patient("How do I stay hydrated?")) == "Drink water"
+        assert len(completions.calls) == 1
+
+    def test_stream_falls_back_when_streaming_is_rejected(self, fake_client):
+        """Test a provider refusing stream=True still gets a single full response"""
+        client, completions = fake_client
+        fallback = completions.create
+
+        async def reject_streaming(**kwargs):
+            if kwargs.get("stream"):
+                completions.calls.append(kwargs)
+                raise self._status_error(openai.BadRequestError, 400)
+            return await fallback(**kwargs)
+
+        completions.create = reject_streaming
+
+        async def collect():
+            return [delta async for delta in client.stream_chat_with_patient("hi")]
+
+        assert asyncio.run(collect()) == ["AI response"]
+        assert [call.get("stream") for call in completions.calls] == [True, None]
+
+    def test_bulk_treatment_plans_are_row_marshaled(self, fake_client, monkeypatch):
+        """Test patients are batched per request and plans come back in order"""
+        client, completions = fake_client
+        monkeypatch.setattr(config, "AI_BULK_BATCH_SIZE", 2)
+
+        async def bulk_create(**kwargs):
+            completions.calls.append(kwargs)
+            patients = json.loads(kwargs["messages"][-1]["content"].split("\n\n", 1)[1])
+            plans = [f"plan for {patient['condition']}" for patient in patients]
+            message = SimpleNamespace(content=json.dumps({"plans": plans}))
+            return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+        completions.create = bulk_create
+        items = [{"condition": f"c{i}", "age": 40, "gender": "Female"} for i in range(5)]
+
+        plans = asyncio.run(client.generate_treatment_plans_bulk(items))
+
+        assert plans == [f"plan for c{i}" for i in range(5)]
+        assert len(completions.calls) == 3
+        assert completions.calls[0]["response_format"] == {"type": "json_object"}
+
+    def test_bulk_treatment_plans_fall_back_on_malformed_json(self, fake_client):
+        """Test a batch with unparseable output is retried one patient at a time"""
+        client, completions = fake_client
+        completions.content = "not json"
+        items = [{"condition": "Asthma", "age": 30, "gender": "Male"}] * 2
+
+        plans = asyncio.run(client.generate_treatment_plans_bulk(items))
+
+        assert plans == ["not json", "not json"]
+        assert len(completions.calls) == 3
+        assert "response_format" not in completions.calls[1]
+
+    def test_concurrent_symptom_analyses_are_coalesced(self, fake_client, monkeypatch):
+        """Test analyses submitted within one window share a single bulk request"""
+        client, completions = fake_client
+        monkeypatch.setattr(config, "AI_COALESCE_WINDOW_MS", 20)
+
+        async def bulk_create(**kwargs):
+            completions.calls.append(kwargs)
+            requests = json.loads(kwargs["messages"][-1]["content"].split("\n\n", 1)[1])
+            analyses = [f"analysis of {request['text'][-5:]}" for request in requests]
+            message = SimpleNamespace(content=json.dumps({"analyses": analyses}))
+            return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+        completions.create = bulk_create
+
+        async def concurrent():
+            return await asyncio.gather(
+                *(client.analyze_symptoms(f"pain{i}") for i in range(3)),
+            )
+
+        assert asyncio.run(concurrent()) == [f"analysis of pain{i}" for i in range(3)]
+        assert len(completions.calls) == 1
+        assert completions.calls[0]["response_format"] == {"type": "json_object"}
+
+    def test_lone_or_malformed_coalesced_analyses_fall_back(self, fake_client, monkeypatch):
+        """Test a single analysis is sent as-is and malformed bulk JSON is retried per prompt"""
+        client, completions = fake_client
+        monkeypatch.setattr(config, "AI_COALESCE_WINDOW_MS", 20)
+
+        assert asyncio.run(client.analyze_symptoms("cough")) == "AI response"
+        assert "response_format" not in completions.calls[0]
+
+        async def concurrent():
+            return await asyncio.gather(client.analyze_symptoms("a"), client.analyze_symptoms("b"))
+
+        assert asyncio.run(concurrent()) == ["AI response", "AI response"]
+        assert len(completions.calls) == 4
+
+    def _failing_create(self, completions, error):
+        async def create(**kwargs):
+            completions.calls.append(kwargs)
+            raise error
+
+        completions.create = create
+
+    def _status_error(self, error_class, status_code):
+        request = httpx.Request("POST", "https://openrouter.ai/api/v1/chat/completions")
+        response = httpx.Response(status_code, request=request)
+        return error_class("error", response=response, body=None)
+
+    def test_rate_limit_is_retried(self, fake_client, monkeypatch):
+        """Test transient errors are retried up to max_retries"""
+        client, completions = fake_client
+        monkeypatch.setattr(client, "_backoff_delay", lambda attempt: 0)
+        self._failing_create(completions, self._status_error(openai.RateLimitError, 429))
+
+        asyncio.run(client.chat_completion("system", "hello", temperature=0.9))
+
+        assert len(completions.calls) == client.max_retries
+
+    def test_client_error_is_not_retried(self, fake_client, monkeypatch):
+        """Test permanent 4xx errors fail on the first attempt"""
+        client, completions = fake_client
+        monkeypatch.setattr(client, "_backoff_delay", lambda attempt: 0)
+        self._failing_create(completions, self._status_error(openai.BadRequestError, 400))
+
+        asyncio.run(client.chat_completion("system", "hello", temperature=0.9))
+
+        assert len(completions.calls) == 1
+
+    def test_failed_coalesced_request_is_not_fanned_out(self, fake_client, monkeypatch):
+        """Test a failed coalesced request returns its error per prompt instead of N more calls"""
+        client, completions = fake_client
+        monkeypatch.setattr(config, "AI_COALESCE_WINDOW_MS", 20)
+        self._failing_create(completions, self._status_error(openai.BadRequestError, 400))
+
+        async def concurrent():
+            return await asyncio.gather(client.analyze_symptoms("a"), client.analyze_symptoms("b"))
+
+        analyses = asyncio.run(concurrent())
+
+        assert len(completions.calls) == 1
+        assert all("technical difficulties" in text for text in analyses)
+
+    def test_failed_bulk_treatment_plans_are_not_retried_per_patient(self, fake_client):
+        """Test a bulk plan request that fails returns its error per patient, not N more calls"""
+        client, completions = fake_client
+        self._failing_create(completions, self._status_error(openai.BadRequestError, 400))
+        items = [{"condition": "Asthma", "age": 30, "gender": "Male"}] * 2
+
+        plans = asyncio.run(client.generate_treatment_plans_bulk(items))
+
+        assert len(completions.calls) == 1
+        assert all("technical difficulties" in plan for plan in plans)
+
+    def test_backoff_delay_is_capped(self, fake_client):
+        """Test exponential backoff never exceeds AI_RETRY_MAX_DELAY"""
+        client, _ = fake_client
+
+        assert client._backoff_delay(0) <= client.retry_delay * 2
+        assert client._backoff_delay(20) == config.AI_RETRY_MAX_DELAY
+
+
+class TestTokenBudget:
+    """Tests for the process-wide token budget"""
+
+    def test_over_budget_request_waits_for_window(self):
+        """Test a request that would exceed the budget waits until old spend expires"""
+        now = {"t": 100.0}
+        budget = ai_client._TokenBudget(100, clock=lambda: now["t"])
+
+        assert budget.reserve(60) == 0
+        now["t"] = 130.0
+        assert budget.reserve(60) == pytest.approx(30.0)
+        now["t"] = 160.0
+        assert budget.reserve(60) == 0
+
+    def test_oversized_request_runs_when_window_is_empty(self):
+        """Test a request larger than the whole budget is never blocked forever"""
+        budget = ai_client._TokenBudget(100, clock=lambda: 0.0)
+
+        assert budget.reserve(500) == 0
+
+    def test_client_requests_draw_from_budget(self, fake_client, monkeypatch):
+        """Test each completion reserves its estimated tokens before being sent"""
+        client, completions = fake_client
+        budget = ai_client._TokenBudget(10_000)
+        monkeypatch.setattr(ai_client, "_token_budget", budget)
+
+        asyncio.run(client.chat_completion("s" * 40, "p" * 40, max_tokens=100, temperature=0.9))
+
+        assert budget._total == 120
+        assert len(completions.calls) == 1
+
+
+class TestRunSync:
+    """Tests for run_sync helper"""
+
+    def test_run_sync_returns_result(self):
+        """Test coroutine result is returned to the caller"""
+
+        async def add(a, b):
+            await asyncio.sleep(0)
+            return a + b
+
+        assert run_sync(add(1, 2)) == 3
+
+    def test_iter_sync_yields_items_as_produced(self):
+        """Test an async generator is consumed item by item from sync code"""
+        produced = []
+
+        async def numbers():
+            for i in range(3):
+                produced.append(i)
+                yield i
+
+        iterator = iter_sync(numbers())
+
+        assert next(iterator) == 0
+        assert produced == [0]
+        assert list(iterator) == [1, 2]
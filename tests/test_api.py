@@ -0,0 +1,548 @@
+"""
+Tests for API routers.
+"""
+
+import asyncio
+import threading
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from api.cache import medical_history_cache, treatment_cache, user_cache
+from api.dependencies import get_db
+from api.main import app
+from backend.ai.safety_checker import EMERGENCY_RESPONSE
+from backend.models.health_metric import HealthMetric
+from backend.models.user import Base
+from backend.repositories.chat_repository import ChatRepository
+from backend.repositories.health_repository import HealthRepository
+from backend.repositories.medical_history_repository import MedicalHistoryRepository
+from backend.repositories.medication_repository import MedicationRepository
+from backend.repositories.user_repository import UserRepository
+from backend.services.chat_service import ChatService
+from backend.services.treatment_service import TreatmentService
+from backend.utils.jwt import create_access_token, verify_token
+
+
+@pytest.fixture
+def api_db():
+    """In-memory database shared across the TestClient's worker threads"""
+    engine = create_engine(
+        "sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(engine)
+    SessionLocal = sessionmaker(bind=engine)
+    session = SessionLocal()
+
+    yield session
+
+    session.close()
+    Base.metadata.drop_all(engine)
+
+
+@pytest.fixture
+def client(api_db):
+    """TestClient with the database dependency overridden"""
+    app.dependency_overrides[get_db] = lambda: api_db
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+    medical_history_cache.clear()
+    treatment_cache.clear()
+    user_cache.clear()
+
+
+@pytest.fixture
+def user(api_db, sample_user_data):
+    """Registered user"""
+    return UserRepository(api_db).create_user(**sample_user_data)
+
+
+@pytest.fixture
+def auth_headers(user):
+    """Bearer token headers for the registered user"""
+    token = create_access_token(data={"sub": str(user.id), "username": user.username})
+    return {"Authorization": f"Bearer {token}"}
+
+
+class TestChatRouter:
+    """Tests for chat router"""
+
+    def test_get_chat_history(self, client, api_db, user, auth_headers):
+        """Test chat history is returned oldest first"""
+        repo = ChatRepository(api_db)
+        repo.add_message(user.id, "first", "response 1")
+        repo.add_message(user.id, "second", "response 2")
+
+        response = client.get("/api/v1/chat/history", headers=auth_headers)
+
+        assert response.status_code == 200
+        messages = [item["message"] for item in response.json()]
+        assert messages == ["first", "second"]
+        assert set(response.json()[0]) == {"id", "message", "response", "timestamp"}
+
+    def test_chat_saves_run_off_the_event_loop(self, api_db, user, monkeypatch):
+        """Test the blocking chat commit runs in a worker thread, not on the event loop"""
+        monkeypatch.setattr("backend.services.chat_service.get_ai_client", lambda: None)
+        service = ChatService(api_db)
+        save = service.chat_repo.add_message
+        threads = []
+
+        def recording_save(*args):
+            threads.append(threading.get_ident())
+            return save(*args)
+
+        monkeypatch.setattr(service.chat_repo, "add_message", recording_save)
+
+        result = asyncio.run(service.send_message(user.id, "Hello there"))
+
+        assert result["message"] == "Hello there"
+        assert threads and threads[0] != threading.get_ident()
+
+    def test_get_chat_history_requires_auth(self, client):
+        """Test chat history rejects unauthenticated requests"""
+        response = client.get("/api/v1/chat/history")
+
+        assert response.status_code in (401, 403)
+
+    def test_treatment_plan_with_legacy_token(self, client, user, monkeypatch):
+        """Test tokens without profile claims still get a personalized plan"""
+        monkeypatch.setattr("backend.services.chat_service.get_ai_client", lambda: None)
+        token = create_access_token(data={"sub": str(user.id), "username": user.username})
+
+        response = client.post(
+            "/api/v1/chat/treatment-plan",
+            json={"condition": "Hypertension"},
+            headers={"Authorization": f"Bearer {token}"},
+        )
+
+        assert response.status_code == 200
+        assert response.json()["condition"] == "Hypertension"
+
+    def test_batch_answers_emergencies_without_the_ai_model(
+        self, client, user, auth_headers, monkeypatch
+    ):
+        """Test emergency messages get the canned reply and only the rest reach the model"""
+        sent = []
+
+        class _RecordingAIClient:
+            async def batch_chat_with_patient(self, messages):
+                sent.extend(messages)
+                return [f"answer: {message}" for message in messages]
+
+        monkeypatch.setattr(
+            "backend.services.chat_service.get_ai_client", lambda: _RecordingAIClient()
+        )
+
+        response = client.post(
+            "/api/v1/chat/batch",
+            json={"messages": ["How much water?", "I have chest pain", "Any tips?"]},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 200
+        assert [item["response"] for item in response.json()] == [
+            "answer: How much water?",
+            EMERGENCY_RESPONSE,
+            "answer: Any tips?",
+        ]
+        assert sent == ["How much water?", "Any tips?"]
+
+    def test_sse_events_encode_datetimes(self):
+        """Test streamed events are JSON encoded with native datetime support"""
+        from api.routers.chat import _sse_events
+
+        async def events():
+            yield {"delta": "Hi"}
+            yield {"done": True, "timestamp": datetime(2024, 1, 1, 12, 0)}
+
+        async def collect():
+            return [chunk async for chunk in _sse_events(events())]
+
+        assert asyncio.run(collect()) == [
+            'data: {"delta":"Hi"}\n\n',
+            'data: {"done":true,"timestamp":"2024-01-01T12:00:00"}\n\n',
+        ]
+
+
+class TestAuthRouter:
+    """Tests for authentication router"""
+
+    def test_login_embeds_profile_claims(self, client, user, sample_user_data):
+        """Test access token carries age and gender"""
+        response = client.post(
+            "/api/v1/auth/login",
+            json={
+                "username": sample_user_data["username"],
+                "password": sample_user_data["password"],
+            },
+        )
+
+        assert response.status_code == 200
+        payload = verify_token(response.json()["access_token"])
+        assert payload["age"] == sample_user_data["age"]
+        assert payload["gender"] == sample_user_data["gender"]
+
+    def test_register_invalid_input_is_unprocessable(self, client):
+        """Test validation failures map to 422 instead of a generic 500"""
+        response = client.post(
+            "/api/v1/auth/register",
+            json={
+                "username": "droid",
+                "password": "password123",
+                "full_name": "R2D2",
+                "age": 30,
+                "gender": "Other",
+            },
+        )
+
+        assert response.status_code == 422
+        assert "Name can only contain" in response.json()["detail"]
+
+    def test_register_duplicate_username_reports_it(self, client, user, sample_user_data):
+        """Test the lazily formatted exception message reaches the client"""
+        response = client.post(
+            "/api/v1/auth/register",
+            json={
+                "username": sample_user_data["username"],
+                "password": "password123",
+                "full_name": "Another Person",
+                "age": 30,
+                "gender": "Other",
+            },
+        )
+
+        assert response.status_code == 400
+        assert response.json()["detail"] == (
+            f"User with username '{sample_user_data['username']}' already exists"
+        )
+
+    def test_login_primes_profile_cache(self, client, user, sample_user_data):
+        """Test /me right after login is served without a user lookup"""
+        login = client.post(
+            "/api/v1/auth/login",
+            json={
+                "username": sample_user_data["username"],
+                "password": sample_user_data["password"],
+            },
+        )
+
+        assert user_cache.get(user.id, "me") is not None
+        response = client.get(
+            "/api/v1/auth/me",
+            headers={"Authorization": f"Bearer {login.json()['access_token']}"},
+        )
+        assert response.status_code == 200
+        assert response.json()["full_name"] == sample_user_data["full_name"]
+
+    def test_me_for_missing_user_is_not_found(self, client):
+        """Test a token for a deleted user returns 404 rather than 500"""
+        token = create_access_token(data={"sub": "999", "username": "ghost"})
+
+        response = client.get("/api/v1/auth/me", headers={"Authorization": f"Bearer {token}"})
+
+        assert response.status_code == 404
+
+
+class TestHealthRouter:
+    """Tests for health metrics router"""
+
+    def test_get_metrics(self, client, api_db, user, auth_headers, sample_health_metric):
+        """Test recorded metrics are listed"""
+        HealthRepository(api_db).add_metric(user_id=user.id, **sample_health_metric)
+
+        response = client.get("/api/v1/health/metrics", headers=auth_headers)
+
+        assert response.status_code == 200
+        metrics = response.json()
+        assert len(metrics) == 1
+        assert metrics[0]["metric_type"] == sample_health_metric["metric_type"]
+        assert metrics[0]["value"] == sample_health_metric["value"]
+
+    def test_record_metrics_bulk(self, client, api_db, user, auth_headers):
+        """Test a batch of metrics is stored and returned in request order"""
+        batch = [
+            {"metric_type": "Heart Rate", "value": value, "unit": "bpm"} for value in (70, 74, 72)
+        ]
+
+        response = client.post("/api/v1/health/metrics/bulk", json=batch, headers=auth_headers)
+
+        assert response.status_code == 201
+        assert [m["value"] for m in response.json()] == [70.0, 74.0, 72.0]
+        assert len(HealthRepository(api_db).get_user_metrics(user.id)) == 3
+
+    def test_record_metrics_bulk_rejects_the_whole_batch(self, client, api_db, user, auth_headers):
+        """Test one invalid metric stores none of the batch"""
+        batch = [
+            {"metric_type": "Heart Rate", "value": 70, "unit": "bpm"},
+            {"metric_type": "Heart Rate", "value": 1000, "unit": "bpm"},
+        ]
+
+        response = client.post("/api/v1/health/metrics/bulk", json=batch, headers=auth_headers)
+
+        assert response.status_code == 422
+        assert HealthRepository(api_db).get_user_metrics(user.id) == []
+
+    def test_get_statistics(self, client, api_db, user, auth_headers):
+        """Test statistics summarize the metric series with the latest value last recorded"""
+        repo = HealthRepository(api_db)
+        for value in (70.0, 74.0, 72.0):
+            repo.add_metric(user.id, "Heart Rate", value, "bpm")
+
+        response = client.get("/api/v1/health/statistics/Heart Rate", headers=auth_headers)
+
+        assert response.status_code == 200
+        stats = response.json()
+        assert (stats["count"], stats["latest"], stats["average"]) == (3, 72.0, 72.0)
+        assert (stats["minimum"], stats["maximum"], stats["unit"]) == (70.0, 74.0, "bpm")
+
+    def test_get_daily_summary(self, client, api_db, user, auth_headers):
+        """Test metrics are rolled up per day and the range includes its end day"""
+        for recorded_at, value in (
+            (datetime(2024, 3, 1, 8), 70.0),
+            (datetime(2024, 3, 1, 20), 80.0),
+            (datetime(2024, 3, 2, 23, 59), 60.0),
+            (datetime(2024, 3, 3, 9), 90.0),
+        ):
+            api_db.add(
+                HealthMetric(
+                    user_id=user.id,
+                    metric_type="Heart Rate",
+                    value=value,
+                    unit="bpm",
+                    recorded_at=recorded_at,
+                )
+            )
+        api_db.commit()
+
+        response = client.get(
+            "/api/v1/health/daily/Heart Rate",
+            params={"start": "2024-03-01", "end": "2024-03-02"},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 200
+        assert response.json() == [
+            {"day": "2024-03-01", "average": 75.0, "minimum": 70.0, "maximum": 80.0, "count": 2},
+            {"day": "2024-03-02", "average": 60.0, "minimum": 60.0, "maximum": 60.0, "count": 1},
+        ]
+
+
+class TestTreatmentRouter:
+    """Tests for treatment plans router"""
+
+    def test_create_and_get_plan(self, client, auth_headers, sample_treatment_plan):
+        """Test a created plan can be fetched back"""
+        created = client.post(
+            "/api/v1/treatment/plans", json=sample_treatment_plan, headers=auth_headers
+        )
+
+        assert created.status_code == 201
+        response = client.get(
+            f"/api/v1/treatment/plans/{created.json()['id']}", headers=auth_headers
+        )
+        assert response.status_code == 200
+        assert response.json()["title"] == sample_treatment_plan["title"]
+
+    def test_database_outage_is_service_unavailable(self, client, auth_headers, monkeypatch):
+        """Test lost database connections surface as a retryable 503"""
+
+        def fail(self, user_id):
+            raise OperationalError("SELECT 1", {}, Exception("connection refused"))
+
+        monkeypatch.setattr(TreatmentService, "get_user_plans", fail)
+
+        response = client.get("/api/v1/treatment/plans", headers=auth_headers)
+
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == "1"
+
+
+class TestMedicalHistoryRouter:
+    """Tests for medical history router"""
+
+    def test_add_and_list_conditions(self, client, auth_headers):
+        """Test conditions are stored for and listed to the current user"""
+        created = client.post(
+            "/api/v1/medical-history/conditions",
+            json={"condition_name": "Asthma", "status": "chronic"},
+            headers=auth_headers,
+        )
+
+        assert created.status_code == 201
+        response = client.get("/api/v1/medical-history/conditions", headers=auth_headers)
+        assert response.status_code == 200
+        assert [c["condition_name"] for c in response.json()] == ["Asthma"]
+
+    def test_unknown_condition_status_is_rejected(self, client, auth_headers):
+        """Test status only accepts the documented values"""
+        response = client.post(
+            "/api/v1/medical-history/conditions",
+            json={"condition_name": "Asthma", "status": "cured"},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 422
+        assert response.json()["detail"][0]["type"] == "literal_error"
+
+    def test_condition_reads_are_cached_until_write(self, client, api_db, user, auth_headers):
+        """Test repeated reads are served from cache and writes invalidate them"""
+        url = "/api/v1/medical-history/conditions"
+        assert client.get(url, headers=auth_headers).json() == []
+
+        MedicalHistoryRepository(api_db).add_condition(user.id, "Asthma")
+        assert client.get(url, headers=auth_headers).json() == []
+
+        client.post(url, json={"condition_name": "Migraine"}, headers=auth_headers)
+        names = {c["condition_name"] for c in client.get(url, headers=auth_headers).json()}
+        assert names == {"Asthma", "Migraine"}
+
+    def test_conditions_revalidate_with_etag(self, client, auth_headers):
+        """Test unchanged conditions return 304 and a write changes the ETag"""
+        url = "/api/v1/medical-history/conditions"
+        etag = client.get(url, headers=auth_headers).headers["etag"]
+
+        unchanged = client.get(url, headers={**auth_headers, "If-None-Match": etag})
+        client.post(url, json={"condition_name": "Asthma"}, headers=auth_headers)
+        changed = client.get(url, headers={**auth_headers, "If-None-Match": etag})
+
+        assert unchanged.status_code == 304
+        assert changed.status_code == 200
+        assert changed.headers["etag"] != etag
+
+    def test_discontinue_medication(self, client, api_db, user, auth_headers):
+        """Test discontinuing a medication returns it with an end date"""
+        medication = MedicationRepository(api_db).add_medication(user.id, "Metformin")
+
+        response = client.patch(
+            f"/api/v1/medical-history/medications/{medication.id}/discontinue",
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 200
+        assert response.json()["status"] == "discontinued"
+        assert response.json()["end_date"] == datetime.utcnow().date().isoformat()
+
+    def test_discontinue_other_users_medication(self, client, api_db, auth_headers):
+        """Test a user cannot discontinue someone else's medication"""
+        other = UserRepository(api_db).create_user(
+            username="otheruser",
+            password="otherpass123",
+            full_name="Other User",
+            age=40,
+            gender="Female",
+        )
+        medication = MedicationRepository(api_db).add_medication(other.id, "Metformin")
+
+        response = client.patch(
+            f"/api/v1/medical-history/medications/{medication.id}/discontinue",
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 404
+        assert medication.status == "active"
+
+    def test_bulk_add_conditions(self, client, auth_headers):
+        """Test a bulk request stores every condition and invalidates cached reads"""
+        url = "/api/v1/medical-history/conditions"
+        assert client.get(url, headers=auth_headers).json() == []
+
+        response = client.post(
+            f"{url}/bulk",
+            json=[{"condition_name": "Asthma"}, {"condition_name": "Migraine"}],
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 201
+        assert [c["condition_name"] for c in response.json()["created"]] == ["Asthma", "Migraine"]
+        assert response.json()["failed"] == []
+        assert len(client.get(url, headers=auth_headers).json()) == 2
+
+    def test_list_symptoms(self, client, auth_headers):
+        """Test logged symptoms are listed with serialized timestamps"""
+        url = "/api/v1/medical-history/symptoms"
+        for name in ("Headache", "Cough"):
+            client.post(
+                url, json={"symptom_description": name, "severity": 4}, headers=auth_headers
+            )
+
+        response = client.get(url, headers=auth_headers)
+
+        assert response.status_code == 200
+        assert {s["symptom_description"] for s in response.json()} == {"Cough", "Headache"}
+        assert response.json()[0]["logged_at"]
+
+    def test_recent_symptoms_stream_as_json_array(self, client, auth_headers):
+        """Test recent symptoms stream as one valid JSON array, including when empty"""
+        url = "/api/v1/medical-history/symptoms"
+        assert client.get(f"{url}/recent", headers=auth_headers).json() == []
+
+        client.post(
+            f"{url}/bulk",
+            json=[{"symptom_description": f"Symptom {i}"} for i in range(3)],
+            headers=auth_headers,
+        )
+        response = client.get(f"{url}/recent", params={"days": 7}, headers=auth_headers)
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        assert len(response.json()) == 3
+
+    def test_bulk_log_symptoms_rejects_empty_body(self, client, auth_headers):
+        """Test an empty bulk request is rejected before touching the database"""
+        response = client.post(
+            "/api/v1/medical-history/symptoms/bulk", json=[], headers=auth_headers
+        )
+
+        assert response.status_code == 422
+
+
+class TestRootRoutes:
+    """Tests for root and health check routes"""
+
+    def test_root(self, client):
+        """Test root endpoint lists API entry points"""
+        response = client.get("/")
+
+        assert response.status_code == 200
+        assert response.json()["docs"] == "/docs"
+
+    def test_health_check_reports_database(self, client, api_db, monkeypatch):
+        """Test health check probes the database and caches the result"""
+        import api.main
+
+        db_manager = SimpleNamespace(get_session=sessionmaker(bind=api_db.get_bind()))
+        monkeypatch.setattr(api.main, "get_db_manager", lambda: db_manager)
+        monkeypatch.setattr(api.main, "_db_health", None)
+        response = client.get("/health")
+
+        assert response.status_code == 200
+        assert response.json()["database"] == "healthy"
+        assert api.main._db_health[1] == "healthy"
+
+    def test_lifespan_warms_and_closes_ai_client(self, monkeypatch):
+        """Test startup warms the AI pool and OpenAPI schema, and shutdown closes the pool"""
+        import api.main
+
+        events = []
+
+        async def warm_up():
+            events.append("warm_up")
+
+        async def close():
+            events.append("close")
+
+        monkeypatch.setattr(api.main, "warm_up_ai_client", warm_up)
+        monkeypatch.setattr(api.main, "close_ai_client", close)
+        monkeypatch.setattr(app, "openapi_schema", None)
+
+        with TestClient(app):
+            assert events == ["warm_up"]
+            assert "/api/v1/medical-history/conditions" in app.openapi_schema["paths"]
+
+        assert events == ["warm_up", "close"]
@@ -0,0 +1,197 @@
+"""
+Tests for the API read cache.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from types import SimpleNamespace
+from typing import List
+
+import pytest
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from api.cache import UserReadCache, cached_json
+from api.schemas.medical_history import AllergyResponse
+from backend.repositories.allergy_repository import AllergyRepository
+
+
+class _Item(BaseModel):
+    """Response model for cached_json tests"""
+
+    name: str
+    created_at: datetime
+
+
+class TestUserReadCache:
+    """Tests for UserReadCache class"""
+
+    def test_set_and_get(self):
+        """Test cached bodies round-trip unchanged"""
+        cache = UserReadCache("test")
+        cache.set(1, "items", b'[{"name": "a"}]', limit=5)
+
+        assert cache.get(1, "items", limit=5) == b'[{"name": "a"}]'
+
+    def test_shared_only_cache_is_disabled_without_redis(self):
+        """Test multi-worker caches never fall back to per-process entries"""
+        cache = UserReadCache("test", stale_ttl_seconds=60, shared_only=True)
+        cache.set(1, "items", b"[]")
+        loads = []
+
+        def load():
+            loads.append(1)
+            return b"[]"
+
+        cache.get_or_load(1, "items", load)
+        cache.get_or_load(1, "items", load)
+
+        assert cache.get(1, "items") is None
+        assert cache.get_stale(1, "items") is None
+        assert len(loads) == 2
+
+    def test_params_and_users_are_isolated(self):
+        """Test entries differ per user and per query parameters"""
+        cache = UserReadCache("test")
+        cache.set(1, "items", b"[]", limit=5)
+
+        assert cache.get(1, "items", limit=10) is None
+        assert cache.get(2, "items", limit=5) is None
+
+    def test_invalidate_drops_only_that_user(self):
+        """Test invalidation hides a user's entries without touching others"""
+        cache = UserReadCache("test")
+        cache.set(1, "items", b'["a"]')
+        cache.set(2, "items", b'["b"]')
+
+        cache.invalidate(1)
+
+        assert cache.get(1, "items") is None
+        assert cache.get(2, "items") == b'["b"]'
+
+    def test_concurrent_misses_share_one_load(self):
+        """Test simultaneous misses for one key run the loader only once"""
+        cache = UserReadCache("test")
+        started = threading.Event()
+        loads = []
+
+        def load():
+            loads.append(1)
+            started.set()
+            time.sleep(0.05)
+            return b"[]"
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            leader = pool.submit(cache.get_or_load, 1, "items", load)
+            started.wait()
+            followers = [pool.submit(cache.get_or_load, 1, "items", load) for _ in range(3)]
+            results = [leader.result()] + [f.result() for f in followers]
+
+        assert results == [b"[]"] * 4
+        assert len(loads) == 1
+
+    def test_write_during_load_is_not_cached_as_fresh(self):
+        """Test a body loaded before an invalidation is not served afterwards"""
+        cache = UserReadCache("test")
+
+        def load():
+            cache.invalidate(1)
+            return b'["stale"]'
+
+        assert cache.get_or_load(1, "items", load) == b'["stale"]'
+        assert cache.get(1, "items") is None
+
+    def test_disabled_cache_always_misses(self):
+        """Test nothing is stored when the cache is disabled"""
+        cache = UserReadCache("test", enabled=False)
+        cache.set(1, "items", b"[]")
+
+        assert cache.get(1, "items") is None
+
+
+class TestCachedJson:
+    """Tests for cached_json helper"""
+
+    def test_serializes_rows_from_attributes_once(self):
+        """Test ORM-like rows are dumped to JSON and later served from cache"""
+        cache = UserReadCache("test")
+        adapter = TypeAdapter(List[_Item])
+        loads = []
+
+        def load():
+            loads.append(1)
+            return [SimpleNamespace(name="a", created_at=datetime(2024, 1, 1))]
+
+        first = cached_json(cache, 1, "items", adapter, load)
+        second = cached_json(cache, 1, "items", adapter, load)
+
+        assert first.body == b'[{"name":"a","created_at":"2024-01-01T00:00:00"}]'
+        assert second.body == first.body
+        assert first.media_type == "application/json"
+        assert len(loads) == 1
+
+    def test_matching_etag_returns_not_modified(self):
+        """Test a client holding the current ETag gets an empty 304"""
+        cache = UserReadCache("test")
+        adapter = TypeAdapter(List[_Item])
+
+        def load():
+            return [SimpleNamespace(name="a", created_at=datetime(2024, 1, 1))]
+
+        first = cached_json(cache, 1, "items", adapter, load)
+        etag = first.headers["etag"]
+        second = cached_json(cache, 1, "items", adapter, load, if_none_match=etag)
+        stale = cached_json(cache, 1, "items", adapter, load, if_none_match='W/"old"')
+
+        assert etag.startswith('W/"')
+        assert second.status_code == 304
+        assert second.body == b""
+        assert second.headers["etag"] == etag
+        assert stale.status_code == 200
+        assert stale.body == first.body
+
+    def _outage(self):
+        raise OperationalError("SELECT 1", {}, Exception("connection refused"))
+
+    def test_outage_serves_stale_copy_when_allowed(self):
+        """Test an expired body is served with a Warning header while the DB is down"""
+        cache = UserReadCache("test", ttl_seconds=0, stale_ttl_seconds=60)
+        adapter = TypeAdapter(List[_Item])
+        fresh = cached_json(cache, 1, "items", adapter, lambda: [])
+
+        response = cached_json(cache, 1, "items", adapter, self._outage, allow_stale=True)
+
+        assert response.body == fresh.body
+        assert response.headers["warning"] == '110 - "Response is Stale"'
+
+    def test_outage_raises_without_stale_opt_in(self):
+        """Test routes that do not allow stale data still fail during an outage"""
+        cache = UserReadCache("test", ttl_seconds=0, stale_ttl_seconds=60)
+        adapter = TypeAdapter(List[_Item])
+        cached_json(cache, 1, "items", adapter, lambda: [])
+
+        with pytest.raises(OperationalError):
+            cached_json(cache, 1, "items", adapter, self._outage)
+
+    def test_repository_pool_timeout_serves_stale_copy(self, test_db, monkeypatch):
+        """Test a pool timeout inside a repository read falls back instead of caching []"""
+        cache = UserReadCache("test", ttl_seconds=0, stale_ttl_seconds=60)
+        adapter = TypeAdapter(List[AllergyResponse])
+        repo = AllergyRepository(test_db)
+        repo.add_allergy(1, "Penicillin", "Hives", "severe")
+        fresh = cached_json(cache, 1, "allergies", adapter, lambda: repo.get_by_user(1, rows=True))
+
+        def exhausted(rows=False):
+            raise PoolTimeoutError("QueuePool limit reached")
+
+        monkeypatch.setattr(repo, "_query", exhausted)
+        response = cached_json(
+            cache, 1, "allergies", adapter, lambda: repo.get_by_user(1, rows=True), allow_stale=True
+        )
+
+        assert response.body == fresh.body
+        assert b"Penicillin" in response.body
+        assert response.headers["warning"] == '110 - "Response is Stale"'
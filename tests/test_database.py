@@ -0,0 +1,38 @@
+"""
+Tests for database utilities.
+"""
+
+from sqlalchemy.pool import QueuePool, StaticPool
+
+from backend.utils.database import DatabaseManager
+from config import config
+
+
+class TestDatabaseManager:
+    """Tests for DatabaseManager class"""
+
+    def test_in_memory_sqlite_shares_one_connection(self):
+        """Test in-memory databases keep a single shared connection"""
+        manager = DatabaseManager("sqlite:///:memory:")
+
+        assert isinstance(manager.engine.pool, StaticPool)
+        manager.close()
+
+    def test_file_sqlite_uses_configured_pool(self, tmp_path):
+        """Test file databases get a sized pool instead of one shared connection"""
+        manager = DatabaseManager(f"sqlite:///{tmp_path / 'test.db'}")
+
+        assert isinstance(manager.engine.pool, QueuePool)
+        assert manager.engine.pool.size() == config.DB_POOL_SIZE
+        manager.close()
+
+    def test_session_scope_returns_connection(self, tmp_path):
+        """Test connections go back to the pool once the session scope ends"""
+        manager = DatabaseManager(f"sqlite:///{tmp_path / 'test.db'}")
+
+        with manager.session_scope() as session:
+            session.connection()
+            assert manager.engine.pool.checkedout() == 1
+
+        assert manager.engine.pool.checkedout() == 0
+        manager.close()
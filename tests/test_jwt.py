@@ -0,0 +1,37 @@
+"""
+Tests for JWT utilities.
+"""
+
+from datetime import timedelta
+
+from backend.utils import jwt as jwt_utils
+from backend.utils.jwt import create_access_token, verify_token
+
+
+class TestVerifyToken:
+    """Tests for verify_token function"""
+
+    def test_valid_token_is_cached(self, monkeypatch):
+        """Test repeat verification of a token skips decoding"""
+        token = create_access_token(data={"sub": "1", "username": "cached"})
+        assert verify_token(token)["sub"] == "1"
+
+        def fail_decode(*args, **kwargs):
+            raise AssertionError("token should be served from cache")
+
+        monkeypatch.setattr(jwt_utils.jwt, "decode", fail_decode)
+
+        assert verify_token(token)["username"] == "cached"
+
+    def test_invalid_token_is_rejected(self):
+        """Test tampered tokens return None"""
+        token = create_access_token(data={"sub": "1"})
+
+        assert verify_token(token[:-2] + "xx") is None
+
+    def test_expired_cached_token_is_rejected(self):
+        """Test a cached payload is not served past the token's expiry"""
+        token = create_access_token(data={"sub": "1"}, expires_delta=timedelta(seconds=-1))
+        jwt_utils._verified_tokens[token] = {"sub": "1", "exp": 0}
+
+        assert verify_token(token) is None
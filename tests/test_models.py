@@ -2,10 +2,15 @@
 Tests for database models.
 """
 
+from datetime import date
+
 import pytest
+from sqlalchemy import event, literal_column, select, text, type_coerce
 
+from backend.models.allergy import Allergy
 from backend.models.chat import ChatHistory
 from backend.models.health_metric import HealthMetric
+from backend.models.severity import SeverityLabel
 from backend.models.treatment import TreatmentPlan
 from backend.models.user import User
 
@@ -42,6 +47,8 @@ class TestUserModel:
 
         # Password should be hashed
         assert user.password_hash != sample_user_data["password"]
+        assert user.password_hash.startswith("$argon2id$")
+        assert user.password_needs_rehash() is False
 
         # Should verify correct password
         assert user.check_password(sample_user_data["password"]) is True
@@ -60,11 +67,31 @@ class TestUserModel:
         user.set_password(sample_user_data["password"])
         test_db.add(user)
         test_db.commit()
+        test_db.refresh(user)
 
         repr_str = repr(user)
         assert "User" in repr_str
         assert sample_user_data["username"] in repr_str
 
+    def test_repr_never_loads_expired_state(self, test_db, sample_user_data):
+        """Test repr of an expired user leaves out unloaded fields instead of querying"""
+        user = User(
+            username=sample_user_data["username"],
+            full_name=sample_user_data["full_name"],
+            age=sample_user_data["age"],
+            gender=sample_user_data["gender"],
+        )
+        user.set_password(sample_user_data["password"])
+        test_db.add(user)
+        test_db.commit()
+        statements = []
+        event.listen(
+            test_db.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2])
+        )
+
+        assert repr(user) == "<User()>"
+        assert statements == []
+
 
 class TestChatHistoryModel:
     """Tests for ChatHistory model"""
@@ -158,3 +185,81 @@ class TestHealthMetricModel:
         assert metric.id is not None
         assert metric.user_id == user.id
         assert metric.value == sample_health_metric["value"]
+
+
+class TestAllergyModel:
+    """Tests for Allergy model"""
+
+    def test_severity_reads_text_left_in_varchar_columns(self, test_db):
+        """Test ranks stored as numeric text and unconverted labels both read back as labels"""
+        label = SeverityLabel()
+
+        values = [
+            test_db.scalar(select(type_coerce(literal_column(raw), label)))
+            for raw in ("'3'", "3", "'life-threatening'", "NULL")
+        ]
+
+        assert values == ["severe", "severe", "life-threatening", None]
+
+    def test_to_dict_after_commit(self, test_db, sample_user_data):
+        """Test to_dict reloads expired columns and keeps the API key order"""
+        user = User(
+            username=sample_user_data["username"],
+            full_name=sample_user_data["full_name"],
+            age=sample_user_data["age"],
+            gender=sample_user_data["gender"],
+        )
+        user.set_password(sample_user_data["password"])
+        test_db.add(user)
+        test_db.commit()
+        allergy = Allergy(
+            user_id=user.id,
+            allergen="Penicillin",
+            reaction="Hives",
+            verified_date=date(2024, 1, 2),
+        )
+        test_db.add(allergy)
+        test_db.commit()
+
+        data = allergy.to_dict()
+
+        assert list(data) == list(Allergy.__table__.columns.keys())
+        assert data["allergen"] == "Penicillin"
+        assert data["severity"] == "moderate"
+        assert data["verified_date"] == "2024-01-02"
+        assert data["verified_by"] is None
+        assert isinstance(data["created_at"], str)
+
+
+class TestMedicationModel:
+    """Tests for Medication model"""
+
+    def test_active_medication_reads_use_composite_index(self, test_db):
+        """Test the per-turn active medications read is ordered straight from an index"""
+        plan = test_db.execute(
+            text(
+                "EXPLAIN QUERY PLAN SELECT * FROM medications "
+                "WHERE user_id = 1 AND status = 'active' ORDER BY start_date DESC"
+            )
+        ).all()
+
+        details = " ".join(row[-1] for row in plan)
+        assert "idx_medication_user_status_start" in details
+        assert "TEMP B-TREE" not in details
+
+
+class TestSymptomLogModel:
+    """Tests for SymptomLog model"""
+
+    def test_recent_symptom_reads_use_composite_index(self, test_db):
+        """Test per-user symptom reads ordered by time are served from an index"""
+        plan = test_db.execute(
+            text(
+                "EXPLAIN QUERY PLAN SELECT * FROM symptom_logs "
+                "WHERE user_id = 1 ORDER BY logged_at DESC LIMIT 50"
+            )
+        ).all()
+
+        details = " ".join(row[-1] for row in plan)
+        assert "idx_symptom_user_logged" in details
+        assert "TEMP B-TREE" not in details
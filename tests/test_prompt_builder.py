@@ -0,0 +1,181 @@
+"""
+Tests for prompt building and formatting.
+"""
+
+from dataclasses import replace
+
+from backend.ai import prompt_templates
+from backend.ai.prompt_builder import MedicalPromptBuilder
+from backend.ai.prompt_templates import MedicalPromptTemplates, PromptFormatter
+from backend.ai.types import PatientContext
+
+
+class TestPromptFormatter:
+    """Tests for PromptFormatter class"""
+
+    def test_formats_items_with_defaults(self):
+        """Test missing fields fall back to their placeholder text"""
+        formatted = PromptFormatter.format_allergies(
+            [{"allergen": "Penicillin", "severity": "severe", "reaction": "Hives"}, {}]
+        )
+
+        assert formatted == "- Penicillin (severe): Hives\n- Unknown (unknown severity):"
+        assert PromptFormatter.format_medications([]) == "No current medications reported"
+
+    def test_empty_sections_skip_the_fragment_cache(self):
+        """Test a patient with no records gets the shared no-data text without a cache lookup"""
+        prompt_templates._format_allergies.cache_clear()
+
+        assert PromptFormatter.format_allergies([]) is prompt_templates.NO_ALLERGIES
+        assert PromptFormatter.format_recent_symptoms([]) == "No recent symptoms logged"
+        assert prompt_templates._format_allergies.cache_info().currsize == 0
+
+    def test_empty_fields_leave_no_stray_spaces(self):
+        """Test medication fields are joined by single spaces whichever are missing"""
+        formatted = PromptFormatter.format_medications(
+            [
+                {"medication_name": "Metformin", "dosage": "500mg", "frequency": "daily"},
+                {"medication_name": "Inhaler", "frequency": "as needed"},
+                {"medication_name": "Aspirin", "dosage": ""},
+            ]
+        )
+
+        assert formatted.splitlines() == [
+            "- Metformin 500mg daily",
+            "- Inhaler as needed",
+            "- Aspirin",
+        ]
+
+    def test_repeat_contexts_reuse_formatted_fragments(self):
+        """Test equal histories are formatted once, even from different dicts"""
+        prompt_templates._format_medical_history.cache_clear()
+        history = [{"condition_name": "Asthma", "status": "active"}]
+
+        first = PromptFormatter.format_medical_history(history)
+        second = PromptFormatter.format_medical_history([dict(history[0])])
+        changed = PromptFormatter.format_medical_history(
+            [{"condition_name": "Asthma", "status": "resolved"}]
+        )
+
+        info = prompt_templates._format_medical_history.cache_info()
+        assert first == second == "- Asthma (active)"
+        assert changed == "- Asthma (resolved)"
+        assert (info.misses, info.hits) == (2, 1)
+
+
+class TestCompiledTemplate:
+    """Tests for precompiled prompt templates"""
+
+    def test_render_matches_str_format(self):
+        """Test every compiled template renders exactly as str.format would"""
+        templates = MedicalPromptTemplates
+        compiled = [
+            templates.SYSTEM_PATIENT_CONTEXT,
+            templates.SYMPTOM_ANALYSIS_PROMPT[1],
+            templates.TREATMENT_PLAN_PROMPT[1],
+            templates.FOLLOW_UP_PROMPT[1],
+            templates.EMERGENCY_RESPONSE_PROMPT,
+            templates.MEDICATION_SAFETY_PROMPT,
+        ]
+
+        for template in compiled:
+            fields = {key: f"<{key}>" for key in template.keys}
+            assert template.keys
+            assert template.render(fields) == template.template.format(**fields)
+
+
+class TestMedicalPromptBuilder:
+    """Tests for MedicalPromptBuilder class"""
+
+    def _context(self):
+        return PatientContext(
+            age=40,
+            gender="Female",
+            medical_history=({"condition_name": "Asthma", "status": "active"},),
+            allergies=({"allergen": "Penicillin", "severity": "severe", "reaction": "Hives"},),
+        )
+
+    def test_builders_fill_every_placeholder(self):
+        """Test each builder renders its template, with "Unknown" for fields it has no data for"""
+        builder = MedicalPromptBuilder()
+        context = self._context()
+
+        system = builder.build_system_prompt(context)[-1]
+        _, analysis = builder.build_symptom_analysis_prompt("cough", context)
+        _, plan = builder.build_treatment_plan_prompt("Asthma", context)
+        _, follow_up = builder.build_follow_up_prompt("Any update?", [])
+
+        assert "- Age: 40" in system
+        assert "Previous Conversations: First conversation with patient" in system
+        assert "Known Allergies: - Penicillin (severe): Hives" in analysis
+        assert "Lifestyle Factors: Unknown" in plan
+        assert "Any update?" in follow_up and "Age: Unknown" in follow_up
+        assert "No current medications reported" in analysis
+
+    def test_static_instructions_lead_the_system_blocks(self):
+        """Test system blocks are static first, so every patient shares the cached prefix"""
+        builder = MedicalPromptBuilder()
+        instructions, _ = builder.build_symptom_analysis_prompt("cough", self._context())
+        other = PatientContext(age=70, gender="Male")
+
+        blocks = builder.build_system_prompt(self._context(), instructions)
+        other_blocks = builder.build_system_prompt(other, instructions)
+
+        assert blocks[:2] == other_blocks[:2] == (builder.templates.SYSTEM_PROMPT, instructions)
+        assert "{" not in instructions
+        assert blocks[2] != other_blocks[2] and "- Age: 70" in other_blocks[2]
+
+    def test_prompts_for_one_context_share_formatted_fragments(self):
+        """Test building several prompts from one context formats each list once"""
+        prompt_templates._format_medical_history.cache_clear()
+        builder = MedicalPromptBuilder()
+        context = self._context()
+
+        builder.build_system_prompt(context)
+        builder.build_symptom_analysis_prompt("cough", context)
+        builder.build_treatment_plan_prompt("Asthma", replace(context))
+
+        info = prompt_templates._format_medical_history.cache_info()
+        assert (info.misses, info.hits) == (1, 2)
+
+    def test_emergency_response_lists_symptoms(self):
+        """Test the emergency prompt renders the reported symptoms"""
+        response = MedicalPromptBuilder().build_emergency_response("chest pain", "Possible MI")
+
+        assert "may indicate a medical emergency:\nchest pain" in response
+
+    def test_immediate_actions_cover_every_matched_symptom(self):
+        """Test each emergency keyword adds its action once, regardless of case"""
+        actions = MedicalPromptBuilder()._get_immediate_actions(
+            "Chest pain and BLEEDING from the arm, more bleeding later"
+        )
+
+        assert actions.startswith("- Stay calm and call emergency services immediately")
+        assert actions.count("- Sit down and rest") == 1
+        assert actions.count("- Apply direct pressure to wound") == 1
+        assert "Sit upright" not in actions
+
+    def test_immediate_actions_without_symptom_match_are_prebuilt(self):
+        """Test text with no known keyword returns only the base action bullets"""
+        actions = MedicalPromptBuilder()._get_immediate_actions("sudden vision loss")
+
+        assert actions.splitlines()[-1] == "- Note time symptoms started"
+        assert len(actions.splitlines()) == 5
+
+    def test_conversation_summary_clips_only_long_turns(self):
+        """Test short turns are kept whole and long ones are cut at a word boundary"""
+        summary = MedicalPromptBuilder()._summarize_conversations(
+            [
+                {"message": "Old turn", "response": "Dropped"},
+                {"message": "Hi", "response": "Hello"},
+                {"message": "Hi", "response": "Hello"},
+                {"message": "word " * 40, "response": None},
+            ]
+        )
+
+        turns = summary.split("\n\n")
+        assert len(turns) == 3
+        assert turns[0] == "Patient: Hi\nDr. HealthAI: Hello"
+        patient = turns[2].splitlines()[0]
+        assert patient.endswith("word...") and len(patient) <= len("Patient: ") + 103
+        assert turns[2].endswith("Dr. HealthAI: ")
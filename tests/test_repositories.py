@@ -2,12 +2,26 @@
 Tests for repositories.
 """
 
+from datetime import datetime, timedelta
+
+import bcrypt
 import pytest
+from sqlalchemy import event
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 
+from backend.models.chat import ChatHistory
+from backend.models.medical_condition import MedicalCondition
+from backend.models.symptom_log import SymptomLog
 from backend.models.user import User
+from backend.repositories.allergy_repository import AllergyRepository
 from backend.repositories.chat_repository import ChatRepository
 from backend.repositories.health_repository import HealthRepository
+from backend.repositories.medical_history_repository import MedicalHistoryRepository
+from backend.repositories.symptom_repository import SymptomRepository
 from backend.repositories.user_repository import UserRepository
+from backend.services.retention_service import RetentionService
+from config import config
 
 
 class TestUserRepository:
@@ -48,6 +62,24 @@ class TestUserRepository:
         authenticated = repo.authenticate(sample_user_data["username"], "wrongpassword")
         assert authenticated is None
 
+    def test_authenticate_upgrades_bcrypt_hash(self, test_db, sample_user_data):
+        """Test a legacy bcrypt hash still logs in and is replaced with argon2id"""
+        repo = UserRepository(test_db)
+        user = repo.create_user(**sample_user_data)
+        password = sample_user_data["password"].encode("utf-8")
+        user.password_hash = bcrypt.hashpw(password, bcrypt.gensalt(4)).decode("utf-8")
+        test_db.commit()
+
+        assert repo.authenticate(sample_user_data["username"], "wrongpassword") is None
+        assert user.password_hash.startswith("$2")
+
+        authenticated = repo.authenticate(
+            sample_user_data["username"], sample_user_data["password"]
+        )
+        test_db.expire_all()
+        assert authenticated.password_hash.startswith("$argon2id$")
+        assert authenticated.check_password(sample_user_data["password"]) is True
+
     def test_username_exists(self, test_db, sample_user_data):
         """Test checking if username exists"""
         repo = UserRepository(test_db)
@@ -77,6 +109,20 @@ class TestChatRepository:
         assert chat.id is not None
         assert chat.user_id == user.id
 
+    def test_add_message_needs_no_refresh(self, test_db, sample_user_data):
+        """Test a created message is loaded by its INSERT ... RETURNING, with no SELECT after it"""
+        user_id = UserRepository(test_db).create_user(**sample_user_data).id
+        statements = []
+        event.listen(
+            test_db.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2])
+        )
+
+        chat = ChatRepository(test_db).add_message(user_id, "Hello", "Hi there")
+
+        assert (chat.message, chat.response) == ("Hello", "Hi there")
+        assert chat.id is not None and chat.timestamp is not None
+        assert len(statements) == 1 and "RETURNING" in statements[0]
+
     def test_get_user_history(self, test_db, sample_user_data, sample_chat_data):
         """Test getting user chat history"""
         # Create user
@@ -92,6 +138,33 @@ class TestChatRepository:
         history = chat_repo.get_user_history(user.id)
         assert len(history) == 2
 
+    def test_get_user_history_pages_by_keyset(self, test_db, sample_user_data):
+        """Test before_id continues the history where the previous page ended"""
+        user = UserRepository(test_db).create_user(**sample_user_data)
+        chat_repo = ChatRepository(test_db)
+        for i in range(5):
+            chat_repo.add_message(user.id, f"Message {i}", f"Response {i}")
+
+        first = chat_repo.get_user_history(user.id, limit=2)
+        second = chat_repo.get_user_history(user.id, limit=2, before_id=first[-1].id)
+        last = chat_repo.get_user_history(user.id, limit=2, before_id=second[-1].id)
+
+        assert [chat.message for chat in first] == ["Message 4", "Message 3"]
+        assert [chat.message for chat in second] == ["Message 2", "Message 1"]
+        assert [chat.message for chat in last] == ["Message 0"]
+
+    def test_get_user_history_rows_skip_orm_instances(self, test_db, sample_user_data):
+        """Test row reads page the same history without loading model instances"""
+        user = UserRepository(test_db).create_user(**sample_user_data)
+        chat_repo = ChatRepository(test_db)
+        for i in range(3):
+            chat_repo.add_message(user.id, f"Message {i}", f"Response {i}")
+
+        rows = chat_repo.get_user_history(user.id, limit=2, before_id=3, rows=True)
+
+        assert [r.message for r in rows] == ["Message 1", "Message 0"]
+        assert not isinstance(rows[0], ChatHistory)
+
 
 class TestHealthRepository:
     """Tests for HealthRepository"""
@@ -115,6 +188,29 @@ class TestHealthRepository:
         assert metric.id is not None
         assert metric.value == sample_health_metric["value"]
 
+    def test_bulk_add_metrics_commits_once(self, test_db, sample_user_data):
+        """Test a batch of metrics is inserted in input order with one commit and no refreshes"""
+        user_id = UserRepository(test_db).create_user(**sample_user_data).id
+        health_repo = HealthRepository(test_db)
+        statements, commits = [], []
+        event.listen(
+            test_db.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2])
+        )
+        event.listen(test_db, "after_commit", commits.append)
+
+        metrics = health_repo.bulk_add_metrics(
+            user_id,
+            [
+                {"metric_type": "Heart Rate", "value": 72.0, "unit": "bpm", "notes": None},
+                {"metric_type": "Weight", "value": 70.5, "unit": "kg", "notes": "Morning"},
+            ],
+        )
+
+        assert [m.metric_type for m in metrics] == ["Heart Rate", "Weight"]
+        assert metrics[1].notes == "Morning" and metrics[0].user_id == user_id
+        assert {s.split()[0] for s in statements} == {"INSERT"} and len(commits) == 1
+        assert len(health_repo.get_user_metrics(user_id)) == 2
+
     def test_get_user_metrics(self, test_db, sample_user_data):
         """Test getting user metrics"""
         # Create user
@@ -129,3 +225,216 @@ class TestHealthRepository:
         # Get metrics
         metrics = health_repo.get_user_metrics(user.id, "Heart Rate")
         assert len(metrics) == 2
+
+    def test_get_metric_types_lists_each_type_once(self, test_db, sample_user_data):
+        """Test metric types are distinct, sorted and limited to the user's own rows"""
+        user_id = UserRepository(test_db).create_user(**sample_user_data).id
+        other_id = UserRepository(test_db).create_user(**{**sample_user_data, "username": "o"}).id
+        health_repo = HealthRepository(test_db)
+        assert health_repo.get_metric_types(user_id) == []
+
+        health_repo.bulk_add_metrics(
+            user_id,
+            [
+                {"metric_type": metric_type, "value": 1.0, "unit": "u"}
+                for metric_type in ("Weight", "Heart Rate", "Weight", "Sleep", "Heart Rate")
+            ],
+        )
+        health_repo.add_metric(other_id, "Blood Pressure", 120.0, "mmHg")
+
+        assert health_repo.get_metric_types(user_id) == ["Heart Rate", "Sleep", "Weight"]
+        assert health_repo.get_metric_types(other_id) == ["Blood Pressure"]
+
+    def test_delete_metric_checks_ownership(self, test_db, sample_user_data):
+        """Test a metric is only deleted for its owner, and a repeat delete reports not found"""
+        user = UserRepository(test_db).create_user(**sample_user_data)
+        health_repo = HealthRepository(test_db)
+        metric_id = health_repo.add_metric(user.id, "Heart Rate", 75.0, "bpm").id
+
+        assert health_repo.delete_metric(metric_id, user.id + 1) is False
+        assert health_repo.delete_metric(metric_id, user.id) is True
+        assert health_repo.delete_metric(metric_id, user.id) is False
+        assert health_repo.get_user_metrics(user.id) == []
+
+    def test_metric_version_changes_with_series(self, test_db, sample_user_data):
+        """Test the version stamp moves on insert and delete but not across metric types"""
+        user = UserRepository(test_db).create_user(**sample_user_data)
+        health_repo = HealthRepository(test_db)
+
+        empty = health_repo.get_metric_version(user.id, "Heart Rate")
+        first = health_repo.add_metric(user.id, "Heart Rate", 75.0, "bpm").id
+        second = health_repo.add_metric(user.id, "Heart Rate", 80.0, "bpm").id
+        health_repo.add_metric(user.id, "Weight", 70.0, "kg")
+        added = health_repo.get_metric_version(user.id, "Heart Rate")
+        health_repo.delete_metric(first, user.id)
+
+        assert empty == (None, 0)
+        assert added == (second, 2)
+        assert health_repo.get_metric_version(user.id, "Heart Rate") == (second, 1)
+
+
+class TestMedicalHistoryRepository:
+    """Tests for MedicalHistoryRepository"""
+
+    def test_get_by_user(self, test_db, sample_user_data):
+        """Test conditions are listed for the user with optional status filter"""
+        user = UserRepository(test_db).create_user(**sample_user_data)
+
+        repo = MedicalHistoryRepository(test_db)
+        repo.add_condition(user.id, "Asthma", status="chronic")
+        repo.add_condition(user.id, "Flu", status="resolved")
+
+        assert len(repo.get_by_user(user.id)) == 2
+        assert [c.condition_name for c in repo.get_by_user(user.id, "chronic")] == ["Asthma"]
+
+    def test_list_reads_do_not_lazy_load(self, test_db, sample_user_data):
+        """Test relationship access on listed rows fails fast instead of querying"""
+        user_id = UserRepository(test_db).create_user(**sample_user_data).id
+        repo = MedicalHistoryRepository(test_db)
+        repo.add_condition(user_id, "Asthma")
+        test_db.expunge_all()
+
+        condition = repo.get_by_user(user_id)[0]
+
+        assert condition.to_dict()["condition_name"] == "Asthma"
+        with pytest.raises(InvalidRequestError):
+            condition.user
+
+    def test_bulk_add_conditions_returns_rows_in_order(self, test_db, sample_user_data):
+        """Test bulk inserted conditions come back with ids in request order"""
+        user = UserRepository(test_db).create_user(**sample_user_data)
+
+        created, failed = MedicalHistoryRepository(test_db).bulk_add_conditions(
+            user.id, [{"condition_name": "Asthma"}, {"condition_name": "Flu"}]
+        )
+
+        assert [c.condition_name for c in created] == ["Asthma", "Flu"]
+        assert all(c.id is not None for c in created)
+        assert failed == []
+
+    def test_bulk_add_conditions_best_effort_skips_bad_rows(self, test_db, sample_user_data):
+        """Test best-effort mode stores valid rows and reports rejected indexes"""
+        user = UserRepository(test_db).create_user(**sample_user_data)
+        repo = MedicalHistoryRepository(test_db)
+
+        created, failed = repo.bulk_add_conditions(
+            user.id,
+            [{"condition_name": "Asthma"}, {"condition_name": None}, {"condition_name": "Flu"}],
+            best_effort=True,
+        )
+
+        assert [c.condition_name for c in created] == ["Asthma", "Flu"]
+        assert failed == [1]
+        assert len(repo.get_by_user(user.id)) == 2
+
+    def test_get_by_user_rows_skip_orm_instances(self, test_db, sample_user_data):
+        """Test row reads expose model columns without loading model instances"""
+        user = UserRepository(test_db).create_user(**sample_user_data)
+        repo = MedicalHistoryRepository(test_db)
+        repo.add_condition(user.id, "Asthma", status="chronic")
+
+        rows = repo.get_by_user(user.id, rows=True)
+
+        assert [r.condition_name for r in rows] == ["Asthma"]
+        assert not isinstance(rows[0], MedicalCondition)
+        assert rows[0].created_at is not None
+
+    def test_get_active_conditions_rows_apply_the_status_filter(self, test_db, sample_user_data):
+        """Test the active-conditions row read keeps the same filter as the ORM read"""
+        user = UserRepository(test_db).create_user(**sample_user_data)
+        repo = MedicalHistoryRepository(test_db)
+        repo.add_condition(user.id, "Asthma", status="chronic")
+        repo.add_condition(user.id, "Flu", status="resolved")
+
+        rows = repo.get_active_conditions(user.id, rows=True)
+
+        assert [r.condition_name for r in rows] == ["Asthma"]
+        assert not isinstance(rows[0], MedicalCondition)
+
+    @pytest.mark.parametrize("read", ["get_by_user", "get_active_conditions"])
+    def test_pool_timeout_is_raised_not_read_as_no_conditions(self, test_db, monkeypatch, read):
+        """Test an exhausted connection pool is not reported as an empty history"""
+        repo = MedicalHistoryRepository(test_db)
+
+        def exhausted(rows=False):
+            raise PoolTimeoutError("QueuePool limit reached")
+
+        monkeypatch.setattr(repo, "_query", exhausted)
+
+        with pytest.raises(PoolTimeoutError):
+            getattr(repo, read)(1)
+
+
+class TestAllergyRepository:
+    """Tests for AllergyRepository"""
+
+    def test_allergies_follow_clinical_severity_order(self, test_db, sample_user_data):
+        """Test severity sorts and filters by rank, not alphabetically, and reads back as labels"""
+        user = UserRepository(test_db).create_user(**sample_user_data)
+        repo = AllergyRepository(test_db)
+        for allergen, severity in [
+            ("Dust", "mild"),
+            ("Peanuts", "life-threatening"),
+            ("Latex", "moderate"),
+            ("Penicillin", "severe"),
+        ]:
+            repo.add_allergy(user.id, allergen, "Hives", severity=severity)
+
+        allergies = repo.get_by_user(user.id, rows=True)
+        severe = repo.get_severe_allergies(user.id)
+
+        assert [a.severity for a in allergies] == ["life-threatening", "severe", "moderate", "mild"]
+        assert {a.allergen for a in severe} == {"Peanuts", "Penicillin"}
+
+
+class TestSymptomRepository:
+    """Tests for SymptomRepository"""
+
+    def test_iter_recent_symptoms_yields_batches(self, test_db, sample_user_data):
+        """Test recent symptoms are streamed in batches of the requested size"""
+        user = UserRepository(test_db).create_user(**sample_user_data)
+        repo = SymptomRepository(test_db)
+        repo.bulk_log_symptoms(user.id, [{"symptom_description": f"s{i}"} for i in range(5)])
+
+        batches = list(repo.iter_recent_symptoms(user.id, days=1, batch_size=2))
+
+        assert [len(batch) for batch in batches] == [2, 2, 1]
+        assert {row.symptom_description for batch in batches for row in batch} == {
+            f"s{i}" for i in range(5)
+        }
+
+
+class TestRetentionService:
+    """Tests for RetentionService"""
+
+    def test_purge_expired_keeps_recent_records(self, test_db, sample_user_data, monkeypatch):
+        """Test only records past their table's window are deleted, and 0 days keeps all"""
+        user_id = UserRepository(test_db).create_user(**sample_user_data).id
+        now = datetime(2024, 6, 30)
+        for days in (40, 10):
+            test_db.add(
+                ChatHistory(
+                    user_id=user_id,
+                    message=f"{days}d",
+                    response="ok",
+                    timestamp=now - timedelta(days=days),
+                )
+            )
+            test_db.add(
+                SymptomLog(
+                    user_id=user_id,
+                    symptom_description=f"{days}d",
+                    logged_at=now - timedelta(days=days),
+                )
+            )
+        test_db.commit()
+        monkeypatch.setattr(config, "CHAT_HISTORY_RETENTION_DAYS", 30)
+        monkeypatch.setattr(config, "SYMPTOM_LOG_RETENTION_DAYS", 0)
+
+        deleted = RetentionService(test_db).purge_expired(now)
+
+        assert deleted == {"chat_history": 1}
+        assert [chat.message for chat in ChatRepository(test_db).get_user_history(user_id)] == [
+            "10d"
+        ]
+        assert len(SymptomRepository(test_db).get_by_user(user_id)) == 2
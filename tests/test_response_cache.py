@@ -0,0 +1,98 @@
+"""
+Tests for AI response caches.
+"""
+
+import numpy as np
+
+from backend.ai.response_cache import ResponseCache
+from backend.ai.semantic_cache import SemanticCache
+
+
+class TestResponseCache:
+    """Tests for ResponseCache class"""
+
+    def test_set_and_get(self):
+        """Test storing and retrieving a response"""
+        cache = ResponseCache()
+        key = ResponseCache.make_key("model", 0.2, 2000, "system", "prompt")
+        cache.set(key, "response")
+
+        assert cache.get(key) == "response"
+
+    def test_get_missing(self):
+        """Test missing key returns None"""
+        cache = ResponseCache()
+        assert cache.get("missing") is None
+
+    def test_make_key_distinguishes_fields(self):
+        """Test keys differ when field boundaries differ"""
+        key1 = ResponseCache.make_key("model", "a|b", "c")
+        key2 = ResponseCache.make_key("model", "a", "b|c")
+
+        assert key1 != key2
+        assert key1 == ResponseCache.make_key("model", "a|b", "c")
+
+    def test_ttl_expiry(self, monkeypatch):
+        """Test expired entries are not returned"""
+        cache = ResponseCache(ttl_seconds=10)
+        now = [1000.0]
+        monkeypatch.setattr("backend.ai.response_cache.time.monotonic", lambda: now[0])
+
+        cache.set("key", "response")
+        now[0] += 11
+
+        assert cache.get("key") is None
+        assert len(cache) == 0
+
+    def test_lru_eviction(self):
+        """Test least recently used entry is evicted when full"""
+        cache = ResponseCache(max_size=2)
+        cache.set("a", "1")
+        cache.set("b", "2")
+        cache.get("a")
+        cache.set("c", "3")
+
+        assert cache.get("a") == "1"
+        assert cache.get("b") is None
+        assert cache.get("c") == "3"
+
+
+def _bag_of_words_embedder(text):
+    """Deterministic toy embedder for tests"""
+    vocabulary = ["migraine", "headache", "cause", "diabetes", "flu", "symptom"]
+    words = text.lower().replace("?", "").split()
+    return np.array([sum(w.startswith(v) for w in words) for v in vocabulary], dtype=float)
+
+
+class TestSemanticCache:
+    """Tests for SemanticCache class"""
+
+    def test_similar_prompt_hits(self):
+        """Test paraphrased prompt returns cached response"""
+        cache = SemanticCache(embedder=_bag_of_words_embedder, threshold=0.8)
+        cache.set("advice", "what causes migraines?", "answer")
+
+        assert cache.get("advice", "migraines cause what?") == "answer"
+
+    def test_dissimilar_prompt_misses(self):
+        """Test unrelated prompt does not hit"""
+        cache = SemanticCache(embedder=_bag_of_words_embedder, threshold=0.8)
+        cache.set("advice", "what causes migraines?", "answer")
+
+        assert cache.get("advice", "flu symptoms") is None
+
+    def test_namespaces_are_isolated(self):
+        """Test entries for one system instruction do not serve another"""
+        cache = SemanticCache(embedder=_bag_of_words_embedder, threshold=0.8)
+        cache.set("advice", "what causes migraines?", "answer")
+
+        assert cache.get("symptoms", "what causes migraines?") is None
+
+    def test_max_entries(self):
+        """Test oldest entries are dropped beyond max_entries"""
+        cache = SemanticCache(embedder=_bag_of_words_embedder, threshold=0.99, max_entries=1)
+        cache.set("advice", "diabetes", "first")
+        cache.set("advice", "flu", "second")
+
+        assert cache.get("advice", "diabetes") is None
+        assert cache.get("advice", "flu") == "second"
@@ -0,0 +1,175 @@
+"""
+Tests for medical safety checks and emergency handling.
+"""
+
+import asyncio
+
+import pytest
+
+from api.schemas.medical_history import ContextualMessageResponse, SymptomAnalysisResponse
+from backend.ai.safety_checker import MedicalSafetyChecker
+from backend.ai.types import PatientContext
+from backend.models.user import User
+from backend.repositories.chat_repository import ChatRepository
+from backend.services.enhanced_chat_service import EMERGENCY_RESPONSE, EnhancedChatService
+
+
+class TestMedicalSafetyChecker:
+    """Tests for MedicalSafetyChecker class"""
+
+    def test_detects_emergency_keyword(self):
+        """Test emergency keywords are detected case-insensitively"""
+        checker = MedicalSafetyChecker()
+
+        assert checker.find_emergency_keyword("I have sudden CHEST PAIN") == "chest pain"
+        assert checker.detect_emergency_symptoms("I can't breathe properly")
+
+    def test_detects_plural_keyword(self):
+        """Test keywords still match when pluralized"""
+        checker = MedicalSafetyChecker()
+
+        assert checker.detect_emergency_symptoms("I keep having seizures")
+
+    def test_no_emergency(self):
+        """Test non-emergency text is not flagged"""
+        checker = MedicalSafetyChecker()
+
+        assert checker.find_emergency_keyword("I have a mild cold") is None
+
+    def test_flags_prescription_language_in_one_scan(self):
+        """Test any prescription pattern is caught and plain advice is not"""
+        checker = MedicalSafetyChecker()
+
+        assert checker._check_medication_prescription("you should take ibuprofen")
+        assert checker._check_medication_prescription("try 200 mg of ibuprofen")
+        assert not checker._check_medication_prescription("rest and drink fluids")
+
+    def test_check_response_matches_regardless_of_case(self):
+        """Test every check sees the response lowercased once up front"""
+        checker = MedicalSafetyChecker()
+        context = PatientContext(
+            allergies=({"allergen": "Penicillin", "severity": "severe"},),
+            current_medications=({"medication_name": "Warfarin"},),
+        )
+
+        result = checker.check_response(
+            "You Should Take PENICILLIN. This MEDICATION is URGENT.", context
+        )
+
+        assert result["severity"] == "high"
+        assert result["flags"] == [
+            "Response contains medication prescription language",
+            "⚠️ ALLERGY ALERT: Patient allergic to penicillin (severe)",
+            "Response should remind patient to discuss with doctor about current medications",
+            "Response should include emergency care disclaimer",
+        ]
+
+    def test_fast_fail_stops_at_first_high_severity_flag(self, monkeypatch):
+        """Test fast_fail returns after the prescription check without running the rest"""
+        checker = MedicalSafetyChecker()
+        context = PatientContext(allergies=({"allergen": "Penicillin", "severity": "severe"},))
+        response = "You should take penicillin, it is urgent"
+        full = checker.check_response(response, context)
+        monkeypatch.setattr(
+            checker, "_check_allergy_conflicts", lambda *args: pytest.fail("check was not skipped")
+        )
+
+        result = checker.check_response(response, context, fast_fail=True)
+
+        assert len(full["flags"]) == 3
+        assert result["severity"] == "high"
+        assert result["flags"] == ["Response contains medication prescription language"]
+        assert result["recommendations"] == full["recommendations"][:1]
+
+    def test_recommendations_follow_flags(self):
+        """Test each flag kind adds its recommendation once, whatever its case"""
+        recommendations = MedicalSafetyChecker()._generate_recommendations(
+            ["⚠️ ALLERGY ALERT: Patient allergic to latex (mild)", "Needs EMERGENCY disclaimer"]
+        )
+
+        assert recommendations == [
+            "Add prominent allergy warning at the beginning of response.",
+            "Add clear guidance on when to seek emergency medical care.",
+        ]
+        assert MedicalSafetyChecker()._generate_recommendations([]) == []
+
+    def test_emergency_disclaimer_needs_a_whole_serious_word(self):
+        """Test serious keywords only count as whole words"""
+        checker = MedicalSafetyChecker()
+
+        assert checker._needs_emergency_disclaimer("this is not serious, but seek urgent care")
+        assert checker._needs_emergency_disclaimer("(emergency)")
+        assert not checker._needs_emergency_disclaimer("the pain was severely reduced")
+
+    def test_allergy_conflicts_found_in_one_scan(self):
+        """Test every mentioned allergen is flagged, including one inside another"""
+        checker = MedicalSafetyChecker()
+        context = PatientContext(
+            allergies=(
+                {"allergen": "Penicillin", "severity": "severe"},
+                {"allergen": "pen", "severity": "mild"},
+                {"allergen": "Latex", "severity": "moderate"},
+                {"allergen": ""},
+            )
+        )
+
+        conflicts = checker._check_allergy_conflicts("avoid penicillin-based drugs", context)
+
+        assert conflicts == [
+            "⚠️ ALLERGY ALERT: Patient allergic to penicillin (severe)",
+            "⚠️ ALLERGY ALERT: Patient allergic to pen (mild)",
+        ]
+        assert checker._check_allergy_conflicts("rest well", PatientContext()) == []
+
+
+class _UnusedAIClient:
+    """AI client that fails the test if called"""
+
+    async def chat_completion(self, **kwargs):
+        pytest.fail("AI client must not be called for emergencies")
+
+
+class TestEmergencyShortCircuit:
+    """Tests for EnhancedChatService emergency handling"""
+
+    @pytest.fixture
+    def service(self, test_db, sample_user_data, monkeypatch):
+        monkeypatch.setattr(
+            "backend.services.enhanced_chat_service.get_ai_client", lambda: _UnusedAIClient()
+        )
+        user = User(
+            username=sample_user_data["username"],
+            full_name=sample_user_data["full_name"],
+            age=sample_user_data["age"],
+            gender=sample_user_data["gender"],
+        )
+        user.set_password(sample_user_data["password"])
+        test_db.add(user)
+        test_db.commit()
+        return EnhancedChatService(test_db), user
+
+    def test_contextual_message_emergency(self, service, test_db):
+        """Test emergency message returns canned response without the AI model"""
+        chat_service, user = service
+
+        result = asyncio.run(
+            chat_service.send_contextual_message(user.id, "I have severe chest pain")
+        )
+
+        response = ContextualMessageResponse(**result)
+        assert response.has_emergency is True
+        assert response.severity == "high"
+        assert response.response == EMERGENCY_RESPONSE
+        assert len(ChatRepository(test_db).get_user_history(user.id)) == 1
+
+    def test_symptom_analysis_emergency(self, service):
+        """Test emergency symptoms return a valid symptom analysis response"""
+        chat_service, user = service
+
+        result = asyncio.run(
+            chat_service.analyze_symptoms_with_context(user.id, "Sudden difficulty breathing")
+        )
+
+        response = SymptomAnalysisResponse(**result)
+        assert response.has_emergency is True
+        assert response.analysis == EMERGENCY_RESPONSE
@@ -4,7 +4,8 @@ Provides sanitization and validation for user inputs.
 """
 
 import re
-from typing import Optional
+from types import MappingProxyType
+from typing import Mapping, Optional, Tuple
 
 
 class ValidationError(Exception):
@@ -30,6 +31,31 @@ class InputValidator:
     MIN_PASSWORD_LENGTH = 6
     MIN_NAME_LENGTH = 2
 
+    # Reasonable value ranges and display units per metric type
+    METRIC_RANGES: Mapping[str, Tuple[float, float]] = MappingProxyType(
+        {
+            "Heart Rate": (20, 300),
+            "Blood Pressure (Systolic)": (50, 300),
+            "Blood Pressure (Diastolic)": (30, 200),
+            "Blood Glucose": (20, 600),
+            "Weight": (1, 500),
+            "Temperature": (90, 110),
+            "Oxygen Saturation": (50, 100),
+        }
+    )
+    METRIC_UNITS: Mapping[str, str] = MappingProxyType(
+        {
+            "Heart Rate": "bpm",
+            "Blood Pressure (Systolic)": "mmHg",
+            "Blood Pressure (Diastolic)": "mmHg",
+            "Blood Glucose": "mg/dL",
+            "Weight": "kg",
+            "Temperature": "°F",
+            "Oxygen Saturation": "%",
+        }
+    )
+    METRIC_TYPES: Tuple[str, ...] = tuple(METRIC_UNITS)
+
     @staticmethod
     def sanitize_text(text: str, max_length: int) -> str:
         """
@@ -152,19 +178,8 @@ class InputValidator:
         if not isinstance(value, (int, float)):
             raise ValidationError("Metric value must be a number")
 
-        # Define reasonable ranges for different metrics
-        ranges = {
-            "Heart Rate": (20, 300),
-            "Blood Pressure (Systolic)": (50, 300),
-            "Blood Pressure (Diastolic)": (30, 200),
-            "Blood Glucose": (20, 600),
-            "Weight": (1, 500),
-            "Temperature": (90, 110),
-            "Oxygen Saturation": (50, 100),
-        }
-
-        if metric_type in ranges:
-            min_val, max_val = ranges[metric_type]
+        if metric_type in cls.METRIC_RANGES:
+            min_val, max_val = cls.METRIC_RANGES[metric_type]
             if value < min_val or value > max_val:
                 raise ValidationError(f"{metric_type} must be between {min_val} and {max_val}")
 